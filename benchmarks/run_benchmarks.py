@@ -0,0 +1,366 @@
+"""Benchmarks for the PDF export pipeline.
+
+Runs each stage of an export against synthetic orders (foreign key, many-to-many admin
+callable) at several row counts, in left-to-right and right-to-left (Arabic) variants,
+and writes the timings and peak memory (``tracemalloc``) to a JSON file::
+
+    python benchmarks/run_benchmarks.py --output benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --sizes 1000,10000 --compare benchmarks/baseline.json
+
+With ``--compare`` the run is checked against a previous JSON file and the script exits
+with status 1 when a case got slower (median time) or used more memory than the
+baseline by more than ``--tolerance``. Baselines are machine specific: compare runs made
+on the same host.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = (
+    "reshape_to_arabic",
+    "calculate_column_widths",
+    "setup_font",
+    "get_active_settings",
+    "build_pdf_export_response",
+)
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+# Calls per measurement for the stages that take microseconds.
+FAST_CALLS = 1000
+
+
+def setup_django():
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    import django
+
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+
+def create_dataset(size, direction):
+    """Orders ``L-*`` (LTR) or ``R-*`` (RTL) with a customer and a status tag each."""
+    from tests.utils import MockCustomer, MockOrder, MockTag
+
+    prefix = "R" if direction == "rtl" else "L"
+    if direction == "rtl":
+        customer_names = [f"عميل {i}" for i in range(50)]
+        tag_names = ["قيد الانتظار", "تم الشحن", "ملغى"]
+    else:
+        customer_names = [f"Customer {i}" for i in range(50)]
+        tag_names = ["pending", "shipped", "cancelled"]
+
+    customers = MockCustomer.objects.bulk_create(
+        MockCustomer(name=name) for name in customer_names
+    )
+    tags = MockTag.objects.bulk_create(MockTag(name=name) for name in tag_names)
+    MockOrder.objects.bulk_create(
+        (
+            MockOrder(
+                number=f"{prefix}-{i:06d}", customer=customers[i % len(customers)]
+            )
+            for i in range(size)
+        ),
+        batch_size=5000,
+    )
+    through = MockOrder.tags.through
+    order_ids = MockOrder.objects.filter(number__startswith=prefix).values_list(
+        "pk", flat=True
+    )
+    through.objects.bulk_create(
+        (
+            through(mockorder_id=pk, mocktag_id=tags[pk % len(tags)].pk)
+            for pk in order_ids.iterator()
+        ),
+        batch_size=5000,
+    )
+
+
+def create_tables():
+    from django.db import connection
+
+    from tests.utils import MockCustomer, MockOrder, MockTag
+
+    with connection.schema_editor() as editor:
+        for model in (MockCustomer, MockTag, MockOrder):
+            editor.create_model(model)
+
+
+def measure(func, repeat, calls=1, memory=True):
+    """Median/min seconds per call of *func* over *repeat* runs, plus its peak memory."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        timings.append((time.perf_counter() - start) / calls)
+    result = {
+        "median_seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "repeat": repeat,
+    }
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run(sizes, cases, repeat, memory):
+    from django.contrib.admin.sites import AdminSite
+
+    from django_pdf_actions.actions.export_settings import ExportSettings
+    from django_pdf_actions.actions.pdf_response import build_pdf_export_response
+    from django_pdf_actions.actions.utils import (
+        calculate_column_widths,
+        get_active_settings,
+        reshape_to_arabic,
+        setup_font,
+    )
+    from django_pdf_actions.models import ExportPDFSettings
+    from django_pdf_actions.settings_cache import clear_settings_cache
+    from tests.utils import MockOrder, MockOrderAdmin
+
+    create_tables()
+    for direction in ("ltr", "rtl"):
+        create_dataset(max(sizes), direction)
+    row = ExportPDFSettings.objects.create(title="Benchmark", active=True)
+    modeladmin = MockOrderAdmin(MockOrder, AdminSite())
+    columns = list(modeladmin.list_display)
+
+    results = []
+
+    def record(case, rows, direction, measured, **extra):
+        entry = {"case": case, "rows": rows, "direction": direction}
+        entry.update(measured)
+        entry.update(extra)
+        if rows:
+            entry["rows_per_second"] = rows / measured["median_seconds"]
+        results.append(entry)
+        print(
+            f"{case:<28} {rows or '-':>7} {direction or '-':<4} "
+            f"{measured['median_seconds'] * 1000:10.2f} ms"
+            + (
+                f" {measured['peak_memory_bytes'] / 1024 / 1024:8.1f} MiB"
+                if "peak_memory_bytes" in measured
+                else ""
+            ),
+            file=sys.stderr,
+        )
+
+    if "get_active_settings" in cases:
+        clear_settings_cache()
+        record(
+            "get_active_settings",
+            None,
+            None,
+            measure(get_active_settings, repeat, FAST_CALLS, memory=False),
+        )
+
+        def uncached():
+            clear_settings_cache()
+            get_active_settings()
+
+        record(
+            "get_active_settings_uncached",
+            None,
+            None,
+            measure(uncached, repeat, FAST_CALLS, memory=False),
+        )
+
+    for direction in ("ltr", "rtl"):
+        row.rtl_support = direction == "rtl"
+        row.save()
+        pdf_settings = ExportSettings.resolve(get_active_settings())
+        font_name = setup_font(pdf_settings)
+
+        if "setup_font" in cases:
+            record(
+                "setup_font",
+                None,
+                direction,
+                measure(
+                    lambda: setup_font(pdf_settings),
+                    repeat,
+                    FAST_CALLS,
+                    memory=False,
+                ),
+            )
+
+        prefix = "R" if direction == "rtl" else "L"
+        for size in sizes:
+            queryset = MockOrder.objects.filter(number__startswith=prefix).order_by(
+                "pk"
+            )[:size]
+            # The largest runs are slow; fewer repeats keep the suite usable.
+            runs = repeat if size <= 10000 else 1
+
+            def reshape(queryset=queryset):
+                return reshape_to_arabic(
+                    columns,
+                    font_name,
+                    pdf_settings.body_font_size,
+                    queryset,
+                    pdf_settings.max_chars_per_line,
+                    pdf_settings,
+                    modeladmin,
+                )
+
+            if "reshape_to_arabic" in cases:
+                record(
+                    "reshape_to_arabic",
+                    size,
+                    direction,
+                    measure(reshape, runs, 1, memory),
+                )
+
+            if "calculate_column_widths" in cases:
+                data = reshape()
+                record(
+                    "calculate_column_widths",
+                    size,
+                    direction,
+                    measure(
+                        lambda data=data: calculate_column_widths(
+                            data, 700, font_name, pdf_settings.body_font_size
+                        ),
+                        runs,
+                        1,
+                        memory,
+                    ),
+                )
+                del data
+
+            if "build_pdf_export_response" in cases:
+                sizes_seen = []
+
+                def export(queryset=queryset):
+                    response = build_pdf_export_response(
+                        modeladmin, queryset, landscape=True
+                    )
+                    sizes_seen.append(len(response.content))
+
+                measured = measure(export, runs, 1, memory)
+                record(
+                    "build_pdf_export_response",
+                    size,
+                    direction,
+                    measured,
+                    pdf_bytes=sizes_seen[-1],
+                )
+
+    return results
+
+
+def result_key(entry):
+    return f"{entry['case']}[{entry['rows'] or '-'}-{entry['direction'] or '-'}]"
+
+
+def compare(results, baseline, tolerance):
+    """Print changes against *baseline*; return the keys that regressed."""
+    previous = {result_key(entry): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results:
+        key = result_key(entry)
+        old = previous.get(key)
+        if old is None:
+            continue
+        time_ratio = entry["median_seconds"] / old["median_seconds"]
+        line = f"{key:<50} time x{time_ratio:5.2f}"
+        regressed = time_ratio > 1 + tolerance
+        if "peak_memory_bytes" in entry and old.get("peak_memory_bytes"):
+            memory_ratio = entry["peak_memory_bytes"] / old["peak_memory_bytes"]
+            line += f"  memory x{memory_ratio:5.2f}"
+            regressed = regressed or memory_ratio > 1 + tolerance
+        if regressed:
+            regressions.append(key)
+            line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="comma-separated row counts (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cases",
+        default=",".join(CASES),
+        help="comma-separated cases to run (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip the tracemalloc runs"
+    )
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed slowdown/memory growth before failing (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    cases = [case for case in args.cases.split(",") if case]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    setup_django()
+
+    import django
+    import reportlab
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "reportlab": reportlab.Version,
+            "platform": platform.platform(),
+            "sizes": sizes,
+        },
+        "results": run(sizes, cases, args.repeat, not args.no_memory),
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            regressions = compare(report["results"], json.load(fh), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s)", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
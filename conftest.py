@@ -18,6 +18,22 @@ def pytest_configure():
         raise
 
 
+@pytest.fixture(autouse=True)
+def clear_pdf_caches():
+    """Start every test without a cached active settings row, logo or shaped text."""
+    from django_pdf_actions.actions.shaping import clear_shaping_cache
+    from django_pdf_actions.actions.utils import clear_logo_cache
+    from django_pdf_actions.settings_cache import clear_settings_cache
+
+    clear_settings_cache()
+    clear_logo_cache()
+    clear_shaping_cache()
+    yield
+    clear_settings_cache()
+    clear_logo_cache()
+    clear_shaping_cache()
+
+
 @pytest.fixture(scope="session")
 def django_db_setup(django_db_setup, django_db_blocker):
     """Set up the test database."""
@@ -1,6 +1,7 @@
 """PDF export actions"""
 
+from .columns import pdf_io_bound
 from .landscape import export_to_pdf_landscape
 from .portrait import export_to_pdf_portrait
 
-__all__ = ["export_to_pdf_landscape", "export_to_pdf_portrait"]
+__all__ = ["export_to_pdf_landscape", "export_to_pdf_portrait", "pdf_io_bound"]
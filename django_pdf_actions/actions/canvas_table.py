@@ -0,0 +1,135 @@
+"""Direct-canvas table renderer.
+
+``CanvasTable`` draws one page of export rows straight onto a ``canvas.Canvas`` instead
+of laying out a platypus ``Table``. It reproduces the geometry of the table built from
+``create_table_style`` (paddings, font, alignment, middle vertical alignment, header
+background and grid), so plain-text exports look the same, but every plain cell of a
+page goes into a single text object, column offsets are computed once per export and
+the grid is stroked as one path.
+"""
+
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from .utils import table_alignments
+
+
+class CanvasTable:
+    """Draw pages of table rows (header row first) at fixed column widths.
+
+    *pdf_settings* is the export's ``ExportSettings`` snapshot.
+    """
+
+    def __init__(
+        self, col_widths, font_name, pdf_settings, header_bg_color, grid_color
+    ):
+        self.col_widths = list(col_widths)
+        self.font_name = font_name
+        self.font_size = pdf_settings.body_font_size
+        self.leading = self.font_size * 1.2
+        self.grid_line_width = pdf_settings.grid_line_width
+        self.header_bg_color = header_bg_color
+        self.grid_color = grid_color
+
+        table_spacing = pdf_settings.table_spacing
+        self.top_padding = self.bottom_padding = table_spacing * mm
+        self.left_padding = self.right_padding = table_spacing * 2 * mm
+        self.alignment, _header_alignment = table_alignments(pdf_settings)
+
+        # Left edge of every column, relative to the table's left edge.
+        self.col_offsets = [0.0]
+        for width in self.col_widths:
+            self.col_offsets.append(self.col_offsets[-1] + width)
+        self.width = self.col_offsets[-1]
+
+        # Exports repeat many cell values (status columns, dates, ...).
+        self._string_width = lru_cache(maxsize=4096)(
+            lambda line: stringWidth(line, font_name, self.font_size)
+        )
+        # The header row is the same object on every page; measure it once.
+        self._header = None
+
+    def measure(self, canv, rows):
+        """Return row heights (as platypus computes them) and wrapped flowable heights.
+
+        Flowable heights are keyed by ``(row, column)`` index.
+        """
+        padding = self.top_padding + self.bottom_padding
+        heights = []
+        flowable_heights = {}
+        for r, row in enumerate(rows):
+            if r == 0 and self._header is not None and self._header[0] is row:
+                heights.append(self._header[1])
+                flowable_heights.update(self._header[2])
+                continue
+            height = 0
+            for c, (cell, width) in enumerate(zip(row, self.col_widths)):
+                if isinstance(cell, str):
+                    cell_height = self.leading * (cell.count("\n") + 1)
+                else:
+                    _w, cell_height = cell.wrapOn(
+                        canv, width - self.left_padding - self.right_padding, 1e6
+                    )
+                    flowable_heights[r, c] = cell_height
+                height = max(height, cell_height + padding)
+            heights.append(height)
+            if r == 0:
+                self._header = (row, height, dict(flowable_heights))
+        return heights, flowable_heights
+
+    def draw(self, canv, rows, x, top):
+        """Draw *rows* with the table's top-left corner at (*x*, *top*); return its height."""
+        heights, flowable_heights = self.measure(canv, rows)
+        row_tops = [top]
+        for height in heights:
+            row_tops.append(row_tops[-1] - height)
+
+        if rows:
+            canv.saveState()
+            canv.setFillColor(self.header_bg_color)
+            canv.rect(x, row_tops[1], self.width, heights[0], stroke=0, fill=1)
+            canv.restoreState()
+
+        text = canv.beginText()
+        text.setFont(self.font_name, self.font_size, self.leading)
+        text.setFillColor(colors.black)
+        for r, row in enumerate(rows):
+            height = heights[r]
+            # Vertical centre of the cell's content box (VALIGN MIDDLE).
+            middle = (
+                row_tops[r + 1] + (self.bottom_padding + height - self.top_padding) / 2
+            )
+            for c, (cell, offset, width) in enumerate(
+                zip(row, self.col_offsets, self.col_widths)
+            ):
+                left = x + offset + self.left_padding
+                if not isinstance(cell, str):
+                    cell_height = flowable_heights[r, c]
+                    cell.drawOn(canv, left, middle - cell_height / 2)
+                    continue
+                lines = cell.split("\n")
+                y = middle + len(lines) * self.leading / 2 - self.font_size
+                for line in lines:
+                    text.setTextOrigin(self._line_x(line, left, width), y)
+                    text.textOut(line)
+                    y -= self.leading
+        canv.drawText(text)
+
+        canv.saveState()
+        canv.setStrokeColor(self.grid_color)
+        canv.setLineWidth(self.grid_line_width)
+        canv.grid([x + offset for offset in self.col_offsets], row_tops)
+        canv.restoreState()
+        return top - row_tops[-1]
+
+    def _line_x(self, line, left, width):
+        if self.alignment == "LEFT":
+            return left
+        inner = width - self.left_padding - self.right_padding
+        line_width = self._string_width(line)
+        if self.alignment == "RIGHT":
+            return left + inner - line_width
+        return left + (inner - line_width) / 2.0
@@ -0,0 +1,70 @@
+"""Resolved, immutable settings for a single export.
+
+``ExportSettings.resolve`` turns the active ``ExportPDFSettings`` row (or ``None`` when no
+row exists) into a frozen snapshot with every option filled in, once per export. The
+render path reads plain attributes from it instead of re-checking for a missing row or
+querying for one again.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any
+
+
+@dataclass(frozen=True)
+class ExportSettings:
+    """Every ``ExportPDFSettings`` option used while rendering, with defaults."""
+
+    page_size: str = "A4"
+    font_name: str = "DejaVuSans.ttf"
+    logo: Any = None
+    show_logo: bool = True
+    header_font_size: int = 12
+    body_font_size: int = 7
+    page_margin_mm: int = 15
+    items_per_page: int = 15
+    max_chars_per_line: int = 60
+    header_background_color: str = "#D3D3D3"
+    grid_line_color: str = "#000000"
+    grid_line_width: float = 0.25
+    table_spacing: float = 1.5
+    show_header: bool = True
+    show_export_time: bool = True
+    show_page_numbers: bool = True
+    rtl_support: bool = False
+    content_alignment: str = "CENTER"
+    header_alignment: str = "CENTER"
+    title_alignment: str = "CENTER"
+    stream_response: bool = False
+    background_export: bool = False
+    query_chunk_size: int = 2000
+    plain_text_cells: bool = False
+    renderer: str = "platypus"
+    parallel_workers: int = 0
+    max_inline_cells: int = 0
+    oversized_export: str = "queue"
+    # Last change of the settings row; keys per-process caches such as the logo.
+    modified: Any = None
+
+    @classmethod
+    def resolve(cls, pdf_settings, *, landscape: bool = True) -> "ExportSettings":
+        """Snapshot *pdf_settings*, filling options it does not define with defaults.
+
+        Without a settings row, pages hold 15 rows of up to 60 characters per line in
+        landscape and 20 rows of up to 40 characters in portrait.
+        """
+        if isinstance(pdf_settings, cls):
+            return pdf_settings
+        defaults = cls(
+            items_per_page=15 if landscape else 20,
+            max_chars_per_line=60 if landscape else 40,
+        )
+        if pdf_settings is None:
+            return defaults
+        return cls(
+            **{
+                field.name: getattr(
+                    pdf_settings, field.name, getattr(defaults, field.name)
+                )
+                for field in fields(cls)
+            }
+        )
@@ -12,4 +12,6 @@ __all__ = ["export_to_pdf_landscape", "reshape_to_arabic"]
 @admin.action(description=_("Export selected records to PDF (landscape)"))
 def export_to_pdf_landscape(modeladmin, request, queryset):
     """Export data to PDF in landscape orientation."""
-    return build_pdf_export_response(modeladmin, queryset, landscape=True)
+    return build_pdf_export_response(
+        modeladmin, queryset, landscape=True, request=request
+    )
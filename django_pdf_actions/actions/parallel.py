@@ -0,0 +1,230 @@
+"""Parallel rendering of page ranges for very large exports.
+
+With ``parallel_workers`` above 1, ``write_pdf_export`` prepares the table rows and column
+widths as usual, then splits the pages into contiguous ranges of at least
+``PARALLEL_CHUNK_PAGES`` pages. Each range is rendered into a partial PDF file in a
+process pool (numbered against the total page count) and the part files are concatenated
+into *output* with ``pypdf``, an optional dependency (``pip install
+django-pdf-actions[parallel]``). Without ``pypdf``, for exports that fit in one range, or
+when a worker fails, the export is rendered in the current process instead.
+
+The pool is created once per process (``render_pool``) with the ``forkserver`` start
+method where available (``spawn`` elsewhere), so the threaded web worker is never
+forked; ``shutdown_render_pool`` stops it. Jobs carry only their own rows, with the
+header paragraphs reduced to their text and style, and parts travel through temporary files
+rather than as bytes, so the parent holds neither the parts nor a second copy of the
+document in memory.
+"""
+
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import replace
+from types import SimpleNamespace
+
+from reportlab.platypus import Paragraph
+
+logger = logging.getLogger(__name__)
+
+# Smallest page range handed to a worker; smaller exports are not worth the process hop.
+PARALLEL_CHUNK_PAGES = 50
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def page_ranges(total_pages, workers, min_pages=None):
+    """Split ``range(total_pages)`` into at most *workers* contiguous ranges.
+
+    Each range holds at least *min_pages* pages (default ``PARALLEL_CHUNK_PAGES``).
+    """
+    if min_pages is None:
+        min_pages = PARALLEL_CHUNK_PAGES
+    per_range = max(min_pages, -(-total_pages // max(workers, 1)))
+    return [
+        range(start, min(start + per_range, total_pages))
+        for start in range(0, total_pages, per_range)
+    ]
+
+
+def merge_pdf_parts(paths, output):
+    """Concatenate the PDF files at *paths* into the binary file object *output*."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    with ExitStack() as stack:
+        for path in paths:
+            writer.append(stack.enter_context(open(path, "rb")))
+        writer.write(output)
+
+
+def render_pool(workers):
+    """Process-wide pool rendering page ranges, sized for *workers* processes.
+
+    The pool is reused across exports and replaced when a different size is requested.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers != workers:
+            _pool.shutdown(wait=False)
+            _pool = None
+        if _pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            method = "forkserver" if "forkserver" in methods else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(method),
+                initializer=_init_worker,
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_render_pool(wait=True):
+    """Stop the worker processes of ``render_pool`` (also done at interpreter exit)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait)
+            _pool = None
+
+
+def pack_rows(rows):
+    """*rows* with each ``Paragraph`` reduced to ``(text, style index)``, plus the styles.
+
+    Parsed paragraph fragments are large; workers rebuild them (``unpack_rows``).
+    """
+    styles = []
+    style_index = {}
+    packed = []
+    for row in rows:
+        packed_row = []
+        for cell in row:
+            if isinstance(cell, Paragraph):
+                index = style_index.get(id(cell.style))
+                if index is None:
+                    index = style_index[id(cell.style)] = len(styles)
+                    styles.append(cell.style)
+                cell = (cell.text, index)
+            packed_row.append(cell)
+        packed.append(packed_row)
+    return packed, styles
+
+
+def unpack_rows(packed, styles):
+    """Rows of ``pack_rows`` with their paragraphs rebuilt."""
+    return [
+        [
+            Paragraph(cell[0], styles[cell[1]]) if isinstance(cell, tuple) else cell
+            for cell in row
+        ]
+        for row in packed
+    ]
+
+
+def render_in_parallel(
+    output,
+    model,
+    data,
+    col_widths,
+    *,
+    pagesize,
+    pdf_settings,
+    logo_source=None,
+    exported_at=None,
+    total_pages,
+):
+    """Render *data* in page ranges across ``pdf_settings.parallel_workers`` processes.
+
+    Returns ``True`` once the merged document is written to *output*, ``False`` (with
+    nothing written) when the caller should render the export in this process.
+    """
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        logger.warning(
+            "parallel_workers is set but pypdf is not installed; "
+            "rendering the export in one process"
+        )
+        return False
+
+    ranges = page_ranges(total_pages, pdf_settings.parallel_workers)
+    if len(ranges) < 2:
+        return False
+
+    rows_per_page = pdf_settings.items_per_page
+    # The logo is passed resolved; the settings' file field does not need to travel.
+    worker_settings = replace(pdf_settings, logo=None)
+    header = data[0:1]
+    options = {
+        "pagesize": pagesize,
+        "pdf_settings": worker_settings,
+        "logo_source": logo_source,
+        "exported_at": exported_at,
+        "total_pages": total_pages,
+    }
+
+    with tempfile.TemporaryDirectory(prefix="pdf-parts-") as directory:
+        paths = [
+            os.path.join(directory, f"part-{pages.start:06d}.pdf") for pages in ranges
+        ]
+        try:
+            pool = render_pool(pdf_settings.parallel_workers)
+            futures = [
+                pool.submit(
+                    _render_part,
+                    path,
+                    model,
+                    pack_rows(
+                        header
+                        + data[
+                            1
+                            + pages.start * rows_per_page : 1
+                            + pages.stop * rows_per_page
+                        ]
+                    ),
+                    col_widths,
+                    dict(options, first_page=pages.start),
+                )
+                for path, pages in zip(paths, ranges)
+            ]
+            for future in futures:
+                future.result()
+        except Exception:
+            logger.exception("Parallel PDF rendering failed; rendering in one process")
+            # A broken pool (e.g. a killed worker) is replaced on the next export.
+            shutdown_render_pool(wait=False)
+            return False
+
+        merge_pdf_parts(paths, output)
+    return True
+
+
+def _init_worker():
+    # forkserver/spawn workers start without configured apps.
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _render_part(path, model, packed, col_widths, options):
+    from .pdf_response import render_pages
+    from .utils import setup_font
+
+    with open(path, "wb") as fh:
+        render_pages(
+            fh,
+            # draw_model_name only needs ``modeladmin.model``.
+            SimpleNamespace(model=model),
+            unpack_rows(*packed),
+            col_widths,
+            font_name=setup_font(options["pdf_settings"]),
+            **options,
+        )
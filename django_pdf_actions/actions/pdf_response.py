@@ -5,29 +5,88 @@ Request trace (landscape example)
 ---------------------------------
 1. Admin POST runs ``export_to_pdf_landscape(modeladmin, request, queryset)`` (``landscape.py``).
 2. That delegates here to ``build_pdf_export_response(..., landscape=True)``.
-3. ``get_active_settings()`` (``utils``) returns the active row, ``None`` if none exist, or the
-   first by primary key if multiple rows are marked active (with a warning).
+3. ``get_active_settings()`` (``utils``) returns the active row or ``None`` if none exist,
+   cached in process memory and reloaded when the active row changes (``settings_cache``).
+   ``ExportSettings.resolve`` snapshots it with defaults filled in; that snapshot is passed
+   to every helper below.
 4. Page size from ``get_page_size(pdf_settings)``; if *landscape*, width/height are swapped.
 5. ``setup_font`` → ``resolve_font_path`` (project ``static/assets/fonts`` then staticfiles
    finders).
 6. ``reshape_to_arabic`` builds the table matrix from ``modeladmin.list_display`` + queryset rows
    (headers from field verbose names or admin ``short_description``; cells from attributes or
    admin callables).
-7. ``calculate_column_widths`` / ReportLab ``Table`` + draw helpers lay out each page slice;
-   ``HttpResponse`` is returned with PDF bytes attached.
+7. ``calculate_column_widths`` / ReportLab ``Table`` lay out each page slice
+   (``write_pdf_export``); with the ``canvas`` renderer ``CanvasTable`` draws the rows
+   directly on the page instead. Title, export time and logo are drawn once into a form
+   XObject referenced by every page; only the page number is drawn per page.
+   With ``parallel_workers`` above 1, page ranges of large exports are rendered in worker
+   processes and merged (``parallel.py``).
+8. With ``background_export`` enabled steps 4-7 are deferred: an ``ExportJob`` is queued
+   (``jobs.enqueue_export``), the user is redirected to its status page and the
+   ``run_pdf_export_worker`` command renders it later via ``write_pdf_export``. With
+   ``max_inline_cells`` set, ``route_export`` estimates rows x columns first and queues or
+   rejects exports above the limit the same way.
+9. Otherwise an ``HttpResponse`` is returned with the PDF bytes attached. With
+   ``stream_response`` enabled the canvas writes into a ``SpooledTemporaryFile`` that is handed
+   to a ``FileResponse``, so the finished document is never copied into extra byte strings.
+
+Under ASGI, ``abuild_pdf_export_response`` does the same from async views: ReportLab renders
+in a bounded thread pool while the event loop fetches the rows chunk by chunk with
+``QuerySet.aiterator`` (``queries.StreamedRows``), and the spooled PDF is streamed through an
+async ``StreamingHttpResponse``.
+
+With ``PDF_ACTIONS_TELEMETRY`` enabled, both builders time each stage (settings, font,
+rows, widths, layout, save) and report it as a ``Server-Timing`` header, a log record and
+the ``export_finished`` signal (``django_pdf_actions.telemetry``); ``PDF_ACTIONS_METRICS``
+counts exports for the Prometheus view (``django_pdf_actions.metrics``).
+``PDF_ACTIONS_DEBUG_QUERIES`` reports the columns that query per row
+(``query_audit.QueryAudit``).
 """
 
+import asyncio
 import io
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from typing import Optional
 
-from django.http import HttpResponse
-from reportlab.lib import colors
+import django
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.db import close_old_connections
+from django.db.models import QuerySet
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseBase,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+from django.urls import NoReverseMatch, reverse
+from django.utils.translation import gettext as _
 from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
 from reportlab.platypus import Table
 
+from ..telemetry import ExportTelemetry
+from .canvas_table import CanvasTable
+from .export_settings import ExportSettings
+from .parallel import render_in_parallel
+from .queries import (
+    DEFAULT_CHUNK_SIZE,
+    StreamedRows,
+    apply_query_plan,
+    build_query_plan,
+    estimate_rows,
+    stream_rows,
+)
+from .query_audit import QueryAudit, query_debug_enabled
 from .utils import (
     calculate_column_widths,
+    create_header_style,
     create_table_style,
     draw_exported_at,
     draw_logo,
@@ -37,129 +96,548 @@ from .utils import (
     get_logo_path,
     get_page_size,
     hex_to_rgb,
+    paragraph_rows,
     reshape_to_arabic,
     setup_font,
 )
 
+# Streamed exports stay in memory up to this size, then spill to a temporary file.
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
 
-def build_pdf_export_response(modeladmin, queryset, *, landscape: bool) -> HttpResponse:
-    """Generate a PDF download for the given admin queryset (shared portrait/landscape)."""
-    pdf_settings = get_active_settings()
+# Bytes per chunk sent by async streaming responses.
+STREAM_CHUNK_SIZE = 64 * 1024
 
-    pagesize = get_page_size(pdf_settings)
-    if landscape:
-        pagesize = pagesize[1], pagesize[0]
+# Returned by ``route_export`` when an export should render in the request.
+RENDER_INLINE = object()
 
-    if landscape:
-        rows_per_page = pdf_settings.items_per_page if pdf_settings else 15
-        max_chars = pdf_settings.max_chars_per_line if pdf_settings else 60
-    else:
-        rows_per_page = pdf_settings.items_per_page if pdf_settings else 20
-        max_chars = pdf_settings.max_chars_per_line if pdf_settings else 40
+# Threads rendering async exports (``PDF_ACTIONS_ASYNC_RENDER_WORKERS`` overrides).
+ASYNC_RENDER_WORKERS = 4
+
+_render_executor = None
+_render_executor_lock = threading.Lock()
+
+# Form XObject with the page furniture shared by every page (title, export time, logo).
+PAGE_CHROME_FORM_NAME = "PdfActChrome"
+
+
+def export_filename(modeladmin) -> str:
+    """Download file name for an export of ``modeladmin.model``."""
+    return (
+        f"{modeladmin.model.__name__}_export_"
+        f'{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.pdf'
+    )
+
+
+def build_pdf_export_response(
+    modeladmin, queryset, *, landscape: bool, request=None
+) -> Optional[HttpResponseBase]:
+    """Generate a PDF download for the given admin queryset (shared portrait/landscape).
+
+    With ``background_export`` enabled, or for exports above ``max_inline_cells`` (and a
+    *request* to report back to), the export is queued as an ``ExportJob`` instead and
+    the user is redirected to its status page, or it is rejected (``route_export``).
+    """
+    telemetry = ExportTelemetry.start()
+    with telemetry.stage("settings"):
+        pdf_settings = ExportSettings.resolve(
+            get_active_settings(), landscape=landscape
+        )
+
+    routed = route_export(
+        modeladmin, request, queryset, landscape=landscape, pdf_settings=pdf_settings
+    )
+    if routed is not RENDER_INLINE:
+        telemetry.close()
+        return routed
+    telemetry.export_started(modeladmin, landscape=landscape)
+    query_audit = QueryAudit(modeladmin.model) if query_debug_enabled() else None
+
+    filename = export_filename(modeladmin)
+
+    if pdf_settings.stream_response:
+        output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        write_pdf_export(
+            modeladmin,
+            queryset,
+            output,
+            landscape=landscape,
+            pdf_settings=pdf_settings,
+            telemetry=telemetry,
+            query_audit=query_audit,
+        )
+        telemetry.count(bytes=output.tell())
+        output.seek(0)
+        # FileResponse closes (and thereby deletes) the spool once it is sent.
+        response = FileResponse(
+            output,
+            as_attachment=True,
+            filename=filename,
+            content_type="application/pdf",
+        )
+        telemetry.report(modeladmin, landscape=landscape, response=response)
+        if query_audit is not None:
+            query_audit.report(response)
+        return response
 
     response = HttpResponse(content_type="application/pdf")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    buffer = io.BytesIO()
+    write_pdf_export(
+        modeladmin,
+        queryset,
+        buffer,
+        landscape=landscape,
+        pdf_settings=pdf_settings,
+        telemetry=telemetry,
+        query_audit=query_audit,
+    )
+    response.write(buffer.getvalue())
+    buffer.close()
+    telemetry.count(bytes=len(response.content))
+    telemetry.report(modeladmin, landscape=landscape, response=response)
+    if query_audit is not None:
+        query_audit.report(response)
+    return response
+
+
+async def abuild_pdf_export_response(
+    modeladmin, queryset, *, landscape: bool, request=None
+) -> Optional[HttpResponseBase]:
+    """Async variant of ``build_pdf_export_response`` for async views under ASGI.
+
+    The PDF is rendered in a bounded thread pool (``render_executor``) that receives the
+    rows chunk by chunk as async ORM iteration fetches them, and is streamed through an
+    async ``StreamingHttpResponse``, so the event loop is never blocked by the export and
+    the fetched rows are never held all at once. Django versions without async
+    streaming responses (before 4.2) run ``build_pdf_export_response`` in a thread.
+    """
+    if django.VERSION < (4, 2):
+        return await sync_to_async(build_pdf_export_response)(
+            modeladmin, queryset, landscape=landscape, request=request
+        )
+
+    telemetry = ExportTelemetry.start()
+    with telemetry.stage("settings"):
+        pdf_settings = ExportSettings.resolve(
+            await sync_to_async(get_active_settings)(), landscape=landscape
+        )
+    routed = await sync_to_async(route_export)(
+        modeladmin, request, queryset, landscape=landscape, pdf_settings=pdf_settings
+    )
+    if routed is not RENDER_INLINE:
+        telemetry.close()
+        return routed
+    telemetry.export_started(modeladmin, landscape=landscape)
+    query_audit = QueryAudit(modeladmin.model) if query_debug_enabled() else None
+
+    plan = build_query_plan(queryset.model, list(modeladmin.list_display), modeladmin)
+    rows = stream_rows(
+        apply_query_plan(queryset, plan),
+        pdf_settings.query_chunk_size or DEFAULT_CHUNK_SIZE,
+    )
+    # Rows are fetched here while the render thread consumes them.
+    feeding = (
+        asyncio.ensure_future(rows.feed()) if isinstance(rows, StreamedRows) else None
+    )
+
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        await asyncio.get_running_loop().run_in_executor(
+            render_executor(),
+            partial(
+                _render_in_thread,
+                modeladmin,
+                rows,
+                output,
+                landscape=landscape,
+                pdf_settings=pdf_settings,
+                telemetry=telemetry,
+                query_audit=query_audit,
+            ),
+        )
+    except BaseException:
+        output.close()
+        raise
+    finally:
+        if feeding is not None:
+            # Stops fetching when the render thread gave up on the rows.
+            feeding.cancel()
+    telemetry.count(bytes=output.tell())
+    output.seek(0)
+
+    response = StreamingHttpResponse(
+        _aiter_file(output), content_type="application/pdf"
+    )
     response["Content-Disposition"] = (
-        f'attachment; filename="{modeladmin.model.__name__}_export_'
-        f'{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.pdf"'
+        f'attachment; filename="{export_filename(modeladmin)}"'
     )
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=pagesize)
-    canvas_width, canvas_height = pagesize
-    page_margin = (pdf_settings.page_margin_mm if pdf_settings else 15) * mm
-
-    font_name = setup_font(pdf_settings)
-    logo_source = get_logo_path(pdf_settings)
-    header_bg_color = (
-        hex_to_rgb(pdf_settings.header_background_color)
-        if pdf_settings
-        else colors.lightgrey
+    # Metrics may be written to PDF_ACTIONS_METRICS_DIR; keep file I/O off the loop.
+    await sync_to_async(telemetry.report)(
+        modeladmin, landscape=landscape, response=response
     )
-    grid_color = (
-        hex_to_rgb(pdf_settings.grid_line_color) if pdf_settings else colors.black
+    if query_audit is not None:
+        query_audit.report(response)
+    return response
+
+
+def render_executor():
+    """Process-wide thread pool that renders async exports.
+
+    Created on first use; ``shutdown_render_executor`` stops it.
+    """
+    global _render_executor
+    with _render_executor_lock:
+        if _render_executor is None:
+            _render_executor = ThreadPoolExecutor(
+                max_workers=getattr(
+                    settings, "PDF_ACTIONS_ASYNC_RENDER_WORKERS", ASYNC_RENDER_WORKERS
+                ),
+                thread_name_prefix="pdf-render",
+            )
+        return _render_executor
+
+
+def shutdown_render_executor(wait=True):
+    """Stop the threads of ``render_executor``, e.g. from an ASGI lifespan shutdown handler.
+
+    Running renders finish first when *wait* is true; the next async export starts a new
+    pool.
+    """
+    global _render_executor
+    with _render_executor_lock:
+        if _render_executor is not None:
+            _render_executor.shutdown(wait=wait)
+            _render_executor = None
+
+
+def _render_in_thread(
+    modeladmin, rows, output, *, landscape, pdf_settings, telemetry, query_audit
+):
+    try:
+        write_pdf_export(
+            modeladmin,
+            rows,
+            output,
+            landscape=landscape,
+            pdf_settings=pdf_settings,
+            telemetry=telemetry,
+            query_audit=query_audit,
+        )
+    finally:
+        # Lazy relations and admin callables may have queried from this thread.
+        close_old_connections()
+
+
+async def _aiter_file(output):
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, output.read, STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        output.close()
+
+
+def route_export(modeladmin, request, queryset, *, landscape: bool, pdf_settings):
+    """Decide where an export runs: ``RENDER_INLINE``, or the response to return instead.
+
+    Without a *request* every export renders inline. ``background_export`` queues every
+    export; otherwise, with ``max_inline_cells`` set, the export is sized as estimated rows
+    (``queries.estimate_rows``) x ``list_display`` columns, and larger exports are queued
+    or rejected with an admin message depending on ``oversized_export``. Only querysets
+    can be queued; other iterables render inline.
+    """
+    if request is None:
+        return RENDER_INLINE
+    if pdf_settings.background_export:
+        return queue_pdf_export(modeladmin, request, queryset, landscape=landscape)
+
+    limit = pdf_settings.max_inline_cells
+    if not limit:
+        return RENDER_INLINE
+    rows = estimate_rows(queryset, modeladmin)
+    columns = len(modeladmin.list_display)
+    if rows * columns <= limit:
+        return RENDER_INLINE
+
+    if pdf_settings.oversized_export == "reject":
+        modeladmin.message_user(
+            request,
+            _(
+                "This export is too large to generate here: about %(rows)s rows x "
+                "%(columns)s columns (limit %(limit)s cells). Narrow the selection "
+                "with filters or search."
+            )
+            % {"rows": rows, "columns": columns, "limit": limit},
+            messages.ERROR,
+        )
+        return None
+    if isinstance(queryset, QuerySet):
+        return queue_pdf_export(modeladmin, request, queryset, landscape=landscape)
+    return RENDER_INLINE
+
+
+def queue_pdf_export(
+    modeladmin, request, queryset, *, landscape: bool
+) -> Optional[HttpResponseBase]:
+    """Queue a background export job and redirect to its status page."""
+    from ..jobs import enqueue_export
+
+    job = enqueue_export(
+        modeladmin, queryset, landscape=landscape, user=getattr(request, "user", None)
     )
-    table_style = create_table_style(
-        pdf_settings, font_name, header_bg_color, grid_color
+    modeladmin.message_user(
+        request,
+        _("PDF export #%(pk)s of %(count)s rows has been queued.")
+        % {"pk": job.pk, "count": job.row_count},
+        messages.INFO,
     )
+    try:
+        status_url = reverse("django_pdf_actions:export_job_status", args=[job.pk])
+    except NoReverseMatch:
+        # URLs not installed: stay on the changelist.
+        return None
+    return HttpResponseRedirect(status_url)
 
-    table_width = canvas_width - (2 * page_margin)
-    table_height = canvas_height - (3 * page_margin)
+
+def write_pdf_export(
+    modeladmin,
+    queryset,
+    output,
+    *,
+    landscape: bool,
+    pdf_settings,
+    telemetry=None,
+    query_audit=None,
+):
+    """Render the export of *queryset* as a PDF into the binary file object *output*.
+
+    *pdf_settings* is an ``ExportSettings`` snapshot, or a settings row (or ``None``) that
+    is resolved into one. With ``parallel_workers`` above 1, page ranges of large exports
+    are rendered in worker processes and merged (``parallel.render_in_parallel``).
+    Stage timings and row/page counts are recorded on *telemetry* when given, and the
+    queries of each column on *query_audit*.
+    """
+    if telemetry is None:
+        telemetry = ExportTelemetry(enabled=False)
+    pdf_settings = ExportSettings.resolve(pdf_settings, landscape=landscape)
+    pagesize = get_page_size(pdf_settings)
+    if landscape:
+        pagesize = pagesize[1], pagesize[0]
+
+    rows_per_page = pdf_settings.items_per_page
+    body_font_size = pdf_settings.body_font_size
+    page_margin = pdf_settings.page_margin_mm * mm
+    table_width = pagesize[0] - (2 * page_margin)
+
+    with telemetry.stage("font"):
+        font_name = setup_font(pdf_settings)
+        logo_source = get_logo_path(pdf_settings)
 
     valid_fields = list(modeladmin.list_display)
-    data = reshape_to_arabic(
-        valid_fields,
-        font_name,
-        pdf_settings.body_font_size if pdf_settings else 7,
-        queryset,
-        max_chars,
-        pdf_settings,
+    with telemetry.stage("rows"):
+        data = reshape_to_arabic(
+            valid_fields,
+            font_name,
+            body_font_size,
+            queryset,
+            pdf_settings.max_chars_per_line,
+            pdf_settings,
+            modeladmin,
+            query_audit=query_audit,
+        )
+
+    with telemetry.stage("widths"):
+        col_widths = calculate_column_widths(
+            data,
+            table_width,
+            font_name,
+            body_font_size,
+            # Left + right cell padding (see create_table_style).
+            padding=pdf_settings.table_spacing * 4 * mm,
+        )
+    total_rows = len(data) - 1
+    total_pages = max(1, int((total_rows + rows_per_page - 1) // rows_per_page))
+    telemetry.count(rows=total_rows, pages=total_pages)
+    exported_at = datetime.now()
+
+    if pdf_settings.parallel_workers > 1:
+        with telemetry.stage("parallel"):
+            rendered = render_in_parallel(
+                output,
+                modeladmin.model,
+                data,
+                col_widths,
+                pagesize=pagesize,
+                pdf_settings=pdf_settings,
+                logo_source=logo_source,
+                exported_at=exported_at,
+                total_pages=total_pages,
+            )
+        if rendered:
+            return
+
+    render_pages(
+        output,
         modeladmin,
+        data,
+        col_widths,
+        pagesize=pagesize,
+        font_name=font_name,
+        pdf_settings=pdf_settings,
+        logo_source=logo_source,
+        exported_at=exported_at,
+        total_pages=total_pages,
+        telemetry=telemetry,
     )
 
-    col_widths = calculate_column_widths(
-        data,
-        table_width,
-        font_name,
-        pdf_settings.body_font_size if pdf_settings else 7,
+
+def render_pages(
+    output,
+    modeladmin,
+    data,
+    col_widths,
+    *,
+    pagesize,
+    font_name,
+    pdf_settings,
+    logo_source=None,
+    exported_at=None,
+    first_page=0,
+    total_pages=None,
+    telemetry=None,
+):
+    """Lay out the table rows of *data* (header row first) as pages of a PDF in *output*.
+
+    Pages are numbered from *first_page* out of *total_pages* (default: the pages of
+    *data*), so a page range of a larger export can be rendered on its own. Layout and
+    ``save`` are timed on *telemetry* when given.
+    """
+    if telemetry is None:
+        telemetry = ExportTelemetry(enabled=False)
+    with telemetry.stage("layout"):
+        p = _layout_pages(
+            output,
+            modeladmin,
+            data,
+            col_widths,
+            pagesize=pagesize,
+            font_name=font_name,
+            pdf_settings=pdf_settings,
+            logo_source=logo_source,
+            exported_at=exported_at,
+            first_page=first_page,
+            total_pages=total_pages,
+        )
+    with telemetry.stage("save"):
+        p.save()
+
+
+def _layout_pages(
+    output,
+    modeladmin,
+    data,
+    col_widths,
+    *,
+    pagesize,
+    font_name,
+    pdf_settings,
+    logo_source,
+    exported_at,
+    first_page,
+    total_pages,
+):
+    rows_per_page = pdf_settings.items_per_page
+    body_font_size = pdf_settings.body_font_size
+
+    p = canvas.Canvas(output, pagesize=pagesize)
+    canvas_width, canvas_height = pagesize
+    page_margin = pdf_settings.page_margin_mm * mm
+
+    header_bg_color = hex_to_rgb(pdf_settings.header_background_color)
+    grid_color = hex_to_rgb(pdf_settings.grid_line_color)
+    table_style = create_table_style(
+        pdf_settings, font_name, header_bg_color, grid_color
     )
-    total_rows = len(data) - 1
-    total_pages = max(1, int((total_rows + rows_per_page - 1) // rows_per_page))
+    body_style = create_header_style(pdf_settings, font_name, is_header=False)
+
+    table_width = canvas_width - (2 * page_margin)
+    table_height = canvas_height - (3 * page_margin)
+
+    canvas_table = None
+    if pdf_settings.renderer == "canvas":
+        canvas_table = CanvasTable(
+            col_widths, font_name, pdf_settings, header_bg_color, grid_color
+        )
+    page_count = max(1, int((len(data) - 1 + rows_per_page - 1) // rows_per_page))
+    if total_pages is None:
+        total_pages = first_page + page_count
 
     header_margin = page_margin + (10 * mm)
     table_top_margin = header_margin + (8 * mm)
     footer_margin = page_margin + (5 * mm)
 
-    for page in range(total_pages):
-        if not pdf_settings or pdf_settings.show_header:
-            draw_model_name(
-                p,
-                modeladmin,
-                font_name,
-                pdf_settings.header_font_size if pdf_settings else 12,
-                canvas_width,
-                canvas_height,
-                header_margin,
-                pdf_settings=pdf_settings,
-            )
+    # Title, export time and logo are identical on every page: render them once into a
+    # form and only reference it per page; the page number is the only per-page text.
+    p.beginForm(PAGE_CHROME_FORM_NAME)
+    if pdf_settings.show_header:
+        draw_model_name(
+            p,
+            modeladmin,
+            font_name,
+            pdf_settings.header_font_size,
+            canvas_width,
+            canvas_height,
+            header_margin,
+            pdf_settings=pdf_settings,
+        )
+    if pdf_settings.show_export_time:
+        draw_exported_at(
+            p,
+            font_name,
+            body_font_size,
+            canvas_width,
+            footer_margin,
+            pdf_settings=pdf_settings,
+            exported_at=exported_at,
+        )
+    if logo_source is not None:
+        draw_logo(p, logo_source, canvas_width, canvas_height)
+    p.endForm()
 
+    for page in range(page_count):
         start_row = page * rows_per_page
         end_row = min((page + 1) * rows_per_page + 1, len(data))
-        page_data = data[0:1] + data[start_row + 1 : end_row]
+        # Body paragraphs are built for this page only and dropped once it is drawn.
+        page_data = data[0:1] + paragraph_rows(
+            data[start_row + 1 : end_row], body_style
+        )
 
-        table = Table(page_data, colWidths=col_widths, style=table_style)
-        table.wrapOn(p, table_width, table_height)
         table_x = (canvas_width - table_width) / 2
-        table_y = canvas_height - table_top_margin - table._height
-        table.drawOn(p, table_x, table_y)
+        if canvas_table is not None:
+            canvas_table.draw(p, page_data, table_x, canvas_height - table_top_margin)
+        else:
+            table = Table(page_data, colWidths=col_widths, style=table_style)
+            table.wrapOn(p, table_width, table_height)
+            table_y = canvas_height - table_top_margin - table._height
+            table.drawOn(p, table_x, table_y)
 
-        if not pdf_settings or pdf_settings.show_export_time:
-            draw_exported_at(
-                p,
-                font_name,
-                pdf_settings.body_font_size if pdf_settings else 7,
-                canvas_width,
-                footer_margin,
-                pdf_settings=pdf_settings,
-            )
+        p.doForm(PAGE_CHROME_FORM_NAME)
 
-        if not pdf_settings or pdf_settings.show_page_numbers:
+        if pdf_settings.show_page_numbers:
             draw_page_number(
                 p,
-                page,
+                first_page + page,
                 total_pages,
                 font_name,
-                pdf_settings.body_font_size if pdf_settings else 7,
+                body_font_size,
                 canvas_width,
                 footer_margin,
                 pdf_settings=pdf_settings,
             )
 
-        if logo_source is not None:
-            draw_logo(p, logo_source, canvas_width, canvas_height)
-
         p.showPage()
 
-    p.save()
-    pdf = buffer.getvalue()
-    buffer.close()
-    response.write(pdf)
-    return response
+    return p
@@ -12,4 +12,6 @@ __all__ = ["export_to_pdf_portrait", "reshape_to_arabic"]
 @admin.action(description=_("Export selected records to PDF (portrait)"))
 def export_to_pdf_portrait(modeladmin, request, queryset):
     """Export data to PDF in portrait orientation."""
-    return build_pdf_export_response(modeladmin, queryset, landscape=False)
+    return build_pdf_export_response(
+        modeladmin, queryset, landscape=False, request=request
+    )
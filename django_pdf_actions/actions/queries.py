@@ -0,0 +1,251 @@
+"""Queryset helpers for PDF exports."""
+
+import asyncio
+from functools import partial
+from itertools import islice
+from typing import NamedTuple, Tuple
+
+import django
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet, prefetch_related_objects
+from django.db.models.constants import LOOKUP_SEP
+
+# Rows fetched per database round trip when no settings row overrides it.
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def iterate_queryset(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Iterate *queryset* without filling its result cache.
+
+    Uses ``QuerySet.iterator(chunk_size=...)`` so only one chunk of model instances is
+    alive at a time. ``prefetch_related`` lookups are honoured natively on Django 4.1+
+    and prefetched per chunk on older versions. Already evaluated querysets and plain
+    iterables are iterated as they are.
+    """
+    if not isinstance(queryset, QuerySet) or queryset._result_cache is not None:
+        return iter(queryset)
+    if queryset._prefetch_related_lookups and django.VERSION < (4, 1):
+        return _iterate_with_prefetch(queryset, chunk_size)
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def estimate_rows(queryset, modeladmin=None):
+    """Cheap row estimate for *queryset* before exporting it.
+
+    Uses ``ModelAdmin.pdf_export_estimator(queryset)`` when the admin defines one (e.g. a
+    planner estimate for huge tables), else ``queryset.count()`` or ``len()`` for
+    evaluated querysets and plain iterables.
+    """
+    estimator = getattr(modeladmin, "pdf_export_estimator", None)
+    if estimator is not None:
+        return estimator(queryset)
+    if isinstance(queryset, QuerySet):
+        return queryset.count()
+    return len(queryset)
+
+
+def iterate_chunks(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the rows of *queryset* in lists of up to *chunk_size* (see ``iterate_queryset``)."""
+    rows = iterate_queryset(queryset, chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def aiterate_chunks(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Async ``iterate_chunks``: yield the rows of *queryset* in lists of up to *chunk_size*.
+
+    Uses ``QuerySet.aiterator`` (Django 4.1+; with ``prefetch_related`` from Django 5.0).
+    Otherwise each chunk is fetched with ``iterate_chunks`` in a worker thread.
+    """
+    if django.VERSION >= (4, 1) and (
+        not queryset._prefetch_related_lookups or django.VERSION >= (5, 0)
+    ):
+        chunk = []
+        async for obj in queryset.aiterator(chunk_size=chunk_size):
+            chunk.append(obj)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+        return
+
+    from asgiref.sync import sync_to_async
+
+    next_chunk = sync_to_async(
+        partial(next, iterate_chunks(queryset, chunk_size), None)
+    )
+    while True:
+        chunk = await next_chunk()
+        if chunk is None:
+            return
+        yield chunk
+
+
+class StreamedRows:
+    """Rows of a queryset fetched in the event loop while another thread exports them.
+
+    ``feed()`` runs in the event loop and puts chunks of up to *chunk_size* model instances
+    on a bounded ``asyncio.Queue``; iterating takes them off from the rendering thread
+    (never from the event loop thread), so at most *max_chunks* fetched chunks wait at a
+    time. Keeps the queryset's ``model``, ``query`` (annotations) and ``db`` so the export
+    can build its columns without running the query again.
+    """
+
+    def __init__(self, queryset, chunk_size=DEFAULT_CHUNK_SIZE, max_chunks=2):
+        self.model = queryset.model
+        self.query = queryset.query
+        self.db = queryset.db
+        self._queryset = queryset
+        self._chunk_size = chunk_size
+        self._loop = asyncio.get_running_loop()
+        self._chunks = asyncio.Queue(maxsize=max_chunks)
+
+    async def feed(self):
+        """Fetch the rows into the queue; a failure is raised in the iterating thread."""
+        try:
+            async for chunk in aiterate_chunks(self._queryset, self._chunk_size):
+                await self._chunks.put(chunk)
+        except Exception as exc:
+            await self._chunks.put(exc)
+        else:
+            await self._chunks.put(None)
+
+    def __iter__(self):
+        while True:
+            chunk = asyncio.run_coroutine_threadsafe(
+                self._chunks.get(), self._loop
+            ).result()
+            if chunk is None:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield from chunk
+
+
+def stream_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """``StreamedRows`` of *queryset*; evaluated querysets and plain iterables are returned as is.
+
+    Must be called from the event loop, which then runs ``feed()`` while the rows are
+    consumed in another thread.
+    """
+    if not isinstance(queryset, QuerySet) or queryset._result_cache is not None:
+        return queryset
+    return StreamedRows(queryset, chunk_size)
+
+
+def _iterate_with_prefetch(queryset, chunk_size):
+    lookups = queryset._prefetch_related_lookups
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        prefetch_related_objects(chunk, *lookups)
+        yield from chunk
+
+
+class QueryPlan(NamedTuple):
+    """Related lookups to apply to an export queryset before iterating it."""
+
+    select_related: Tuple[str, ...] = ()
+    prefetch_related: Tuple[str, ...] = ()
+    select_all: bool = False
+
+
+def _relation_lookup(model, column):
+    """Return ``(kind, path)`` for the relations traversed by a ``list_display`` entry.
+
+    *kind* is ``"select"`` for forward/one-to-one chains and ``"prefetch"`` once a
+    to-many relation is crossed; ``(None, "")`` when *column* is not a relation.
+    """
+    parts = column.split(LOOKUP_SEP)
+    path = []
+    kind = None
+    opts = model._meta
+    for part in parts:
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation or field.related_model is None:
+            break
+        path.append(part)
+        if field.many_to_many or field.one_to_many:
+            kind = "prefetch"
+        elif kind is None:
+            kind = "select"
+        opts = field.related_model._meta
+    if not path:
+        return None, ""
+    return kind, LOOKUP_SEP.join(path)
+
+
+def build_query_plan(model, columns, modeladmin=None):
+    """Derive the joins an export of *columns* needs to avoid per-row queries.
+
+    Relations named in ``list_display`` (including ``__`` lookups) are joined with
+    ``select_related`` or prefetched when they cross a to-many relation.
+    ``ModelAdmin.list_select_related`` is honoured like the changelist does, and
+    ``ModelAdmin.pdf_prefetch_related`` adds lookups used by admin callables.
+    """
+    select_related = []
+    prefetch_related = list(getattr(modeladmin, "pdf_prefetch_related", None) or ())
+
+    list_select_related = getattr(modeladmin, "list_select_related", False)
+    select_all = list_select_related is True
+    if list_select_related and not select_all:
+        select_related.extend(list_select_related)
+
+    for column in columns:
+        if not isinstance(column, str):
+            continue
+        kind, path = _relation_lookup(model, column)
+        target = select_related if kind == "select" else prefetch_related
+        if path and path not in target:
+            target.append(path)
+
+    return QueryPlan(tuple(select_related), tuple(prefetch_related), select_all)
+
+
+def apply_query_plan(queryset, plan):
+    """Apply *plan* to *queryset*; evaluated querysets and plain iterables are returned as is."""
+    if not isinstance(queryset, QuerySet) or queryset._result_cache is not None:
+        return queryset
+    deferred_fields, _defer = queryset.query.deferred_loading
+    select_related = list(plan.select_related)
+    if select_related and (plan.select_all or queryset.query.select_related is True):
+        # Naming paths replaces select_related(True); keep the relations it follows.
+        select_related += _required_relation_paths(queryset.model)
+    elif plan.select_all and not deferred_fields:
+        queryset = queryset.select_related()
+    if select_related and not deferred_fields:
+        # select_related() cannot traverse fields hidden by only()/defer().
+        queryset = queryset.select_related(*select_related)
+    if plan.prefetch_related:
+        queryset = queryset.prefetch_related(*plan.prefetch_related)
+    return queryset
+
+
+def _required_relation_paths(model, prefix="", depth=5):
+    """Paths ``select_related()`` without arguments follows from *model*.
+
+    Those are the non-null forward foreign keys and one-to-ones (parent links excepted),
+    up to Django's default depth of 5.
+    """
+    paths = []
+    if depth == 0:
+        return paths
+    for field in model._meta.concrete_fields:
+        remote_field = field.remote_field
+        if remote_field is None or field.null or remote_field.parent_link:
+            continue
+        path = prefix + field.name
+        paths.append(path)
+        paths.extend(
+            _required_relation_paths(field.related_model, path + LOOKUP_SEP, depth - 1)
+        )
+    return paths
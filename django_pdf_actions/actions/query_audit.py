@@ -0,0 +1,157 @@
+"""Debug mode that attributes the queries of an export to its ``list_display`` columns.
+
+With ``PDF_ACTIONS_DEBUG_QUERIES = True``, ``reshape_to_arabic`` runs every column accessor
+under a ``QueryAudit``: a ``connection.execute_wrapper`` that counts the queries issued
+while each column is evaluated (queries fetching the rows themselves, including prefetches,
+are not attributed to a column). Columns that queried are logged as warnings on
+``django_pdf_actions.actions.query_audit`` and listed in the ``X-PDF-Export-Queries``
+response header, with the ``select_related``/``prefetch_related`` lookups that would
+avoid the queries:
+
+* columns over a relation suggest the lookup of that relation;
+* admin callables and model methods suggest the relations of the exported model whose
+  tables appear in the queries they ran.
+
+I/O-bound columns are evaluated in the request thread while auditing, so their queries
+are counted on the audited connection.
+"""
+
+import logging
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .columns import Column
+from .queries import _relation_lookup
+
+logger = logging.getLogger(__name__)
+
+HEADER = "X-PDF-Export-Queries"
+
+
+def query_debug_enabled():
+    """Whether exports audit the queries of their columns (``PDF_ACTIONS_DEBUG_QUERIES``)."""
+    return bool(getattr(settings, "PDF_ACTIONS_DEBUG_QUERIES", False))
+
+
+class QueryAudit:
+    """Queries run by each column of one export."""
+
+    def __init__(self, model=None):
+        self.model = model
+        self.rows = 0
+        self.queries = {}
+        self._alias = DEFAULT_DB_ALIAS
+        self._column = None
+
+    def __call__(self, execute, sql, params, many, context):
+        if self._column is not None:
+            self.queries.setdefault(self._column, []).append(sql)
+        return execute(sql, params, many, context)
+
+    def wrap(self, columns):
+        """*columns* with accessors that attribute their queries to the column."""
+        return [
+            Column(column.name, column.header, column.kind, self._tracked(column))
+            for column in columns
+        ]
+
+    def _tracked(self, column):
+        get = column.get
+
+        def tracked(obj):
+            self._column = column
+            try:
+                return get(obj)
+            finally:
+                self._column = None
+
+        return tracked
+
+    @contextmanager
+    def track(self, queryset):
+        """Count queries on the database connection of *queryset*."""
+        self.model = self.model or getattr(queryset, "model", None)
+        self._alias = getattr(queryset, "db", DEFAULT_DB_ALIAS)
+        with connections[self._alias].execute_wrapper(self):
+            yield
+
+    def offenders(self):
+        """One dict per column that ran queries, most queries first.
+
+        Keys: ``column``, ``queries``, ``rows``, ``per_row`` (at least one query per
+        exported row), ``select_related`` and ``prefetch_related`` (suggested lookups).
+        """
+        report = []
+        for column, statements in self.queries.items():
+            select_related, prefetch_related = self.suggest(column, statements)
+            report.append(
+                {
+                    "column": column.name,
+                    "queries": len(statements),
+                    "rows": self.rows,
+                    "per_row": len(statements) >= self.rows > 0,
+                    "select_related": select_related,
+                    "prefetch_related": prefetch_related,
+                }
+            )
+        report.sort(key=lambda entry: entry["queries"], reverse=True)
+        return report
+
+    def suggest(self, column, statements):
+        """``(select_related, prefetch_related)`` lookups that would serve *column*."""
+        if self.model is None:
+            return [], []
+        if column.kind == "related":
+            kind, path = _relation_lookup(self.model, column.name)
+            if path:
+                return ([path], []) if kind == "select" else ([], [path])
+
+        select_related, prefetch_related = [], []
+        quote = connections[self._alias].ops.quote_name
+        for field in self.model._meta.get_fields():
+            if not field.is_relation or field.related_model is None:
+                continue
+            table = quote(field.related_model._meta.db_table)
+            if not any(table in sql for sql in statements):
+                continue
+            if field.concrete:
+                name = field.name
+            else:
+                name = field.get_accessor_name()
+            if field.many_to_many or field.one_to_many:
+                prefetch_related.append(name)
+            else:
+                select_related.append(name)
+        return select_related, prefetch_related
+
+    def report(self, response=None):
+        """Log the offending columns and list them in *response*'s header."""
+        offenders = self.offenders()
+        if not offenders:
+            return
+        label = self.model._meta.label if self.model is not None else "export"
+        for entry in offenders:
+            logger.warning(
+                "PDF export of %s: column %r ran %s queries for %s rows%s",
+                label,
+                entry["column"],
+                entry["queries"],
+                entry["rows"],
+                _format_suggestion(entry),
+            )
+        if response is not None:
+            response[HEADER] = ", ".join(
+                f"{entry['column']}={entry['queries']}{_format_suggestion(entry)}"
+                for entry in offenders
+            )
+
+
+def _format_suggestion(entry):
+    hints = []
+    if entry["select_related"]:
+        hints.append(f"select_related: {' '.join(entry['select_related'])}")
+    if entry["prefetch_related"]:
+        hints.append(f"prefetch_related: {' '.join(entry['prefetch_related'])}")
+    return f" ({'; '.join(hints)})" if hints else ""
@@ -0,0 +1,55 @@
+"""Right-to-left text shaping for exports with ``rtl_support`` enabled.
+
+``shape_rtl`` joins Arabic letters (``arabic_reshaper``) and reorders bidi text for display
+(``get_display``). Strings without a right-to-left codepoint, such as numbers, dates and
+ASCII codes, are returned unchanged without running either step, shaped strings are kept
+in a bounded LRU, and ``shape_columns`` shapes each distinct value of a column once.
+"""
+
+import re
+from functools import lru_cache
+
+import arabic_reshaper
+from bidi.algorithm import get_display
+
+# Hebrew, Arabic, Syriac, Thaana, NKo, Samaritan, Mandaic and the Arabic presentation forms.
+RTL_CHARS_RE = re.compile("[\u0590-\u08ff\ufb1d-\ufdff\ufe70-\ufefc]")
+
+# Distinct shaped strings kept per process.
+SHAPE_CACHE_SIZE = 8192
+
+
+def has_rtl(text):
+    """Whether *text* contains a right-to-left codepoint."""
+    return RTL_CHARS_RE.search(text) is not None
+
+
+@lru_cache(maxsize=SHAPE_CACHE_SIZE)
+def _shape(text):
+    return get_display(arabic_reshaper.reshape(text))
+
+
+def shape_rtl(text):
+    """Reshape and reorder *text* for display; left-to-right strings are returned as is."""
+    if not text or not has_rtl(text):
+        return text
+    return _shape(text)
+
+
+def shape_columns(rows):
+    """Shape every cell of *rows* (sequences of strings), each distinct value once per column.
+
+    Returns new rows with the shaped values, in the same order.
+    """
+    if not rows:
+        return []
+    columns = []
+    for values in zip(*rows):
+        shaped = {value: shape_rtl(value) for value in set(values)}
+        columns.append([shaped[value] for value in values])
+    return [list(row) for row in zip(*columns)]
+
+
+def clear_shaping_cache():
+    """Forget shaped strings (used by tests)."""
+    _shape.cache_clear()
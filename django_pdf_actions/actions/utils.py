@@ -1,15 +1,19 @@
 """Utility functions for PDF export actions"""
 
 import hashlib
+import html
 import logging
 import os
+import random
+import re
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import lru_cache
 from io import BytesIO
 from typing import Optional
 
-import arabic_reshaper
-from bidi.algorithm import get_display
-from django.conf import settings
-from django.core.exceptions import FieldDoesNotExist, MultipleObjectsReturned
+from django.core.exceptions import MultipleObjectsReturned
 from django.utils.text import capfirst
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A1, A2, A3, A4
@@ -19,10 +23,33 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import Paragraph, Table, TableStyle
 
+from ..fonts import font_catalog
 from ..models import ExportPDFSettings
+from ..settings_cache import get_cached_settings
+from .columns import IO_BOUND_WORKERS, compile_columns, evaluate_chunk, io_executor
+from .queries import (
+    DEFAULT_CHUNK_SIZE,
+    apply_query_plan,
+    build_query_plan,
+    iterate_chunks,
+)
+from .shaping import has_rtl, shape_columns, shape_rtl
 
 logger = logging.getLogger(__name__)
 
+BREAK_TAG_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+MARKUP_TAG_RE = re.compile(r"<[^>]*>")
+
+# Resolved logos kept per process (see get_logo_path).
+LOGO_CACHE_SIZE = 8
+_logo_cache = OrderedDict()
+_logo_cache_lock = threading.Lock()
+# Form XObject holding the logo, defined on the first page of each document.
+LOGO_FORM_NAME = "PdfActLogo"
+
+# Body rows measured by calculate_column_widths; larger exports are sampled.
+COLUMN_WIDTH_SAMPLE_SIZE = 1000
+
 # Page size mapping
 PAGE_SIZE_MAP = {
     "A4": A4,
@@ -40,7 +67,16 @@ def get_page_size(pdf_settings):
 
 
 def get_active_settings():
-    """Get the active PDF export settings or return default values"""
+    """Get the active PDF export settings, or ``None`` when no row is active.
+
+    The row is cached in process memory and reloaded when the active row changes (see
+    ``settings_cache``).
+    """
+    return get_cached_settings(load_active_settings)
+
+
+def load_active_settings():
+    """Query the active PDF export settings row."""
     try:
         return ExportPDFSettings.objects.get(active=True)
     except ExportPDFSettings.DoesNotExist:
@@ -58,31 +94,20 @@ def resolve_font_path(filename: str) -> Optional[str]:
     Order:
     1. ``<BASE_DIR>/static/assets/fonts/<filename>`` (common project layout)
     2. Django staticfiles finders: ``assets/fonts/``, ``django_pdf_actions/fonts/``, or bare name
+
+    Lookups are served from the font catalog (``django_pdf_actions.fonts``), which scans
+    these locations once and rescans when they change.
     """
     if not filename:
         return None
+    return font_catalog().path(filename)
 
-    project_path = os.path.join(
-        settings.BASE_DIR, "static", "assets", "fonts", filename
-    )
-    if os.path.isfile(project_path):
-        return project_path
-
-    try:
-        from django.contrib.staticfiles import finders
-
-        for rel in (
-            os.path.join("assets", "fonts", filename),
-            os.path.join("django_pdf_actions", "fonts", filename),
-            filename,
-        ):
-            found = finders.find(rel)
-            if found and os.path.isfile(found):
-                return found
-    except Exception as exc:
-        logger.debug("Staticfiles font lookup skipped: %s", exc)
 
-    return None
+@lru_cache(maxsize=64)
+def font_internal_name(font_path):
+    """Name a TTF is registered under: stable per absolute path."""
+    digest = hashlib.sha256(os.path.abspath(font_path).encode()).hexdigest()[:12]
+    return f"PdfAct_{digest}"
 
 
 def hex_to_rgb(hex_color):
@@ -105,8 +130,7 @@ def setup_font(pdf_settings):
         candidates.append(("DejaVuSans.ttf", default_path))
 
     for label, font_path in candidates:
-        digest = hashlib.sha256(os.path.abspath(font_path).encode()).hexdigest()[:12]
-        internal_name = f"PdfAct_{digest}"
+        internal_name = font_internal_name(font_path)
         if internal_name in pdfmetrics.getRegisteredFontNames():
             return internal_name
         try:
@@ -128,6 +152,8 @@ def get_logo_path(pdf_settings):
     """Resolve logo for ReportLab: local filesystem path, or ImageReader for remote storage.
 
     Returns ``None`` when the logo should not be drawn (disabled, missing file, or no settings).
+    Results are kept in a small LRU keyed by the logo name and the settings' ``modified``
+    time, so remote logos are downloaded and decoded once per process.
     """
     if not pdf_settings or not getattr(pdf_settings, "show_logo", True):
         return None
@@ -138,6 +164,21 @@ def get_logo_path(pdf_settings):
     if not name:
         return None
 
+    key = (name, getattr(pdf_settings, "modified", None))
+    with _logo_cache_lock:
+        if key in _logo_cache:
+            _logo_cache.move_to_end(key)
+            return _logo_cache[key]
+
+    source = _load_logo(logo, name)
+    with _logo_cache_lock:
+        _logo_cache[key] = source
+        while len(_logo_cache) > LOGO_CACHE_SIZE:
+            _logo_cache.popitem(last=False)
+    return source
+
+
+def _load_logo(logo, name):
     if hasattr(logo, "path"):
         try:
             path = logo.path
@@ -161,15 +202,15 @@ def get_logo_path(pdf_settings):
         return ImageReader(BytesIO(fh.read()))
 
 
-def create_table_style(pdf_settings, font_name, header_bg_color, grid_color):
-    """Create table style based on settings"""
-    # Get font sizes from settings
-    header_font_size = pdf_settings.header_font_size if pdf_settings else 12
-    body_font_size = pdf_settings.body_font_size if pdf_settings else 8
-    grid_line_width = pdf_settings.grid_line_width if pdf_settings else 0.25
-    table_spacing = pdf_settings.table_spacing if pdf_settings else 1.5
+def clear_logo_cache():
+    """Forget resolved logos (used by tests)."""
+    with _logo_cache_lock:
+        _logo_cache.clear()
 
-    # Cell / header alignment: explicit LEFT/RIGHT wins; CENTER + RTL uses RIGHT for body cells.
+
+def table_alignments(pdf_settings):
+    """Return the ``(cell, header)`` table alignments for *pdf_settings*."""
+    # Explicit LEFT/RIGHT wins; CENTER + RTL uses RIGHT for body cells.
     cell_alignment = "CENTER"
     header_alignment = "CENTER"
     if pdf_settings:
@@ -181,6 +222,17 @@ def create_table_style(pdf_settings, font_name, header_bg_color, grid_color):
         )
         if pdf_settings.rtl_support and cell_alignment == "CENTER":
             cell_alignment = "RIGHT"
+    return cell_alignment, header_alignment
+
+
+def create_table_style(pdf_settings, font_name, header_bg_color, grid_color):
+    """Create table style based on settings"""
+    # Get font sizes from settings
+    header_font_size = pdf_settings.header_font_size if pdf_settings else 12
+    body_font_size = pdf_settings.body_font_size if pdf_settings else 8
+    grid_line_width = pdf_settings.grid_line_width if pdf_settings else 0.25
+    table_spacing = pdf_settings.table_spacing if pdf_settings else 1.5
+    cell_alignment, header_alignment = table_alignments(pdf_settings)
 
     # Build table style
     style = [
@@ -204,9 +256,18 @@ def create_table_style(pdf_settings, font_name, header_bg_color, grid_color):
     return TableStyle(style)
 
 
+@lru_cache(maxsize=1)
+def sample_style_sheet():
+    """ReportLab's sample stylesheet, built once per process.
+
+    Only used as the read-only parent of the export styles.
+    """
+    return getSampleStyleSheet()
+
+
 def create_header_style(pdf_settings, font_name, is_header=False):
     """Create style for column headers and body text"""
-    styles = getSampleStyleSheet()
+    styles = sample_style_sheet()
 
     # Use proper font sizes from settings
     if pdf_settings:
@@ -254,11 +315,48 @@ def create_header_style(pdf_settings, font_name, is_header=False):
     )
 
     # ReportLab doesn't support direct CSS for RTL
-    # The text direction is handled by the arabic_reshaper and get_display functions
+    # The text direction is handled by shaping.shape_rtl
 
     return style
 
 
+def needs_paragraph(value, rtl_enabled=False):
+    """Whether a cell value needs a ``Paragraph`` (markup/entities or bidi text).
+
+    Everything else can be handed to ``Table`` as a plain string, which skips markup
+    parsing and paragraph layout.
+    """
+    if "<" in value or "&" in value:
+        return True
+    return bool(rtl_enabled and has_rtl(value))
+
+
+class ParagraphText(str):
+    """Body cell markup, turned into a ``Paragraph`` when its page is laid out.
+
+    Rows keep only the string until then (``paragraph_rows``), so a large export holds
+    its text rather than parsed paragraph fragments for every cell.
+    """
+
+    __slots__ = ()
+
+    @property
+    def text(self):
+        """The markup, as ``Paragraph.text``."""
+        return str(self)
+
+
+def paragraph_rows(rows, style):
+    """*rows* with their ``ParagraphText`` cells built into ``Paragraph`` objects."""
+    return [
+        [
+            Paragraph(cell, style) if isinstance(cell, ParagraphText) else cell
+            for cell in row
+        ]
+        for row in rows
+    ]
+
+
 def reshape_to_arabic(
     columns,
     font_name,
@@ -267,110 +365,160 @@ def reshape_to_arabic(
     max_chars_per_line,
     pdf_settings=None,
     modeladmin=None,
+    query_audit=None,
 ):
-    """Build ReportLab table rows from ``list_display`` columns (fields + admin methods)."""
+    """Build ReportLab table rows from ``list_display`` columns (fields + admin methods).
+
+    With ``plain_text_cells`` enabled (implied by the ``canvas`` renderer), body values
+    that need no markup or bidi handling are emitted as plain strings (wrapped with
+    ``\\n``); the others are ``ParagraphText`` markup, built into ``Paragraph`` objects a
+    page at a time when the table is laid out.
+
+    Each column is compiled once into an accessor (``columns.compile_columns``); columns
+    marked ``@pdf_io_bound`` are evaluated per chunk in a thread pool of
+    ``ModelAdmin.pdf_io_bound_workers`` threads (default ``IO_BOUND_WORKERS``).
+    Relations used by the columns are joined up front (``build_query_plan``), and rows
+    are fetched in chunks of ``query_chunk_size`` without filling the queryset's result
+    cache, so model instances do not outlive their chunk.
+
+    With a *query_audit* (``query_audit.QueryAudit``), the queries run by each column are
+    counted; I/O-bound columns are then evaluated in this thread.
+    """
     header_style = create_header_style(pdf_settings, font_name, is_header=True)
-    body_style = create_header_style(pdf_settings, font_name, is_header=False)
 
     rtl_enabled = pdf_settings and getattr(pdf_settings, "rtl_support", False)
 
     if rtl_enabled:
         columns = list(reversed(columns))
 
-    headers = []
-    for column in columns:
-        header = None
+    model = queryset.model
+    annotations = getattr(getattr(queryset, "query", None), "annotations", None) or {}
+    compiled = compile_columns(columns, model, modeladmin, annotations)
 
-        if hasattr(queryset.model, column):
-            try:
-                field = queryset.model._meta.get_field(column)
-                header = (
-                    capfirst(field.verbose_name)
-                    if hasattr(field, "verbose_name")
-                    else capfirst(column)
-                )
-            except FieldDoesNotExist:
-                header = capfirst(column.replace("_", " "))
-        elif modeladmin and hasattr(modeladmin, column):
-            method = getattr(modeladmin, column)
-            if hasattr(method, "short_description"):
-                header = str(method.short_description)
-            else:
-                header = capfirst(column.replace("_", " "))
-        else:
-            header = capfirst(column.replace("_", " "))
+    headers = []
+    for column in compiled:
+        header = column.header
 
         if rtl_enabled and isinstance(header, str):
-            header = arabic_reshaper.reshape(header)
-            header = get_display(header)
+            header = shape_rtl(header)
 
         headers.append(Paragraph(str(header), header_style))
 
     data = [headers]
 
-    for obj in queryset:
-        row = []
-        for column in columns:
-            value = None
-            if hasattr(obj, column):
-                value = getattr(obj, column)
-            elif modeladmin and hasattr(modeladmin, column):
-                try:
-                    method = getattr(modeladmin, column)
-                    if callable(method):
-                        value = method(obj)
-                    else:
-                        value = method
-                except Exception as exc:
-                    logger.debug(
-                        "Admin list_display value for %r failed: %s",
-                        column,
-                        exc,
-                        exc_info=True,
-                    )
-                    value = f"Error: {column}"
-            else:
-                value = f"Missing: {column}"
-
-            value = str(value) if value is not None else ""
-
-            if isinstance(value, str):
-                if rtl_enabled:
-                    value = arabic_reshaper.reshape(value)
-                    value = get_display(value)
-
-                if len(value) > max_chars_per_line:
-                    lines = [
-                        value[i : i + max_chars_per_line]
-                        for i in range(0, len(value), max_chars_per_line)
-                    ]
-                    if rtl_enabled:
-                        lines.reverse()
-                    value = "<br/>".join(lines)
-            row.append(Paragraph(str(value), body_style))
-        data.append(row)
+    queryset = apply_query_plan(queryset, build_query_plan(model, columns, modeladmin))
+    if query_audit is not None:
+        compiled = query_audit.wrap(compiled)
+    chunk_size = getattr(pdf_settings, "query_chunk_size", None) or DEFAULT_CHUNK_SIZE
+    plain_cells = (
+        getattr(pdf_settings, "plain_text_cells", False)
+        or getattr(pdf_settings, "renderer", None) == "canvas"
+    )
+    io_workers = getattr(modeladmin, "pdf_io_bound_workers", None) or IO_BOUND_WORKERS
+    tracking = query_audit.track(queryset) if query_audit is not None else nullcontext()
+    with tracking, io_executor(compiled, io_workers) as executor:
+        for chunk in iterate_chunks(queryset, chunk_size):
+            values = [
+                [_cell_string(value) for value in row]
+                for row in evaluate_chunk(compiled, chunk, executor)
+            ]
+            # Repeated values of a column (statuses, dates) are shaped once per chunk.
+            shaped = shape_columns(values) if rtl_enabled else values
+            for raw_row, shaped_row in zip(values, shaped):
+                row = []
+                for raw, value in zip(raw_row, shaped_row):
+                    plain = plain_cells and not needs_paragraph(raw, rtl_enabled)
+
+                    if len(value) > max_chars_per_line:
+                        lines = [
+                            value[i : i + max_chars_per_line]
+                            for i in range(0, len(value), max_chars_per_line)
+                        ]
+                        if rtl_enabled:
+                            lines.reverse()
+                        value = ("\n" if plain else "<br/>").join(lines)
+                    row.append(value if plain else ParagraphText(value))
+                data.append(row)
+    if query_audit is not None:
+        query_audit.rows = len(data) - 1
     return data
 
 
-def calculate_column_widths(data, table_width, font_name, font_size):
-    """Calculate optimal column widths based on content"""
+def _cell_string(value):
+    return str(value) if value is not None else ""
+
+
+@lru_cache(maxsize=32)
+def _glyph_widths(font_name):
+    """Advance width of each glyph of *font_name* at 1pt, filled lazily."""
+    return {}
+
+
+def text_width(text, font_name, font_size):
+    """Width of *text* in points, from the cached glyph widths of *font_name*."""
+    widths = _glyph_widths(font_name)
+    total = 0.0
+    for char in text:
+        width = widths.get(char)
+        if width is None:
+            try:
+                width = pdfmetrics.stringWidth(char, font_name, 1)
+            except KeyError:
+                # Font not registered: fall back to an average glyph width.
+                width = 0.6
+            widths[char] = width
+        total += width
+    return total * font_size
+
+
+def cell_text(cell):
+    """Raw text of a table cell: plain strings as-is, ``Paragraph`` markup stripped."""
+    if isinstance(cell, str) and not isinstance(cell, ParagraphText):
+        return cell
+    text = getattr(cell, "text", None)
+    if text is None:
+        return str(cell)
+    return html.unescape(MARKUP_TAG_RE.sub("", BREAK_TAG_RE.sub("\n", text)))
+
+
+def calculate_column_widths(
+    data,
+    table_width,
+    font_name,
+    font_size,
+    padding=0,
+    sample_size=COLUMN_WIDTH_SAMPLE_SIZE,
+):
+    """Calculate column widths from the measured width of each column's content.
+
+    Cells are measured with the font's glyph metrics; *padding* (horizontal cell
+    padding) is added to every column. Exports with more than *sample_size* body rows
+    are measured on a fixed-seed random sample of them.
+    """
     if not data:
         return []
     num_cols = len(data[0])
     max_widths = [0] * num_cols
 
-    # Find maximum content width for each column
-    for row in data:
-        for i, cell in enumerate(row):
-            content = str(cell)
-            # Headers get more weight in width calculation
-            multiplier = 1.2 if row == data[0] else 1.0
-            width = len(content) * font_size * 0.6 * multiplier
-            max_widths[i] = max(max_widths[i], width)
+    body_rows = len(data) - 1
+    if body_rows > sample_size:
+        indices = sorted(random.Random(0).sample(range(1, len(data)), sample_size))
+        body = [data[i] for i in indices]
+    else:
+        body = data[1:]
+
+    # Headers get more weight in width calculation
+    for multiplier, rows in ((1.2, data[:1]), (1.0, body)):
+        for row in rows:
+            for i, cell in enumerate(row):
+                for line in cell_text(cell).split("\n"):
+                    width = text_width(line, font_name, font_size) * multiplier
+                    if width > max_widths[i]:
+                        max_widths[i] = width
 
     # Ensure minimum width for each column
     min_width = table_width * 0.05  # 5% of table width
-    max_widths = [max(width, min_width) for width in max_widths]
+    max_widths = [max(width + padding, min_width) for width in max_widths]
 
     # Normalize widths to fit table_width
     total_width = sum(max_widths)
@@ -420,80 +568,51 @@ def draw_model_name(
     else:
         model_name = model.__name__
 
-    if pdf_settings is None:
-        pdf_settings = get_active_settings()
-
     # Apply Arabic reshaping and bidirectional algorithm if RTL support is enabled
-    if (
-        pdf_settings
-        and hasattr(pdf_settings, "rtl_support")
-        and pdf_settings.rtl_support
-    ):
-        model_name = arabic_reshaper.reshape(model_name)
-        model_name = get_display(model_name)
+    if getattr(pdf_settings, "rtl_support", False):
+        model_name = shape_rtl(model_name)
 
     p.setFont(font_name, font_size)
     model_name_string_width = p.stringWidth(model_name, font_name, font_size)
 
-    # Use title_alignment if available
-    if pdf_settings and hasattr(pdf_settings, "title_alignment"):
-        alignment = pdf_settings.title_alignment
-        if alignment == "LEFT":
-            x = page_margin + 10  # Left aligned with margin
-        elif alignment == "RIGHT":
-            x = (
-                canvas_width - model_name_string_width - page_margin - 10
-            )  # Right aligned with margin
-        else:  # CENTER is default
-            x = canvas_width / 2
-    else:
-        # Default center alignment
-        x = canvas_width / 2
-
-    if pdf_settings is None:
-        use_centred_string = True
-    elif getattr(pdf_settings, "title_alignment", "CENTER") == "CENTER":
-        use_centred_string = True
-    else:
-        use_centred_string = False
-
-    if use_centred_string:
-        p.drawCentredString(x, canvas_height - page_margin, model_name)
+    # Title alignment: LEFT/RIGHT sit inside the page margin, CENTER is the default.
+    alignment = getattr(pdf_settings, "title_alignment", "CENTER")
+    y = canvas_height - page_margin
+    if alignment == "LEFT":
+        p.drawString(page_margin + 10, y, model_name)
+    elif alignment == "RIGHT":
+        p.drawString(
+            canvas_width - model_name_string_width - page_margin - 10, y, model_name
+        )
     else:
-        p.drawString(x, canvas_height - page_margin, model_name)
+        p.drawCentredString(canvas_width / 2, y, model_name)
 
 
 def draw_exported_at(
-    p, font_name, font_size, canvas_width, footer_margin, pdf_settings=None
+    p,
+    font_name,
+    font_size,
+    canvas_width,
+    footer_margin,
+    pdf_settings=None,
+    exported_at=None,
 ):
-    """Draw export timestamp"""
+    """Draw export timestamp (*exported_at*, default now)"""
     from datetime import datetime
 
-    export_date_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    if pdf_settings is None:
-        pdf_settings = get_active_settings()
+    export_date_time = (exported_at or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
 
     exported_at_string = f"Exported at: {export_date_time}"
 
     # Apply Arabic reshaping and bidirectional algorithm if RTL support is enabled
-    if (
-        pdf_settings
-        and hasattr(pdf_settings, "rtl_support")
-        and pdf_settings.rtl_support
-    ):
-        exported_at_string = arabic_reshaper.reshape(exported_at_string)
-        exported_at_string = get_display(exported_at_string)
+    if getattr(pdf_settings, "rtl_support", False):
+        exported_at_string = shape_rtl(exported_at_string)
 
     p.setFont(font_name, font_size)
     exported_at_string_width = p.stringWidth(exported_at_string, font_name, font_size)
 
     # Position string appropriately based on RTL setting
-    if (
-        pdf_settings
-        and hasattr(pdf_settings, "rtl_support")
-        and pdf_settings.rtl_support
-    ):
+    if getattr(pdf_settings, "rtl_support", False):
         x = 100  # For RTL, align to the left side with margin
     else:
         x = (
@@ -514,19 +633,11 @@ def draw_page_number(
     pdf_settings=None,
 ):
     """Draw page numbers"""
-    if pdf_settings is None:
-        pdf_settings = get_active_settings()
-
     page_string = f"Page {page + 1} of {total_pages}"
 
     # Apply Arabic reshaping and bidirectional algorithm if RTL support is enabled
-    if (
-        pdf_settings
-        and hasattr(pdf_settings, "rtl_support")
-        and pdf_settings.rtl_support
-    ):
-        page_string = arabic_reshaper.reshape(page_string)
-        page_string = get_display(page_string)
+    if getattr(pdf_settings, "rtl_support", False):
+        page_string = shape_rtl(page_string)
 
     p.setFont(font_name, font_size)
     x = canvas_width / 2
@@ -534,17 +645,30 @@ def draw_page_number(
 
 
 def draw_logo(p, logo_source, canvas_width, canvas_height):
-    """Draw logo from a filesystem path or a ReportLab ``ImageReader`` (remote storage)."""
+    """Draw logo from a filesystem path or a ReportLab ``ImageReader`` (remote storage).
+
+    The image is embedded once per document in the ``LOGO_FORM_NAME`` form XObject; every
+    later page only references that form instead of re-encoding the image.
+    """
     if logo_source is None:
         return
     if isinstance(logo_source, str) and not os.path.isfile(logo_source):
         return
-    from reportlab.platypus import Image
-
-    logo_width = 100
-    logo_height = 50
-    logo_offset = 20
-    logo_x = canvas_width - logo_width - logo_offset
-    logo_y = canvas_height - logo_height - logo_offset
-    logo = Image(logo_source, width=logo_width, height=logo_height)
-    logo.drawOn(p, logo_x, logo_y)
+
+    if not p.hasForm(LOGO_FORM_NAME):
+        logo_width = 100
+        logo_height = 50
+        logo_offset = 20
+        logo_x = canvas_width - logo_width - logo_offset
+        logo_y = canvas_height - logo_height - logo_offset
+        p.beginForm(LOGO_FORM_NAME)
+        p.drawImage(
+            logo_source,
+            logo_x,
+            logo_y,
+            width=logo_width,
+            height=logo_height,
+            mask="auto",
+        )
+        p.endForm()
+    p.doForm(LOGO_FORM_NAME)
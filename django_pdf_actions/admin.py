@@ -1,6 +1,7 @@
 import os
 
 from django.contrib import admin
+from django.urls import NoReverseMatch, reverse
 from django.utils.html import format_html
 
 from . import models
@@ -114,6 +115,21 @@ class PdfAdmin(admin.ModelAdmin):
             {"fields": ("title_alignment", "header_alignment", "content_alignment")},
         ),
         ("Table Settings", {"fields": ("table_spacing", "max_chars_per_line")}),
+        (
+            "Performance Settings",
+            {
+                "fields": (
+                    "stream_response",
+                    "background_export",
+                    "query_chunk_size",
+                    "plain_text_cells",
+                    "renderer",
+                    "parallel_workers",
+                    "max_inline_cells",
+                    "oversized_export",
+                )
+            },
+        ),
         ("Metadata", {"fields": ("created", "modified"), "classes": ("collapse",)}),
     )
 
@@ -130,3 +146,37 @@ class PdfAdmin(admin.ModelAdmin):
 
 # Backward-compatible name for imports and tests
 ExportPDFSettingsAdmin = PdfAdmin
+
+
+@admin.register(models.ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "model_label",
+        "row_count",
+        "status",
+        "requested_by",
+        "created",
+        "finished_at",
+        "download_link",
+    )
+    list_filter = ("status", "model_label")
+    readonly_fields = [
+        f.name for f in models.ExportJob._meta.fields if f.name != "query"
+    ] + ["download_link"]
+
+    @admin.display(description="Download")
+    def download_link(self, obj):
+        if obj.status != models.ExportJob.STATUS_DONE or not obj.file:
+            return "-"
+        try:
+            url = reverse("django_pdf_actions:export_job_download", args=[obj.pk])
+        except NoReverseMatch:
+            url = obj.file.url
+        return format_html('<a href="{}">{}</a>', url, os.path.basename(obj.file.name))
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
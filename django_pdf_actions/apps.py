@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class ExportPDFConfig(AppConfig):
@@ -6,3 +7,11 @@ class ExportPDFConfig(AppConfig):
     name = "django_pdf_actions"
     label = "django_pdf_actions"
     verbose_name = "Django PDF Actions Export PDF"
+
+    def ready(self):
+        if getattr(settings, "PDF_ACTIONS_WARMUP", False):
+            from .warmup import warm_up
+
+            # No queries during app initialisation; the active font and logo are
+            # warmed by calling warm_up() once the app registry is ready.
+            warm_up(use_database=False)
@@ -0,0 +1,273 @@
+"""Font catalog: where the TTF/OTF files available to exports live.
+
+Resolving a font used to stat ``static/assets/fonts`` and walk every staticfiles finder on
+each export. ``FontCatalog`` scans those locations once, in the same order as before
+(project ``static/assets/fonts``, then the finders' ``assets/fonts/``,
+``django_pdf_actions/fonts/`` and root directories), and keeps ``filename -> path``
+in memory. The scan (paths, mtimes and TTF family names) is stored in a JSON index so
+new processes skip it, and is redone when a scanned directory or indexed file changes
+its mtime or when ``setup_fonts`` installs a font (``invalidate_font_catalog``).
+
+The index is kept in a per-user cache directory (``$XDG_CACHE_HOME`` or ``~/.cache``,
+created with mode 0700; the file itself is written 0600). An index with entries outside
+the scanned directories is ignored and rebuilt, so another local user cannot point font
+registration at arbitrary files.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from hashlib import sha256
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+FONT_EXTENSIONS = (".ttf", ".otf")
+
+# Subdirectories of the staticfiles locations searched for fonts, in lookup order.
+STATIC_FONT_DIRS = (
+    os.path.join("assets", "fonts"),
+    os.path.join("django_pdf_actions", "fonts"),
+    "",
+)
+
+# Seconds between checks of directory and file mtimes in a running process.
+CHECK_INTERVAL = 60
+
+INDEX_VERSION = 1
+
+
+def project_fonts_dir():
+    """``<BASE_DIR>/static/assets/fonts``, where ``setup_fonts`` installs fonts."""
+    return os.path.join(settings.BASE_DIR, "static", "assets", "fonts")
+
+
+def font_directories():
+    """Directories that may contain fonts, in lookup order."""
+    directories = [project_fonts_dir()]
+    try:
+        from django.contrib.staticfiles import finders
+
+        for rel in STATIC_FONT_DIRS:
+            # Second positional argument: ``all`` / ``find_all`` depending on Django.
+            for found in finders.find(rel, True) or ():
+                if os.path.isdir(found):
+                    directories.append(found)
+    except Exception as exc:
+        logger.debug("Staticfiles font lookup skipped: %s", exc)
+
+    unique = []
+    for directory in directories:
+        directory = os.path.abspath(directory)
+        if directory not in unique:
+            unique.append(directory)
+    return unique
+
+
+def cache_directory():
+    """Per-user cache directory of this app (``$XDG_CACHE_HOME`` or ``~/.cache``)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "django_pdf_actions")
+
+
+def default_index_path():
+    """Per-project index file in the user's cache directory.
+
+    ``PDF_ACTIONS_FONT_INDEX`` overrides the location.
+    """
+    configured = getattr(settings, "PDF_ACTIONS_FONT_INDEX", None)
+    if configured:
+        return str(configured)
+    digest = sha256(str(settings.BASE_DIR).encode()).hexdigest()[:12]
+    return os.path.join(cache_directory(), f"fonts-{digest}.json")
+
+
+def _within(path, directories):
+    """Whether *path* names a file directly inside one of *directories*."""
+    parent = os.path.dirname(os.path.realpath(path))
+    return any(parent == os.path.realpath(directory) for directory in directories)
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def font_family(path):
+    """Family name stored in a TrueType font, or ``""`` when it cannot be read."""
+    try:
+        from reportlab.pdfbase.ttfonts import TTFontFile
+
+        family = TTFontFile(path, validate=0).familyName
+    except Exception as exc:
+        logger.debug("Could not read font family of %s: %s", path, exc)
+        return ""
+    if isinstance(family, bytes):
+        family = family.decode("latin-1")
+    return family or ""
+
+
+class FontCatalog:
+    """In-memory ``filename -> font entry`` map backed by an on-disk JSON index."""
+
+    def __init__(self, index_path=None):
+        self.index_path = index_path or default_index_path()
+        self.directories = {}
+        self.fonts = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def path(self, filename):
+        """Absolute path of *filename*, or ``None`` if no scanned directory has it."""
+        entry = self.get(filename)
+        return entry["path"] if entry else None
+
+    def get(self, filename):
+        """Index entry (``path``, ``mtime``, ``family``) for *filename*."""
+        self._ensure_fresh()
+        return self.fonts.get(filename)
+
+    def families(self):
+        """``{filename: family name}`` for every indexed font."""
+        self._ensure_fresh()
+        return {name: entry["family"] for name, entry in self.fonts.items()}
+
+    def invalidate(self):
+        """Drop the in-memory map and the on-disk index; the next lookup rescans."""
+        with self._lock:
+            self.directories = {}
+            self.fonts = {}
+            self._loaded = False
+            try:
+                os.remove(self.index_path)
+            except OSError:
+                pass
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._loaded and now - self._checked_at < CHECK_INTERVAL:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            elif now - self._checked_at >= CHECK_INTERVAL and self._is_stale():
+                self._scan(previous=self.fonts)
+            self._checked_at = time.monotonic()
+
+    def _load(self):
+        index = self._read_index()
+        if index is not None:
+            self.directories = index["directories"]
+            self.fonts = index["fonts"]
+            directories = font_directories()
+            if not self._entries_within(directories):
+                self.fonts = {}
+            elif list(self.directories) == directories and not self._is_stale():
+                self._loaded = True
+                return
+        self._scan(previous=self.fonts)
+
+    def _entries_within(self, directories):
+        """Whether every indexed font is a file of that name in a scanned directory."""
+        for name, entry in self.fonts.items():
+            path = entry.get("path") if isinstance(entry, dict) else None
+            if (
+                not isinstance(path, str)
+                or os.path.basename(path) != name
+                or not _within(path, directories)
+            ):
+                logger.warning(
+                    "Ignoring font index %s: %r is outside the font directories",
+                    self.index_path,
+                    name,
+                )
+                return False
+        return True
+
+    def _is_stale(self):
+        for directory, mtime in self.directories.items():
+            if _mtime(directory) != mtime:
+                return True
+        return any(
+            _mtime(entry["path"]) != entry.get("mtime") for entry in self.fonts.values()
+        )
+
+    def _scan(self, previous=None):
+        previous_by_path = {entry["path"]: entry for entry in (previous or {}).values()}
+        directories = {}
+        fonts = {}
+        for directory in font_directories():
+            directories[directory] = _mtime(directory)
+            try:
+                names = sorted(os.listdir(directory))
+            except OSError:
+                continue
+            for name in names:
+                path = os.path.join(directory, name)
+                if name in fonts or not name.lower().endswith(FONT_EXTENSIONS):
+                    continue
+                if not os.path.isfile(path):
+                    continue
+                mtime = _mtime(path)
+                known = previous_by_path.get(path)
+                if known and known["mtime"] == mtime:
+                    family = known["family"]
+                else:
+                    family = font_family(path)
+                fonts[name] = {"path": path, "mtime": mtime, "family": family}
+        self.directories = directories
+        self.fonts = fonts
+        self._loaded = True
+        self._write_index()
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as fh:
+                index = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            return None
+        return index
+
+    def _write_index(self):
+        index = {
+            "version": INDEX_VERSION,
+            "directories": self.directories,
+            "fonts": self.fonts,
+        }
+        try:
+            directory = os.path.dirname(self.index_path) or "."
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            # mkstemp creates the file readable and writable by this user only.
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(index, fh)
+            os.replace(tmp_path, self.index_path)
+        except OSError as exc:
+            logger.debug("Could not write font index %s: %s", self.index_path, exc)
+
+
+_catalog = None
+
+
+def font_catalog():
+    """The process-wide ``FontCatalog``."""
+    global _catalog
+    if _catalog is None:
+        _catalog = FontCatalog()
+    return _catalog
+
+
+def invalidate_font_catalog():
+    """Forget scanned fonts in this process and on disk (after installing fonts)."""
+    font_catalog().invalidate()
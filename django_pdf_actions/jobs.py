@@ -0,0 +1,118 @@
+"""Background export jobs.
+
+The admin actions queue an ``ExportJob`` (``enqueue_export``) when ``background_export`` is
+enabled; the ``run_pdf_export_worker`` management command claims pending jobs with
+``claim_next_job`` and renders them with ``run_export_job`` into ``ExportJob.file``.
+"""
+
+import logging
+import pickle
+import tempfile
+from typing import Optional
+
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.admin.sites import all_sites
+from django.contrib.auth.models import AnonymousUser
+from django.core.files import File
+from django.http import HttpRequest
+from django.utils import timezone
+
+from .models import ExportJob
+from .telemetry import ExportTelemetry
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_export(modeladmin, queryset, *, landscape: bool, user=None) -> ExportJob:
+    """Record *queryset* as a pending export job.
+
+    The job stores the pickled ``queryset.query`` (the changelist's filters, ordering and
+    annotations) instead of the selected primary keys, so a large selection costs one small
+    row; the worker rebuilds it with ``job_queryset`` and iterates it in chunks like an
+    inline export.
+    """
+    if user is not None and not user.is_authenticated:
+        user = None
+    return ExportJob.objects.create(
+        model_label=modeladmin.model._meta.label,
+        query=pickle.dumps(queryset.query),
+        row_count=queryset.count(),
+        landscape=landscape,
+        requested_by=user,
+    )
+
+
+def job_queryset(job: ExportJob, modeladmin):
+    """Rebuild the queryset of *job* through ``modeladmin.get_queryset``.
+
+    ``get_queryset`` receives a bare request carrying the requesting user, so relations it
+    prefetches are kept; the stored query then replaces its query.
+    """
+    request = HttpRequest()
+    request.user = job.requested_by or AnonymousUser()
+    queryset = modeladmin.get_queryset(request)
+    queryset.query = pickle.loads(bytes(job.query))
+    return queryset
+
+
+def claim_next_job() -> Optional[ExportJob]:
+    """Atomically move the oldest pending job to *running* and return it.
+
+    The claim is a conditional ``UPDATE`` on ``status``, so concurrent workers on any
+    database backend never pick up the same job twice.
+    """
+    pending = ExportJob.objects.filter(status=ExportJob.STATUS_PENDING)
+    for pk in pending.order_by("created", "pk").values_list("pk", flat=True)[:10]:
+        now = timezone.now()
+        claimed = ExportJob.objects.filter(
+            pk=pk, status=ExportJob.STATUS_PENDING
+        ).update(status=ExportJob.STATUS_RUNNING, started_at=now, modified=now)
+        if claimed:
+            return ExportJob.objects.get(pk=pk)
+    return None
+
+
+def get_model_admin(model):
+    """Return the registered ``ModelAdmin`` for *model*, or a default one."""
+    for site in all_sites:
+        if model in site._registry:
+            return site._registry[model]
+    return admin.ModelAdmin(model, admin.site)
+
+
+def run_export_job(job: ExportJob) -> ExportJob:
+    """Render *job* into ``job.file`` and mark it done, or failed with the error."""
+    from .actions.pdf_response import SPOOL_MAX_SIZE, export_filename, write_pdf_export
+    from .actions.utils import get_active_settings
+
+    try:
+        model = apps.get_model(job.model_label)
+        modeladmin = get_model_admin(model)
+        queryset = job_queryset(job, modeladmin)
+
+        telemetry = ExportTelemetry.start()
+        telemetry.export_started(modeladmin, landscape=job.landscape)
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as output:
+            write_pdf_export(
+                modeladmin,
+                queryset,
+                output,
+                landscape=job.landscape,
+                pdf_settings=get_active_settings(),
+                telemetry=telemetry,
+            )
+            telemetry.count(bytes=output.tell())
+            output.seek(0)
+            job.file.save(export_filename(modeladmin), File(output), save=False)
+        telemetry.report(modeladmin, landscape=job.landscape)
+        job.status = ExportJob.STATUS_DONE
+        job.error = ""
+    except Exception as exc:
+        logger.exception("PDF export job %s failed", job.pk)
+        job.status = ExportJob.STATUS_FAILED
+        job.error = str(exc) or exc.__class__.__name__
+
+    job.finished_at = timezone.now()
+    job.save()
+    return job
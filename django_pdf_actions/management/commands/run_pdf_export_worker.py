@@ -0,0 +1,60 @@
+"""Management command that renders queued background PDF exports"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from django_pdf_actions.jobs import claim_next_job, run_export_job
+from django_pdf_actions.models import ExportJob
+
+
+class Command(BaseCommand):
+    help = "Claims pending PDF export jobs from the database and renders them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no pending jobs are left instead of polling",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls when the queue is empty",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=0,
+            help="Exit after processing this many jobs (0 = no limit)",
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        while True:
+            close_old_connections()
+            job = claim_next_job()
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+                continue
+
+            self.stdout.write(f"Rendering export job {job.pk} ({job.model_label})...")
+            job = run_export_job(job)
+            if job.status == ExportJob.STATUS_DONE:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Export job {job.pk} done: {job.file.name}")
+                )
+            else:
+                self.stdout.write(
+                    self.style.ERROR(f"Export job {job.pk} failed: {job.error}")
+                )
+
+            processed += 1
+            if options["max_jobs"] and processed >= options["max_jobs"]:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} export job(s)"))
@@ -9,6 +9,8 @@ import requests  # type: ignore[import-untyped]
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from django_pdf_actions.fonts import invalidate_font_catalog
+
 
 class Command(BaseCommand):
     help = "Downloads and sets up default fonts for PDF export"
@@ -161,6 +163,9 @@ class Command(BaseCommand):
                     )
                 )
 
+        # Pick up newly installed fonts on the next export.
+        invalidate_font_catalog()
+
         self.stdout.write(
             self.style.SUCCESS(f"Font setup complete. Fonts directory: {fonts_dir}")
         )
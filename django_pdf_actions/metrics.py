@@ -0,0 +1,243 @@
+"""Export throughput and latency metrics in the Prometheus text format.
+
+Off by default; with ``PDF_ACTIONS_METRICS = True`` every export rendered by
+``build_pdf_export_response``, its async variant or a background job (``run_export_job``)
+updates, per model and orientation:
+
+* ``pdf_export_started_total`` / ``pdf_export_finished_total`` (the difference is exports
+  in flight or failed);
+* ``pdf_export_rows_total``, ``pdf_export_pages_total`` and ``pdf_export_bytes_total``;
+* the ``pdf_export_duration_seconds`` histogram.
+
+The values live in a per-process ``MetricsStore``. Under a pre-forking server (gunicorn)
+each worker only sees its own exports, so set ``PDF_ACTIONS_METRICS_DIR`` to a directory
+shared by the workers: every process then writes its values to
+``pdf-metrics-<pid>.json`` there after each export, and ``export_metrics`` (the view to
+wire into ``urls.py``) sums all files. Clear the directory when the server starts, as
+with ``prometheus_client``'s multiprocess mode.
+"""
+
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the export duration histogram buckets.
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+COUNTERS = {
+    "pdf_export_started_total": "PDF exports started.",
+    "pdf_export_finished_total": "PDF exports rendered.",
+    "pdf_export_rows_total": "Table rows written to PDF exports.",
+    "pdf_export_pages_total": "Pages written to PDF exports.",
+    "pdf_export_bytes_total": "Bytes of rendered PDF exports.",
+}
+HISTOGRAMS = {
+    "pdf_export_duration_seconds": "Time to render a PDF export.",
+}
+
+FILE_PREFIX = "pdf-metrics-"
+
+
+def metrics_enabled():
+    """Whether exports record metrics (``PDF_ACTIONS_METRICS``)."""
+    return bool(getattr(settings, "PDF_ACTIONS_METRICS", False))
+
+
+def metrics_dir():
+    """Directory shared by worker processes (``PDF_ACTIONS_METRICS_DIR``), or ``None``."""
+    directory = getattr(settings, "PDF_ACTIONS_METRICS_DIR", None)
+    return str(directory) if directory else None
+
+
+class MetricsStore:
+    """Counters and histograms keyed by metric name and label values."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.counters = {}
+        self.histograms = {}
+
+    def inc(self, name, labels, amount=1):
+        """Add *amount* to counter *name* for the *labels* dict."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_fork()
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        """Record *value* in histogram *name* for the *labels* dict."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_fork()
+            buckets, total, count = self.histograms.get(
+                key, ([0] * (len(DURATION_BUCKETS) + 1), 0.0, 0)
+            )
+            buckets = list(buckets)
+            buckets[bisect_left(DURATION_BUCKETS, value)] += 1
+            self.histograms[key] = (buckets, total + value, count + 1)
+
+    def snapshot(self):
+        """The values as a JSON-serialisable dict (see ``merge``)."""
+        with self._lock:
+            return {
+                "counters": [
+                    [name, dict(labels), value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                "histograms": [
+                    [name, dict(labels), *histogram]
+                    for (name, labels), histogram in self.histograms.items()
+                ],
+            }
+
+    def merge(self, snapshot):
+        """Add the values of another store's *snapshot*."""
+        for name, labels, value in snapshot.get("counters", ()):
+            self.inc(name, labels, value)
+        with self._lock:
+            for name, labels, buckets, total, count in snapshot.get("histograms", ()):
+                key = (name, _label_key(labels))
+                previous, previous_total, previous_count = self.histograms.get(
+                    key, ([0] * len(buckets), 0.0, 0)
+                )
+                self.histograms[key] = (
+                    [a + b for a, b in zip(previous, buckets)],
+                    previous_total + total,
+                    previous_count + count,
+                )
+
+    def clear(self):
+        """Forget every value (used by tests)."""
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+
+    def write(self, directory):
+        """Write this process's values to ``<directory>/pdf-metrics-<pid>.json``."""
+        path = os.path.join(directory, f"{FILE_PREFIX}{os.getpid()}.json")
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(self.snapshot(), fh)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning("Could not write export metrics to %s: %s", path, exc)
+
+    def _check_fork(self):
+        # A forked worker starts from the parent's values; count its own exports only.
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self.counters = {}
+            self.histograms = {}
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+_store = MetricsStore()
+
+
+def metrics_store():
+    """The process-wide ``MetricsStore``."""
+    return _store
+
+
+def export_labels(modeladmin, landscape):
+    """Labels of an export: ``model`` (``app_label.modelname``) and ``orientation``."""
+    return {
+        "model": modeladmin.model._meta.label_lower,
+        "orientation": "landscape" if landscape else "portrait",
+    }
+
+
+def record_export_started(modeladmin, *, landscape):
+    """Count an export that starts rendering."""
+    _store.inc("pdf_export_started_total", export_labels(modeladmin, landscape))
+
+
+def record_export_finished(modeladmin, *, landscape, seconds, rows, pages, size):
+    """Count a rendered export: its rows, pages, PDF bytes and duration."""
+    labels = export_labels(modeladmin, landscape)
+    _store.inc("pdf_export_finished_total", labels)
+    _store.inc("pdf_export_rows_total", labels, rows or 0)
+    _store.inc("pdf_export_pages_total", labels, pages or 0)
+    _store.inc("pdf_export_bytes_total", labels, size or 0)
+    _store.observe("pdf_export_duration_seconds", labels, seconds)
+
+
+def persist():
+    """Write this process's values to ``PDF_ACTIONS_METRICS_DIR``, when set.
+
+    Called once per export, when its telemetry is reported.
+    """
+    directory = metrics_dir()
+    if directory:
+        _store.write(directory)
+
+
+def collect():
+    """Values of every process: the files in ``PDF_ACTIONS_METRICS_DIR``, or this one."""
+    directory = metrics_dir()
+    if not directory:
+        return _store
+    combined = MetricsStore()
+    for path in sorted(glob.glob(os.path.join(directory, f"{FILE_PREFIX}*.json"))):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                combined.merge(json.load(fh))
+        except (OSError, ValueError) as exc:
+            logger.warning("Skipping unreadable metrics file %s: %s", path, exc)
+    return combined
+
+
+def render_text(store):
+    """*store* in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for name, help_text in COUNTERS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for (metric, labels), value in sorted(store.counters.items()):
+            if metric == name:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    for name, help_text in HISTOGRAMS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (metric, labels), (buckets, total, count) in sorted(
+            store.histograms.items()
+        ):
+            if metric != name:
+                continue
+            cumulative = 0
+            bounds = [_format_value(bound) for bound in DURATION_BUCKETS] + ["+Inf"]
+            for bound, bucket in zip(bounds, buckets):
+                cumulative += bucket
+                bucket_labels = _format_labels(labels + (("le", bound),))
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
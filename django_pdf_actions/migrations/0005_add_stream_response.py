@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_pdf_actions", "0004_add_alignment_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportpdfsettings",
+            name="stream_response",
+            field=models.BooleanField(
+                default=False,
+                help_text=(
+                    "Spool the generated PDF to a temporary file and stream it to "
+                    "the browser instead of buffering the whole document in memory"
+                ),
+            ),
+        ),
+    ]
@@ -0,0 +1,118 @@
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_pdf_actions", "0005_add_stream_response"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportpdfsettings",
+            name="background_export",
+            field=models.BooleanField(
+                default=False,
+                help_text=(
+                    "Queue exports as background jobs processed by the "
+                    "run_pdf_export_worker command instead of rendering them in "
+                    "the request"
+                ),
+            ),
+        ),
+        migrations.CreateModel(
+            name="ExportJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                (
+                    "model_label",
+                    models.CharField(
+                        help_text="Exported model as app_label.ModelName",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "object_ids",
+                    models.JSONField(
+                        default=list, help_text="Primary keys of the selected rows"
+                    ),
+                ),
+                (
+                    "ordering",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="Ordering of the admin changelist",
+                    ),
+                ),
+                ("row_count", models.PositiveIntegerField(default=0)),
+                ("landscape", models.BooleanField(default=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        blank=True, null=True, upload_to="export_pdf/exports/"
+                    ),
+                ),
+                ("error", models.TextField(blank=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "requested_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Export Job",
+                "verbose_name_plural": "Export Jobs",
+                "ordering": ["-created"],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_pdf_actions", "0006_add_export_jobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportpdfsettings",
+            name="query_chunk_size",
+            field=models.PositiveIntegerField(
+                default=2000,
+                help_text="Number of rows fetched from the database at a time while exporting",
+                validators=[
+                    django.core.validators.MinValueValidator(100),
+                    django.core.validators.MaxValueValidator(50000),
+                ],
+            ),
+        ),
+    ]
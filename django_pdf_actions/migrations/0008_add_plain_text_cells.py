@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_pdf_actions", "0007_add_query_chunk_size"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportpdfsettings",
+            name="plain_text_cells",
+            field=models.BooleanField(
+                default=False,
+                help_text=(
+                    "Render cells without markup or right-to-left text as plain "
+                    "strings instead of paragraphs (faster; long values only wrap "
+                    "at max_chars_per_line)"
+                ),
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_pdf_actions", "0008_add_plain_text_cells"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportpdfsettings",
+            name="renderer",
+            field=models.CharField(
+                choices=[
+                    ("platypus", "Platypus table"),
+                    ("canvas", "Direct canvas (fastest, plain text)"),
+                ],
+                default="platypus",
+                help_text=(
+                    "Table engine: platypus lays out a Table per page; canvas draws "
+                    "rows directly on the page and always uses plain text cells"
+                ),
+                max_length=10,
+            ),
+        ),
+    ]
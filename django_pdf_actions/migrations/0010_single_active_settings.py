@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+def deactivate_duplicate_active_settings(apps, schema_editor):
+    """Keep the active row ``get_active_settings`` already used (lowest pk)."""
+    ExportPDFSettings = apps.get_model("django_pdf_actions", "ExportPDFSettings")
+    active = ExportPDFSettings.objects.filter(active=True).order_by("pk")
+    first = active.values_list("pk", flat=True).first()
+    if first is not None:
+        active.exclude(pk=first).update(active=False)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_pdf_actions", "0009_add_renderer"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            deactivate_duplicate_active_settings, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="exportpdfsettings",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("active", True)),
+                fields=("active",),
+                name="django_pdf_actions_single_active_settings",
+            ),
+        ),
+    ]
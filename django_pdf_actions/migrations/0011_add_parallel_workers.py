@@ -0,0 +1,23 @@
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_pdf_actions", "0010_single_active_settings"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportpdfsettings",
+            name="parallel_workers",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                help_text=(
+                    "Processes that render page ranges of very large exports in "
+                    "parallel (0 or 1 renders in the current process; requires pypdf)"
+                ),
+                validators=[django.core.validators.MaxValueValidator(64)],
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_pdf_actions", "0011_add_parallel_workers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportpdfsettings",
+            name="max_inline_cells",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text=(
+                    "Largest export (estimated rows x columns) rendered in the "
+                    "request; 0 renders every export inline"
+                ),
+            ),
+        ),
+        migrations.AddField(
+            model_name="exportpdfsettings",
+            name="oversized_export",
+            field=models.CharField(
+                choices=[
+                    ("queue", "Queue as a background export"),
+                    ("reject", "Reject with a message"),
+                ],
+                default="queue",
+                help_text="What happens to exports above max_inline_cells",
+                max_length=10,
+            ),
+        ),
+    ]
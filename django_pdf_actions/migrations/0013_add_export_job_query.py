@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_pdf_actions", "0012_add_export_size_routing"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="exportjob",
+            name="object_ids",
+        ),
+        migrations.RemoveField(
+            model_name="exportjob",
+            name="ordering",
+        ),
+        migrations.AddField(
+            model_name="exportjob",
+            name="query",
+            field=models.BinaryField(
+                default=b"",
+                help_text=(
+                    "Pickled query of the exported rows (filters, ordering, annotations)"
+                ),
+            ),
+        ),
+    ]
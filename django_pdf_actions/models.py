@@ -5,11 +5,13 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 from model_utils.models import TimeStampedModel
 
+from .settings_cache import invalidate_settings
+
 # Page size choices with dimensions in points (1 point = 1/72 inch)
 PAGE_SIZES = [
     ("A4", "A4 (210mm × 297mm)"),
@@ -25,6 +27,17 @@ ALIGNMENT_CHOICES = [
     ("RIGHT", "Right"),
 ]
 
+# Table rendering engines
+RENDERER_CHOICES = [
+    ("platypus", "Platypus table"),
+    ("canvas", "Direct canvas (fastest, plain text)"),
+]
+
+OVERSIZED_EXPORT_CHOICES = [
+    ("queue", "Queue as a background export"),
+    ("reject", "Reject with a message"),
+]
+
 
 def validate_hex_color(value):
     """Validate hex color format"""
@@ -179,6 +192,67 @@ class ExportPDFSettings(TimeStampedModel):
         help_text=_("Maximum characters per line before wrapping"),
     )
 
+    # Performance Settings
+    stream_response = models.BooleanField(
+        default=False,
+        help_text=_(
+            "Spool the generated PDF to a temporary file and stream it to the "
+            "browser instead of buffering the whole document in memory"
+        ),
+    )
+    background_export = models.BooleanField(
+        default=False,
+        help_text=_(
+            "Queue exports as background jobs processed by the "
+            "run_pdf_export_worker command instead of rendering them in the request"
+        ),
+    )
+    query_chunk_size = models.PositiveIntegerField(
+        default=2000,
+        validators=[MinValueValidator(100), MaxValueValidator(50000)],
+        help_text=_(
+            "Number of rows fetched from the database at a time while exporting"
+        ),
+    )
+    plain_text_cells = models.BooleanField(
+        default=False,
+        help_text=_(
+            "Render cells without markup or right-to-left text as plain strings "
+            "instead of paragraphs (faster; long values only wrap at "
+            "max_chars_per_line)"
+        ),
+    )
+    renderer = models.CharField(
+        max_length=10,
+        choices=RENDERER_CHOICES,
+        default="platypus",
+        help_text=_(
+            "Table engine: platypus lays out a Table per page; canvas draws rows "
+            "directly on the page and always uses plain text cells"
+        ),
+    )
+    parallel_workers = models.PositiveSmallIntegerField(
+        default=0,
+        validators=[MaxValueValidator(64)],
+        help_text=_(
+            "Processes that render page ranges of very large exports in parallel "
+            "(0 or 1 renders in the current process; requires pypdf)"
+        ),
+    )
+    max_inline_cells = models.PositiveIntegerField(
+        default=0,
+        help_text=_(
+            "Largest export (estimated rows x columns) rendered in the request; "
+            "0 renders every export inline"
+        ),
+    )
+    oversized_export = models.CharField(
+        max_length=10,
+        choices=OVERSIZED_EXPORT_CHOICES,
+        default="queue",
+        help_text=_("What happens to exports above max_inline_cells"),
+    )
+
     def __str__(self):
         return f"{self.title} ({'Active' if self.active else 'Inactive'})"
 
@@ -200,6 +274,14 @@ class ExportPDFSettings(TimeStampedModel):
         verbose_name = _("Export PDF Settings")
         verbose_name_plural = _("Export PDF Settings")
         ordering = ["-active", "-modified"]
+        constraints = [
+            # Partial unique index: at most one active row, and an indexed lookup for it.
+            models.UniqueConstraint(
+                fields=["active"],
+                condition=models.Q(active=True),
+                name="django_pdf_actions_single_active_settings",
+            ),
+        ]
 
 
 @receiver(pre_save, sender=ExportPDFSettings)
@@ -207,3 +289,63 @@ def deactivate_other_settings(sender, instance, **kwargs):
     if instance.active:
         # Deactivate all other configurations
         ExportPDFSettings.objects.exclude(pk=instance.pk).update(active=False)
+
+
+@receiver(post_save, sender=ExportPDFSettings)
+@receiver(post_delete, sender=ExportPDFSettings)
+def invalidate_settings_cache(sender, **kwargs):
+    invalidate_settings()
+
+
+class ExportJob(TimeStampedModel):
+    """A queued admin export, rendered by the ``run_pdf_export_worker`` command."""
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _("Pending")),
+        (STATUS_RUNNING, _("Running")),
+        (STATUS_DONE, _("Done")),
+        (STATUS_FAILED, _("Failed")),
+    ]
+
+    model_label = models.CharField(
+        max_length=255, help_text=_("Exported model as app_label.ModelName")
+    )
+    query = models.BinaryField(
+        default=b"",
+        editable=False,
+        help_text=_(
+            "Pickled query of the exported rows (filters, ordering, annotations)"
+        ),
+    )
+    row_count = models.PositiveIntegerField(default=0)
+    landscape = models.BooleanField(default=True)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    file = models.FileField(upload_to="export_pdf/exports/", null=True, blank=True)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.model_label} export #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+
+    class Meta:
+        verbose_name = _("Export Job")
+        verbose_name_plural = _("Export Jobs")
+        ordering = ["-created"]
@@ -0,0 +1,93 @@
+"""Process-local cache of the active ``ExportPDFSettings`` row.
+
+``get_active_settings`` keeps the active row in process memory and serves it without a
+database query until it is invalidated:
+
+* The ``post_save``/``post_delete`` receivers of ``ExportPDFSettings`` drop the snapshot
+  of the process that made the change at once.
+* With a shared cache backend (Redis, Memcached, database), those receivers also replace
+  a version token in Django's cache. The hot path costs one cache read, and every process
+  picks up an edit on its next export.
+* With a process-local backend (the default ``LocMemCache``, or ``DummyCache``) other
+  processes cannot see that token, so their snapshots are trusted for ``SNAPSHOT_TTL``
+  seconds and reloaded after that: edits made in another process take up to that long.
+
+``QuerySet.update()`` sends no signals, so snapshots expire after ``SNAPSHOT_TTL``
+seconds with a shared cache as well.
+"""
+
+import time
+import uuid
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+VERSION_CACHE_KEY = "django_pdf_actions:settings_version"
+
+# Seconds a snapshot is trusted without a version change: how long edits from other
+# processes take to show with a process-local cache, and ``QuerySet.update()`` with any.
+SNAPSHOT_TTL = 60
+
+# Version of snapshots taken without a shared cache.
+LOCAL_VERSION = "local"
+
+# (version, value, loaded_at) of the last load in this process.
+_snapshot = (None, None, 0.0)
+
+
+def shared_cache():
+    """Whether Django's default cache is shared between processes."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def settings_version():
+    """Current settings token, created on first use; ``None`` without a working cache."""
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(VERSION_CACHE_KEY)
+    return version
+
+
+def get_cached_settings(loader):
+    """Return the cached settings row, calling *loader* when it was invalidated."""
+    global _snapshot
+    cached_version, value, loaded_at = _snapshot
+    fresh = time.monotonic() - loaded_at < SNAPSHOT_TTL
+    if shared_cache():
+        version = settings_version()
+        if fresh and version is not None and cached_version == version:
+            return value
+    else:
+        version = LOCAL_VERSION
+        if fresh and cached_version == version:
+            return value
+    value = loader()
+    _snapshot = (version, value, time.monotonic())
+    return value
+
+
+def bump_settings_version():
+    """Invalidate cached settings in this process and every process sharing the cache."""
+    global _snapshot
+    _snapshot = (None, None, 0.0)
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_settings():
+    """Invalidate now and again once the surrounding transaction commits.
+
+    The second bump stops threads and processes from caching a row they read before the
+    change became visible to them.
+    """
+    bump_settings_version()
+    transaction.on_commit(bump_settings_version)
+
+
+def clear_settings_cache():
+    """Forget the local snapshot and the shared version (used by tests)."""
+    global _snapshot
+    _snapshot = (None, None, 0.0)
+    cache.delete(VERSION_CACHE_KEY)
@@ -0,0 +1,10 @@
+"""Signals sent by PDF exports."""
+
+from django.dispatch import Signal
+
+# Sent once an export has been rendered while telemetry is enabled
+# (``PDF_ACTIONS_TELEMETRY``). The sender is the exported model; the arguments are
+# ``modeladmin``, ``landscape`` and ``telemetry``, the dict built by
+# ``ExportTelemetry.as_dict()`` (stage timings in milliseconds plus row, page and byte
+# counts).
+export_finished = Signal()
@@ -0,0 +1,280 @@
+"""Per-export telemetry: how long each stage of an export took.
+
+Off by default; with ``PDF_ACTIONS_TELEMETRY = True`` every export rendered by
+``build_pdf_export_response``, its async variant or a background job (``run_export_job``)
+times its stages (``settings``, ``font``, ``rows``, ``widths``, ``layout``, ``save``) and
+reports them three ways:
+
+* a ``Server-Timing`` response header, shown in the browser's network panel (not for
+  background jobs);
+* an ``INFO`` record on the ``django_pdf_actions.telemetry`` logger whose ``pdf_export``
+  attribute holds the full payload, for structured log formatters;
+* the ``signals.export_finished`` signal.
+
+With ``PDF_ACTIONS_TELEMETRY_MEMORY = True`` as well, ``tracemalloc`` runs from
+``ExportTelemetry.start()`` until ``report()`` and the payload gains the peak bytes
+allocated per stage, the export's peak (``peak_memory_bytes``), that of the ``rows`` stage
+per exported row (``bytes_per_row``), the growth of the process's resident set size per
+stage (sampled from ``/proc/self/statm`` where available) and the resident set size at the
+end (``rss_bytes``). Tracing slows the traced code down several times, so it is meant for
+diagnosing memory-hungry exports rather than for always-on use. The tracer is shared by
+the process: concurrent exports count each other's allocations, but a stage starting in
+one export never erases the peak another export is measuring.
+
+The same stage timings and counters feed the export metrics (``PDF_ACTIONS_METRICS``, see
+``django_pdf_actions.metrics``), which can be enabled on their own.
+
+A disabled ``ExportTelemetry`` records nothing, so the instrumented code paths cost a
+no-op context manager per stage.
+"""
+
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from .metrics import (
+    metrics_enabled,
+    persist,
+    record_export_finished,
+    record_export_started,
+)
+from .signals import export_finished
+
+logger = logging.getLogger(__name__)
+
+# Exports tracing memory; tracemalloc is stopped again when the last one reports.
+_tracing_lock = threading.Lock()
+_tracing_sessions = 0
+_tracing_owned = False
+# Stages measuring a peak right now (see ``_PeakMeter``).
+_open_meters = set()
+
+
+def telemetry_enabled():
+    """Whether exports collect telemetry (``PDF_ACTIONS_TELEMETRY``)."""
+    return bool(getattr(settings, "PDF_ACTIONS_TELEMETRY", False))
+
+
+def memory_tracking_enabled():
+    """Whether telemetry also traces memory (``PDF_ACTIONS_TELEMETRY_MEMORY``)."""
+    return bool(getattr(settings, "PDF_ACTIONS_TELEMETRY_MEMORY", False))
+
+
+def current_rss_bytes():
+    """Resident set size of this process now, or ``None`` without ``/proc/self/statm``."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, IndexError, OSError, ValueError):
+        return None
+
+
+def _begin_tracing():
+    """Start ``tracemalloc`` for an export unless it runs already."""
+    global _tracing_sessions, _tracing_owned
+    with _tracing_lock:
+        if _tracing_sessions == 0:
+            _tracing_owned = not tracemalloc.is_tracing()
+            if _tracing_owned:
+                tracemalloc.start()
+        _tracing_sessions += 1
+
+
+def _end_tracing():
+    """End an export's tracing; stop ``tracemalloc`` after the last one if we started it."""
+    global _tracing_sessions
+    with _tracing_lock:
+        _tracing_sessions -= 1
+        if _tracing_sessions == 0 and _tracing_owned:
+            tracemalloc.stop()
+
+
+class _PeakMeter:
+    """Peak traced bytes above *baseline* while one stage runs.
+
+    ``tracemalloc`` keeps a single process-wide peak. Before any stage resets it, the
+    peak so far is folded into every open meter, so concurrent stages keep theirs.
+    """
+
+    def __init__(self, baseline):
+        self.baseline = baseline
+        self.peak = 0
+
+    def fold(self, traced_peak):
+        self.peak = max(self.peak, traced_peak - self.baseline)
+
+    @classmethod
+    def open(cls):
+        with _tracing_lock:
+            current, traced_peak = tracemalloc.get_traced_memory()
+            if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+                for meter in _open_meters:
+                    meter.fold(traced_peak)
+                tracemalloc.reset_peak()
+            meter = cls(current)
+            _open_meters.add(meter)
+            return meter
+
+    def close(self):
+        """Stop measuring; return the peak bytes."""
+        with _tracing_lock:
+            _open_meters.discard(self)
+            self.fold(tracemalloc.get_traced_memory()[1])
+        return self.peak
+
+
+class ExportTelemetry:
+    """Stage timings, memory peaks and counters of one export."""
+
+    def __init__(self, enabled=True, memory=False, publish=True, metrics=False):
+        self.enabled = enabled
+        self.memory = enabled and memory
+        # Header, log record and signal; metrics can be collected without them.
+        self.publish = publish
+        self.metrics = enabled and metrics
+        self.stages = {}
+        self.memory_peaks = {}
+        self.rss_growth = {}
+        self.counters = {}
+        self._started = time.perf_counter()
+        self._tracing = None
+        if self.memory:
+            _begin_tracing()
+            # Also ends tracing for exports that fail before ``report()``.
+            self._tracing = weakref.finalize(self, _end_tracing)
+
+    @classmethod
+    def start(cls):
+        """Telemetry for a new export, enabled according to the Django settings."""
+        publish = telemetry_enabled()
+        metrics = metrics_enabled()
+        return cls(
+            enabled=publish or metrics,
+            memory=publish and memory_tracking_enabled(),
+            publish=publish,
+            metrics=metrics,
+        )
+
+    def export_started(self, modeladmin, *, landscape):
+        """Count the export as started once it renders (not queued or rejected)."""
+        if self.metrics:
+            record_export_started(modeladmin, landscape=landscape)
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage *name* (repeated stages add up).
+
+        With memory tracking, the peak bytes allocated in the block (the largest of
+        repeated stages is kept) and the resident set size it added are recorded too.
+        """
+        if not self.enabled:
+            yield
+            return
+        tracing = self._tracing is not None and self._tracing.alive
+        meter = _PeakMeter.open() if tracing else None
+        rss = current_rss_bytes() if tracing else None
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            if meter is not None:
+                peak = meter.close()
+                self.memory_peaks[name] = max(self.memory_peaks.get(name, 0), peak)
+            if rss is not None:
+                grown = (current_rss_bytes() or rss) - rss
+                self.rss_growth[name] = self.rss_growth.get(name, 0) + grown
+
+    def close(self):
+        """Stop tracing memory for this export (done by ``report()``; safe to repeat)."""
+        if self._tracing is not None:
+            self._tracing()
+
+    def count(self, **counters):
+        """Record counters such as ``rows``, ``pages`` and ``bytes``."""
+        if self.enabled:
+            self.counters.update(counters)
+
+    def total(self):
+        """Seconds since the export started."""
+        return time.perf_counter() - self._started
+
+    def server_timing(self):
+        """The stages as a ``Server-Timing`` header value."""
+        metrics = [
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items()
+        ]
+        metrics.append(f"total;dur={self.total() * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def as_dict(self):
+        """Stage timings (``*_ms``), memory and counters as a JSON-serialisable dict."""
+        payload = {
+            "stages_ms": {
+                name: round(seconds * 1000, 3) for name, seconds in self.stages.items()
+            },
+            "total_ms": round(self.total() * 1000, 3),
+        }
+        payload.update(self.counters)
+        if self.memory:
+            payload["stages_peak_bytes"] = dict(self.memory_peaks)
+            payload["peak_memory_bytes"] = max(self.memory_peaks.values(), default=0)
+            rows = self.counters.get("rows")
+            if rows and "rows" in self.memory_peaks:
+                payload["bytes_per_row"] = self.memory_peaks["rows"] // rows
+            if self.rss_growth:
+                payload["stages_rss_bytes"] = dict(self.rss_growth)
+            payload["rss_bytes"] = current_rss_bytes()
+        return payload
+
+    def report(self, modeladmin, *, landscape, response=None):
+        """Emit the header (on *response*), the log record, the signal and metrics."""
+        if not self.enabled:
+            return
+        self.close()
+        if self.metrics:
+            record_export_finished(
+                modeladmin,
+                landscape=landscape,
+                seconds=self.total(),
+                rows=self.counters.get("rows"),
+                pages=self.counters.get("pages"),
+                size=self.counters.get("bytes"),
+            )
+            persist()
+        if not self.publish:
+            return
+        payload = self.as_dict()
+        if response is not None:
+            response["Server-Timing"] = self.server_timing()
+        model = modeladmin.model
+        message = "PDF export of %s: %s rows, %s pages, %s bytes in %.1f ms"
+        args = [
+            model._meta.label,
+            payload.get("rows"),
+            payload.get("pages"),
+            payload.get("bytes"),
+            payload["total_ms"],
+        ]
+        if "peak_memory_bytes" in payload:
+            message += ", peak %.1f MiB allocated"
+            args.append(payload["peak_memory_bytes"] / (1024 * 1024))
+        logger.info(
+            message,
+            *args,
+            extra={
+                "pdf_export": dict(
+                    payload, model=model._meta.label, landscape=landscape
+                )
+            },
+        )
+        export_finished.send(
+            sender=model, modeladmin=modeladmin, landscape=landscape, telemetry=payload
+        )
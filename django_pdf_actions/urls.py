@@ -0,0 +1,20 @@
+"""URLs for background PDF export jobs.
+
+Include them in the project URLconf, e.g.
+``path("pdf-actions/", include("django_pdf_actions.urls"))``.
+"""
+
+from django.urls import path
+
+from . import views
+
+app_name = "django_pdf_actions"
+
+urlpatterns = [
+    path("exports/<int:pk>/", views.export_job_status, name="export_job_status"),
+    path(
+        "exports/<int:pk>/download/",
+        views.export_job_download,
+        name="export_job_download",
+    ),
+]
@@ -1 +1,77 @@
-# Views are intentionally empty; PDF export is driven via admin actions.
+"""Views for background export jobs and export metrics; exports run via admin actions."""
+
+import os
+
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
+
+from .metrics import collect, render_text
+from .models import ExportJob
+
+
+def get_job_for_user(request, pk):
+    """Return the job *pk* if the requesting user may see it, else raise ``Http404``."""
+    job = get_object_or_404(ExportJob, pk=pk)
+    if not request.user.is_superuser and job.requested_by_id != request.user.pk:
+        raise Http404("No export job matches the given query.")
+    return job
+
+
+@staff_member_required
+def export_job_status(request, pk):
+    """Status page of an export job; ``?format=json`` returns a payload for polling."""
+    job = get_job_for_user(request, pk)
+    download_url = None
+    if job.status == ExportJob.STATUS_DONE and job.file:
+        download_url = reverse("django_pdf_actions:export_job_download", args=[job.pk])
+
+    if request.GET.get("format") == "json":
+        return JsonResponse(
+            {
+                "id": job.pk,
+                "model": job.model_label,
+                "status": job.status,
+                "rows": job.row_count,
+                "created": job.created.isoformat(),
+                "started_at": job.started_at and job.started_at.isoformat(),
+                "finished_at": job.finished_at and job.finished_at.isoformat(),
+                "error": job.error,
+                "download_url": download_url,
+            }
+        )
+
+    context = {
+        **admin.site.each_context(request),
+        "title": str(job),
+        "job": job,
+        "download_url": download_url,
+    }
+    return render(request, "django_pdf_actions/export_job_status.html", context)
+
+
+@staff_member_required
+def export_job_download(request, pk):
+    """Serve the rendered PDF of a finished export job."""
+    job = get_job_for_user(request, pk)
+    if job.status != ExportJob.STATUS_DONE or not job.file:
+        raise Http404("This export is not ready.")
+    return FileResponse(
+        job.file.open("rb"),
+        as_attachment=True,
+        filename=os.path.basename(job.file.name),
+        content_type="application/pdf",
+    )
+
+
+def export_metrics(request):
+    """Export metrics in the Prometheus text format (``django_pdf_actions.metrics``).
+
+    Not part of ``django_pdf_actions.urls``: route it in the project URLconf and restrict
+    access the way your other metrics endpoints are restricted.
+    """
+    return HttpResponse(
+        render_text(collect()), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
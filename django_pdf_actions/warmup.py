@@ -0,0 +1,60 @@
+"""Warm-up of the one-off work done by the first export in a process.
+
+The first export after a worker boots parses the TTF font (``pdfmetrics.registerFont``),
+downloads/decodes the logo and builds ReportLab's sample stylesheet. ``warm_up`` does
+that ahead of time. Run it in the process that forks the workers (for example from
+``wsgi.py`` under ``gunicorn --preload``) and the workers inherit the warm state through
+copy-on-write; the database connection used to read the settings is closed again so
+the workers do not share it. With ``PDF_ACTIONS_WARMUP = True`` the database-free part
+runs from ``ExportPDFConfig.ready()``.
+"""
+
+import logging
+import string
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up(pdf_settings=None, *, use_database=True):
+    """Register the export font, cache the logo and build the paragraph styles.
+
+    Uses the active settings row unless *pdf_settings* is given. With
+    ``use_database=False`` (safe during app initialisation) the default settings are
+    warmed instead, which covers the bundled font and the styles but not the logo.
+    When it reads the active settings, every database connection is closed afterwards so
+    processes forked from this one open their own. Returns a summary dict with the registered ``font`` name and whether a ``logo``
+    was cached.
+    """
+    from .actions.export_settings import ExportSettings
+    from .actions.utils import (
+        create_header_style,
+        get_active_settings,
+        get_logo_path,
+        setup_font,
+        text_width,
+    )
+
+    if pdf_settings is None and use_database:
+        try:
+            pdf_settings = get_active_settings()
+        finally:
+            # Forked workers must not share the connection opened here.
+            connections.close_all()
+    pdf_settings = ExportSettings.resolve(pdf_settings)
+
+    font_name = setup_font(pdf_settings)
+    # Fill the glyph width table used to size columns.
+    text_width(string.printable, font_name, 1)
+
+    logo = get_logo_path(pdf_settings)
+    if logo is not None and not isinstance(logo, str):
+        # Remote logos come back as an ImageReader; decode it now.
+        logo.getSize()
+
+    create_header_style(pdf_settings, font_name, is_header=True)
+    create_header_style(pdf_settings, font_name, is_header=False)
+
+    logger.debug("PDF export warm-up done (font %s)", font_name)
+    return {"font": font_name, "logo": logo is not None}
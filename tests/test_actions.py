@@ -4,18 +4,29 @@ from unittest.mock import MagicMock, patch
 
 from django.contrib.admin.sites import AdminSite
 from django.contrib.auth.models import AnonymousUser
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from django.test import RequestFactory, TestCase
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph
 
-from django_pdf_actions.actions import export_to_pdf_landscape, export_to_pdf_portrait
+from django_pdf_actions.actions import (
+    export_to_pdf_landscape,
+    export_to_pdf_portrait,
+    pdf_response,
+)
 from django_pdf_actions.actions.landscape import (
     reshape_to_arabic as landscape_reshape_to_arabic,
 )
 from django_pdf_actions.actions.portrait import (
     reshape_to_arabic as portrait_reshape_to_arabic,
 )
+from django_pdf_actions.actions.utils import (
+    ParagraphText,
+    cell_text,
+    needs_paragraph,
+    paragraph_rows,
+)
 from django_pdf_actions.models import ExportPDFSettings
 
 from .utils import MockModel, MockModelAdmin, MockQuerySet
@@ -381,8 +392,8 @@ class ReshapeToArabicTest(TestCase):
         self.assertEqual(len(data), 3)  # 1 header row + 2 data rows
         self.assertEqual(len(data[0]), 3)  # 3 columns
 
-        # Check that header style was created
-        self.assertEqual(mock_create_style.call_count, 2)  # Header and body styles
+        # Only the header style is created; body styles are applied when pages are laid out.
+        self.assertEqual(mock_create_style.call_count, 1)
 
     @patch("django_pdf_actions.actions.utils.create_header_style")
     def test_portrait_reshape_to_arabic_basic(self, mock_create_style):
@@ -399,8 +410,8 @@ class ReshapeToArabicTest(TestCase):
         self.assertEqual(len(data), 3)  # 1 header row + 2 data rows
         self.assertEqual(len(data[0]), 3)  # 3 columns
 
-        # Check that header style was created
-        self.assertEqual(mock_create_style.call_count, 2)  # Header and body styles
+        # Only the header style is created; body styles are applied when pages are laid out.
+        self.assertEqual(mock_create_style.call_count, 1)
 
     @patch("django_pdf_actions.actions.utils.create_header_style")
     def test_landscape_reshape_to_arabic_with_rtl(self, mock_create_style):
@@ -409,11 +420,14 @@ class ReshapeToArabicTest(TestCase):
         mock_create_style.return_value = mock_style
 
         self.settings.rtl_support = True
+        self.mock_obj1.name = "مستخدم"
 
         columns = ["id", "name", "email"]
 
-        with patch("django_pdf_actions.actions.utils.arabic_reshaper") as mock_arabic:
-            with patch("django_pdf_actions.actions.utils.get_display") as mock_display:
+        with patch("django_pdf_actions.actions.shaping.arabic_reshaper") as mock_arabic:
+            with patch(
+                "django_pdf_actions.actions.shaping.get_display"
+            ) as mock_display:
                 mock_arabic.reshape.return_value = "reshaped_text"
                 mock_display.return_value = "display_text"
 
@@ -439,11 +453,14 @@ class ReshapeToArabicTest(TestCase):
         mock_create_style.return_value = mock_style
 
         self.settings.rtl_support = True
+        self.mock_obj1.name = "مستخدم"
 
         columns = ["id", "name", "email"]
 
-        with patch("django_pdf_actions.actions.utils.arabic_reshaper") as mock_arabic:
-            with patch("django_pdf_actions.actions.utils.get_display") as mock_display:
+        with patch("django_pdf_actions.actions.shaping.arabic_reshaper") as mock_arabic:
+            with patch(
+                "django_pdf_actions.actions.shaping.get_display"
+            ) as mock_display:
                 mock_arabic.reshape.return_value = "reshaped_text"
                 mock_display.return_value = "display_text"
 
@@ -472,8 +489,10 @@ class ReshapeToArabicTest(TestCase):
 
         columns = ["id", "name", "email"]
 
-        with patch("django_pdf_actions.actions.utils.arabic_reshaper") as mock_arabic:
-            with patch("django_pdf_actions.actions.utils.get_display") as mock_display:
+        with patch("django_pdf_actions.actions.shaping.arabic_reshaper") as mock_arabic:
+            with patch(
+                "django_pdf_actions.actions.shaping.get_display"
+            ) as mock_display:
                 mock_arabic.reshape.return_value = "reshaped_text"
                 mock_display.return_value = "display_text"
 
@@ -501,8 +520,10 @@ class ReshapeToArabicTest(TestCase):
 
         columns = ["id", "name", "email"]
 
-        with patch("django_pdf_actions.actions.utils.arabic_reshaper") as mock_arabic:
-            with patch("django_pdf_actions.actions.utils.get_display") as mock_display:
+        with patch("django_pdf_actions.actions.shaping.arabic_reshaper") as mock_arabic:
+            with patch(
+                "django_pdf_actions.actions.shaping.get_display"
+            ) as mock_display:
                 mock_arabic.reshape.return_value = "reshaped_text"
                 mock_display.return_value = "display_text"
 
@@ -614,6 +635,99 @@ class ReshapeToArabicTest(TestCase):
         # Should work without settings
         self.assertEqual(len(data), 3)  # 1 header row + 2 data rows
 
+    @patch("django_pdf_actions.actions.utils.create_header_style")
+    def test_reshape_to_arabic_plain_text_cells(self, mock_create_style):
+        """With plain_text_cells, simple values are plain strings wrapped with newlines."""
+        mock_create_style.return_value = getSampleStyleSheet()["Normal"]
+        self.settings.plain_text_cells = True
+        queryset = MockQuerySet(
+            [
+                MockModel(id=1, name="abcdefghijklmn", email="a@x.io"),
+                MockModel(id=2, name="<b>bo</b>", email="R&D@x.io"),
+            ]
+        )
+
+        data = landscape_reshape_to_arabic(
+            ["id", "name", "email"],
+            "Helvetica",
+            10,
+            queryset,
+            10,
+            self.settings,
+            self.modeladmin,
+        )
+
+        self.assertIsInstance(data[0][0], Paragraph)
+        self.assertEqual(data[1][:2], ["1", "abcdefghij\nklmn"])
+        self.assertIsInstance(data[2][1], ParagraphText)
+        self.assertIsInstance(data[2][2], ParagraphText)
+
+    @patch("django_pdf_actions.actions.utils.create_header_style")
+    def test_reshape_to_arabic_plain_text_cells_keeps_rtl_paragraphs(
+        self, mock_create_style
+    ):
+        """Right-to-left text still goes through a Paragraph when RTL is enabled."""
+        mock_create_style.return_value = getSampleStyleSheet()["Normal"]
+        self.settings.plain_text_cells = True
+        self.settings.rtl_support = True
+        queryset = MockQuerySet([MockModel(id=1, name="مرحبا", email="a@example.com")])
+
+        data = landscape_reshape_to_arabic(
+            ["id", "name"],
+            "Helvetica",
+            10,
+            queryset,
+            50,
+            self.settings,
+            self.modeladmin,
+        )
+
+        # Columns are reversed for RTL: name first, then id.
+        self.assertIsInstance(data[1][0], ParagraphText)
+        self.assertEqual(data[1][1], "1")
+
+    @patch("django_pdf_actions.actions.utils.create_header_style")
+    def test_reshape_to_arabic_canvas_renderer_uses_plain_cells(
+        self, mock_create_style
+    ):
+        """The canvas renderer implies plain text cells."""
+        mock_create_style.return_value = getSampleStyleSheet()["Normal"]
+        self.settings.renderer = "canvas"
+
+        data = landscape_reshape_to_arabic(
+            ["id", "name"],
+            "Helvetica",
+            10,
+            self.queryset,
+            50,
+            self.settings,
+            self.modeladmin,
+        )
+
+        self.assertEqual(data[1], ["1", "Test User 1"])
+
+    def test_needs_paragraph(self):
+        """Markup, entities and (with RTL enabled) bidi text need a Paragraph."""
+        self.assertFalse(needs_paragraph("plain value"))
+        self.assertTrue(needs_paragraph("<i>x</i>"))
+        self.assertTrue(needs_paragraph("Q&A"))
+        self.assertFalse(needs_paragraph("مرحبا"))
+        self.assertTrue(needs_paragraph("مرحبا", rtl_enabled=True))
+        self.assertTrue(needs_paragraph("שלום", rtl_enabled=True))
+
+    def test_paragraph_rows(self):
+        """Only ``ParagraphText`` cells are built into paragraphs, in the given style."""
+        style = getSampleStyleSheet()["Normal"]
+        markup = ParagraphText("<b>bo</b><br/>ld")
+
+        rows = paragraph_rows([["1", markup]], style)
+
+        self.assertEqual(rows[0][0], "1")
+        self.assertIsInstance(rows[0][1], Paragraph)
+        self.assertIs(rows[0][1].style, style)
+        self.assertEqual(rows[0][1].text, markup.text)
+        self.assertEqual(cell_text(markup), "bo\nld")
+
 
 class PDFExportIntegrationTest(TestCase):
     """Integration tests for PDF export functionality."""
@@ -729,3 +843,76 @@ class PDFExportIntegrationTest(TestCase):
 
             self.assertIsInstance(response, HttpResponse)
             self.assertEqual(response["Content-Type"], "application/pdf")
+
+    def test_export_streams_when_enabled(self):
+        """With stream_response enabled the PDF is spooled and returned as a FileResponse."""
+        self.settings.stream_response = True
+        self.settings.save()
+
+        request = self.factory.get("/admin")
+        request.user = self.user
+
+        response = export_to_pdf_landscape(self.modeladmin, request, self.queryset)
+
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertTrue(
+            response["Content-Disposition"].startswith(
+                'attachment; filename="MockModel_export_'
+            )
+        )
+        content = b"".join(response.streaming_content)
+        self.assertTrue(content.startswith(b"%PDF"))
+        self.assertEqual(int(response["Content-Length"]), len(content))
+        response.close()
+
+    def test_export_with_plain_text_cells(self):
+        """Exports still produce a valid PDF with the plain-string cell fast path."""
+        self.settings.plain_text_cells = True
+        self.settings.save()
+
+        request = self.factory.get("/admin")
+        request.user = self.user
+
+        response = export_to_pdf_landscape(self.modeladmin, request, self.queryset)
+
+        self.assertIsInstance(response, HttpResponse)
+        self.assertTrue(response.content.startswith(b"%PDF"))
+
+    def test_export_with_canvas_renderer(self):
+        """The direct-canvas renderer produces a valid PDF."""
+        self.settings.renderer = "canvas"
+        self.settings.save()
+
+        request = self.factory.get("/admin")
+        request.user = self.user
+
+        response = export_to_pdf_portrait(self.modeladmin, request, self.queryset)
+
+        self.assertIsInstance(response, HttpResponse)
+        self.assertTrue(response.content.startswith(b"%PDF"))
+
+    def test_page_chrome_drawn_once_per_export(self):
+        """Title and export time are drawn once into a form; page numbers per page."""
+        self.settings.items_per_page = 1
+        self.settings.save()
+
+        request = self.factory.get("/admin")
+        request.user = self.user
+
+        with patch(
+            "django_pdf_actions.actions.pdf_response.draw_model_name",
+            wraps=pdf_response.draw_model_name,
+        ) as mock_draw_model, patch(
+            "django_pdf_actions.actions.pdf_response.draw_exported_at",
+            wraps=pdf_response.draw_exported_at,
+        ) as mock_draw_exported, patch(
+            "django_pdf_actions.actions.pdf_response.draw_page_number",
+            wraps=pdf_response.draw_page_number,
+        ) as mock_draw_page:
+            response = export_to_pdf_landscape(self.modeladmin, request, self.queryset)
+
+        self.assertTrue(response.content.startswith(b"%PDF"))
+        self.assertEqual(mock_draw_model.call_count, 1)
+        self.assertEqual(mock_draw_exported.call_count, 1)
+        self.assertEqual(mock_draw_page.call_count, 2)
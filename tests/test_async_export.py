@@ -0,0 +1,92 @@
+"""Tests for the async export response."""
+
+import asyncio
+from unittest import skipIf
+from unittest.mock import patch
+
+import django
+from django.contrib.admin.sites import AdminSite
+from django.db import DatabaseError
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+
+from django_pdf_actions.actions.pdf_response import abuild_pdf_export_response
+from django_pdf_actions.actions.queries import StreamedRows, stream_rows
+from django_pdf_actions.models import ExportPDFSettings
+
+from .utils import MockModel, MockModelAdmin, MockQuerySet, SettingsAdmin
+
+
+@skipIf(django.VERSION < (4, 2), "async streaming responses need Django 4.2")
+class AsyncExportTest(TestCase):
+    """Test cases for abuild_pdf_export_response and stream_rows."""
+
+    def setUp(self):
+        for i in range(3):
+            ExportPDFSettings.objects.create(title=f"Settings {i}")
+        self.modeladmin = SettingsAdmin(ExportPDFSettings, AdminSite())
+
+    async def test_stream_rows(self):
+        queryset = ExportPDFSettings.objects.order_by("title")
+
+        rows = stream_rows(queryset, chunk_size=2)
+        feeding = asyncio.ensure_future(rows.feed())
+        fetched = await asyncio.get_running_loop().run_in_executor(None, list, rows)
+        await feeding
+
+        self.assertIsInstance(rows, StreamedRows)
+        self.assertEqual(
+            [row.title for row in fetched], [f"Settings {i}" for i in range(3)]
+        )
+        self.assertIs(rows.model, ExportPDFSettings)
+        self.assertIsNone(queryset._result_cache)
+
+    async def test_stream_rows_raises_fetch_errors_in_consumer(self):
+        rows = stream_rows(
+            ExportPDFSettings.objects.extra(where=["missing_column = 1"])
+        )
+        feeding = asyncio.ensure_future(rows.feed())
+
+        with self.assertRaises(DatabaseError):
+            await asyncio.get_running_loop().run_in_executor(None, list, rows)
+        await feeding
+
+    async def test_stream_rows_passes_plain_iterables_through(self):
+        queryset = MockQuerySet([MockModel(id=1, name="A", email="a@example.com")])
+
+        self.assertIs(stream_rows(queryset), queryset)
+
+    async def test_streams_pdf(self):
+        response = await abuild_pdf_export_response(
+            self.modeladmin,
+            ExportPDFSettings.objects.order_by("title"),
+            landscape=True,
+        )
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertTrue(response.is_async)
+        self.assertTrue(
+            response["Content-Disposition"].startswith(
+                'attachment; filename="ExportPDFSettings_export_'
+            )
+        )
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertTrue(content.startswith(b"%PDF"))
+
+    async def test_renders_in_executor_thread(self):
+        modeladmin = MockModelAdmin(MockModel, AdminSite())
+        queryset = MockQuerySet([MockModel(id=1, name="A", email="a@example.com")])
+
+        with patch(
+            "django_pdf_actions.actions.pdf_response.write_pdf_export"
+        ) as mock_write:
+            mock_write.side_effect = lambda *args, **kwargs: args[2].write(b"%PDF")
+            response = await abuild_pdf_export_response(
+                modeladmin, queryset, landscape=False
+            )
+            content = b"".join([chunk async for chunk in response.streaming_content])
+
+        self.assertEqual(content, b"%PDF")
+        args, kwargs = mock_write.call_args
+        self.assertIs(args[1], queryset)
+        self.assertFalse(kwargs["landscape"])
@@ -0,0 +1,65 @@
+"""Tests for the benchmark runner's measuring and baseline comparison."""
+
+from django.test import SimpleTestCase
+
+from benchmarks.run_benchmarks import compare, measure, result_key
+
+
+def entry(case, median, memory=None, rows=1000, direction="ltr"):
+    result = {
+        "case": case,
+        "rows": rows,
+        "direction": direction,
+        "median_seconds": median,
+    }
+    if memory is not None:
+        result["peak_memory_bytes"] = memory
+    return result
+
+
+class BenchmarkRunnerTest(SimpleTestCase):
+    """Test cases for benchmarks/run_benchmarks.py helpers."""
+
+    def test_measure_reports_time_and_memory(self):
+        calls = []
+
+        result = measure(lambda: calls.append(bytearray(100000)), repeat=2, calls=3)
+
+        self.assertEqual(len(calls), 7)  # 2 x 3 timed calls + 1 tracemalloc run
+        self.assertEqual(result["repeat"], 2)
+        self.assertLessEqual(result["min_seconds"], result["median_seconds"])
+        self.assertGreaterEqual(result["peak_memory_bytes"], 100000)
+
+    def test_result_key(self):
+        self.assertEqual(
+            result_key(entry("reshape_to_arabic", 1.0)), "reshape_to_arabic[1000-ltr]"
+        )
+        self.assertEqual(
+            result_key(entry("get_active_settings", 1.0, rows=None, direction=None)),
+            "get_active_settings[---]",
+        )
+
+    def test_compare_flags_regressions(self):
+        baseline = {
+            "results": [
+                entry("reshape_to_arabic", 1.0, memory=1000),
+                entry("calculate_column_widths", 1.0, memory=1000),
+                entry("build_pdf_export_response", 1.0, memory=1000),
+            ]
+        }
+        results = [
+            entry("reshape_to_arabic", 1.1, memory=1000),
+            entry("calculate_column_widths", 1.5, memory=1000),
+            entry("build_pdf_export_response", 1.0, memory=2000),
+            entry("setup_font", 1.0, rows=None),
+        ]
+
+        regressions = compare(results, baseline, tolerance=0.2)
+
+        self.assertEqual(
+            regressions,
+            [
+                "calculate_column_widths[1000-ltr]",
+                "build_pdf_export_response[1000-ltr]",
+            ],
+        )
@@ -0,0 +1,90 @@
+"""Tests for the direct-canvas table renderer."""
+
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph, Table
+
+from django_pdf_actions.actions.canvas_table import CanvasTable
+from django_pdf_actions.actions.utils import create_table_style
+
+
+class CanvasTableTest(SimpleTestCase):
+    """``CanvasTable`` reproduces the geometry of the platypus table."""
+
+    def setUp(self):
+        self.settings = type(
+            "MockSettings",
+            (),
+            {
+                "body_font_size": 7,
+                "header_font_size": 12,
+                "grid_line_width": 0.25,
+                "table_spacing": 1.5,
+                "content_alignment": "CENTER",
+                "header_alignment": "CENTER",
+                "rtl_support": False,
+            },
+        )()
+        style = getSampleStyleSheet()["Normal"]
+        self.col_widths = [100, 120, 80]
+        self.rows = [
+            [Paragraph(f"Header {i}", style) for i in range(3)],
+            ["1", "first\nsecond", "x"],
+            ["2", Paragraph("<b>bold</b>", style), "y"],
+            ["3", "plain", "z"],
+        ]
+        self.canvas = canvas.Canvas(BytesIO())
+        self.renderer = CanvasTable(
+            self.col_widths, "Helvetica", self.settings, colors.grey, colors.black
+        )
+
+    def test_row_heights_match_platypus(self):
+        table = Table(
+            self.rows,
+            colWidths=self.col_widths,
+            style=create_table_style(
+                self.settings, "Helvetica", colors.grey, colors.black
+            ),
+        )
+        table.wrapOn(self.canvas, sum(self.col_widths), 1000)
+
+        heights, _flowables = self.renderer.measure(self.canvas, self.rows)
+
+        for actual, expected in zip(heights, table._rowHeights):
+            self.assertAlmostEqual(actual, expected)
+
+    def test_draw_returns_table_height(self):
+        heights, _flowables = self.renderer.measure(self.canvas, self.rows)
+
+        height = self.renderer.draw(self.canvas, self.rows, 20, 800)
+
+        self.assertAlmostEqual(height, sum(heights))
+        self.assertEqual(self.renderer.width, sum(self.col_widths))
+
+    def test_header_is_measured_once(self):
+        self.renderer.draw(self.canvas, self.rows, 20, 800)
+        header = self.renderer._header
+
+        self.renderer.draw(self.canvas, self.rows[:1] + self.rows[3:], 20, 800)
+
+        self.assertIs(self.renderer._header, header)
+
+    def test_line_alignment(self):
+        self.settings.content_alignment = "LEFT"
+        left = CanvasTable(
+            self.col_widths, "Helvetica", self.settings, colors.grey, colors.black
+        )
+        self.settings.content_alignment = "RIGHT"
+        right = CanvasTable(
+            self.col_widths, "Helvetica", self.settings, colors.grey, colors.black
+        )
+
+        self.assertEqual(left._line_x("abc", 10, 100), 10)
+        self.assertLess(
+            self.renderer._line_x("abc", 10, 100), right._line_x("abc", 10, 100)
+        )
+        self.assertGreater(self.renderer._line_x("abc", 10, 100), 10)
@@ -0,0 +1,204 @@
+"""Tests for compiled list_display column accessors."""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.contrib import admin
+from django.contrib.admin.sites import AdminSite
+from django.test import TestCase
+
+from django_pdf_actions.actions import pdf_io_bound
+from django_pdf_actions.actions.columns import (
+    compile_column,
+    compile_columns,
+    evaluate_chunk,
+    io_executor,
+)
+from django_pdf_actions.actions.utils import reshape_to_arabic
+
+from .utils import MockCustomer, MockModel, MockModelAdmin, MockOrder, MockQuerySet
+
+
+class ColumnAdmin(MockModelAdmin):
+    """Admin exposing callables, constants and failures as columns."""
+
+    label = "constant"
+
+    @admin.display(description="Shouted name")
+    def shout(self, obj):
+        return obj.name.upper()
+
+    def broken(self, obj):
+        raise RuntimeError("boom")
+
+    @pdf_io_bound
+    def remote_status(self, obj):
+        return f"{obj.id}:{threading.current_thread().name}"
+
+    @pdf_io_bound
+    def remote_broken(self, obj):
+        raise ConnectionError("service down")
+
+
+class CompileColumnsTest(TestCase):
+    """Test cases for compile_column / compile_columns."""
+
+    def setUp(self):
+        self.obj = MockModel(id=7, name="Test User", email="user@example.com")
+        self.modeladmin = ColumnAdmin(MockModel, AdminSite())
+
+    def compile(self, column, **kwargs):
+        return compile_column(column, MockModel, self.modeladmin, **kwargs)
+
+    def test_model_field(self):
+        column = self.compile("name")
+
+        self.assertEqual(column.kind, "field")
+        self.assertEqual(column.header, "Name")
+        self.assertEqual(column.get(self.obj), "Test User")
+
+    def test_related_field_and_lookup(self):
+        customer = MockCustomer(id=1, name="ACME")
+        order = MockOrder(number="1", customer=customer)
+
+        fk = compile_column("customer", MockOrder)
+        lookup = compile_column("customer__name", MockOrder)
+
+        self.assertEqual(fk.kind, "related")
+        self.assertIs(fk.get(order), customer)
+        self.assertEqual(lookup.kind, "related")
+        self.assertEqual(lookup.get(order), "ACME")
+        self.assertIsNone(lookup.get(SimpleNamespace(customer=None)))
+
+    def test_lookup_header(self):
+        self.assertEqual(compile_column("customer__name", MockOrder).header, "Name")
+        # Unknown final field: separators collapse to single spaces.
+        self.assertEqual(
+            compile_column("customer__full_name", MockOrder).header,
+            "Customer full name",
+        )
+
+    def test_annotation(self):
+        self.obj.total = 42
+        column = self.compile("total", annotations={"total": None})
+
+        self.assertEqual(column.kind, "annotation")
+        self.assertEqual(column.get(self.obj), 42)
+
+    def test_model_property_and_method(self):
+        prop = self.compile("domain")
+        method = self.compile("greeting")
+
+        self.assertEqual(prop.kind, "attribute")
+        self.assertEqual(prop.get(self.obj), "example.com")
+        self.assertEqual(method.kind, "model_method")
+        self.assertEqual(method.get(self.obj), "Hello Test User")
+
+    def test_admin_callable(self):
+        column = self.compile("shout")
+
+        self.assertEqual(column.kind, "admin")
+        self.assertEqual(column.header, "Shouted name")
+        self.assertEqual(column.get(self.obj), "TEST USER")
+
+    def test_admin_callable_failure(self):
+        self.assertEqual(self.compile("broken").get(self.obj), "Error: broken")
+
+    def test_admin_constant(self):
+        self.assertEqual(self.compile("label").get(self.obj), "constant")
+
+    def test_missing_and_instance_only_attributes(self):
+        column = self.compile("nickname")
+
+        self.assertEqual(column.kind, "dynamic")
+        self.assertEqual(column.header, "Nickname")
+        self.assertEqual(column.get(self.obj), "Missing: nickname")
+        self.obj.nickname = "tester"
+        self.assertEqual(column.get(self.obj), "tester")
+
+    def test_compile_columns_keeps_order(self):
+        columns = compile_columns(["id", "shout", "email"], MockModel, self.modeladmin)
+
+        self.assertEqual([c.name for c in columns], ["id", "shout", "email"])
+        self.assertEqual([c.get(self.obj) for c in columns][:2], [7, "TEST USER"])
+
+
+class IoBoundColumnsTest(TestCase):
+    """Columns marked with ``@pdf_io_bound`` are evaluated in a thread pool."""
+
+    def setUp(self):
+        self.objs = [
+            MockModel(id=i, name=f"User {i}", email=f"user{i}@example.com")
+            for i in range(1, 21)
+        ]
+        self.modeladmin = ColumnAdmin(MockModel, AdminSite())
+
+    def test_decorator_marks_column(self):
+        columns = compile_columns(
+            ["name", "shout", "remote_status"], MockModel, self.modeladmin
+        )
+
+        self.assertEqual([column.io_bound for column in columns], [False, False, True])
+
+    def test_no_executor_without_io_bound_columns(self):
+        columns = compile_columns(["name", "shout"], MockModel, self.modeladmin)
+
+        with io_executor(columns) as executor:
+            self.assertIsNone(executor)
+
+    def test_evaluate_chunk_keeps_row_order(self):
+        columns = compile_columns(["id", "remote_status"], MockModel, self.modeladmin)
+
+        with io_executor(columns, max_workers=4) as executor:
+            rows = evaluate_chunk(columns, self.objs, executor)
+
+        self.assertEqual([row[0] for row in rows], list(range(1, 21)))
+        for obj, (_id, status) in zip(self.objs, rows):
+            obj_id, thread_name = status.split(":")
+            self.assertEqual(int(obj_id), obj.id)
+            self.assertTrue(thread_name.startswith("pdf-io"))
+
+    def test_worker_threads_close_their_connections_once(self):
+        columns = compile_columns(["remote_status"], MockModel, self.modeladmin)
+        closed_in = []
+
+        with patch(
+            "django_pdf_actions.actions.columns.connections"
+        ) as mock_connections:
+            mock_connections.close_all.side_effect = lambda: closed_in.append(
+                threading.current_thread().name
+            )
+            with io_executor(columns, max_workers=3) as executor:
+                rows = evaluate_chunk(columns, self.objs, executor)
+                self.assertEqual(closed_in, [])
+
+        used = {status.split(":")[1] for (status,) in rows}
+        self.assertEqual(len(closed_in), len(set(closed_in)))
+        self.assertLessEqual(used, set(closed_in))
+        self.assertLessEqual(len(closed_in), 3)
+
+    def test_io_bound_failure_renders_error(self):
+        columns = compile_columns(["remote_broken"], MockModel, self.modeladmin)
+
+        with io_executor(columns) as executor:
+            rows = evaluate_chunk(columns, self.objs[:2], executor)
+
+        self.assertEqual(rows, [["Error: remote_broken"], ["Error: remote_broken"]])
+
+    def test_reshape_to_arabic_uses_thread_pool(self):
+        self.modeladmin.pdf_io_bound_workers = 2
+
+        data = reshape_to_arabic(
+            ["id", "remote_status"],
+            "Helvetica",
+            10,
+            MockQuerySet(self.objs),
+            50,
+            None,
+            self.modeladmin,
+        )
+
+        self.assertEqual(len(data), 21)
+        self.assertEqual(data[5][1].text.split(":")[0], "5")
+        self.assertIn(":pdf-io", data[5][1].text)
@@ -0,0 +1,70 @@
+"""Tests for the resolved per-export settings snapshot."""
+
+from dataclasses import FrozenInstanceError
+
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+
+from django_pdf_actions.actions import export_to_pdf_landscape
+from django_pdf_actions.actions.export_settings import ExportSettings
+from django_pdf_actions.models import ExportPDFSettings
+
+from .utils import MockModel, MockModelAdmin, MockQuerySet
+
+
+class ExportSettingsTest(TestCase):
+    """``ExportSettings.resolve`` fills in defaults once per export."""
+
+    def test_defaults_depend_on_orientation(self):
+        landscape = ExportSettings.resolve(None, landscape=True)
+        portrait = ExportSettings.resolve(None, landscape=False)
+
+        self.assertEqual(
+            (landscape.items_per_page, landscape.max_chars_per_line), (15, 60)
+        )
+        self.assertEqual(
+            (portrait.items_per_page, portrait.max_chars_per_line), (20, 40)
+        )
+        self.assertEqual(landscape.body_font_size, 7)
+        self.assertEqual(landscape.header_font_size, 12)
+        self.assertEqual(landscape.page_margin_mm, 15)
+
+    def test_resolve_copies_row_values(self):
+        row = ExportPDFSettings.objects.create(
+            title="Row", active=True, items_per_page=33, rtl_support=True
+        )
+
+        resolved = ExportSettings.resolve(row, landscape=False)
+
+        self.assertEqual(resolved.items_per_page, 33)
+        self.assertTrue(resolved.rtl_support)
+        self.assertEqual(resolved.max_chars_per_line, row.max_chars_per_line)
+
+    def test_resolve_fills_missing_attributes(self):
+        partial = type("MockSettings", (), {"body_font_size": 9})()
+
+        resolved = ExportSettings.resolve(partial)
+
+        self.assertEqual(resolved.body_font_size, 9)
+        self.assertEqual(resolved.renderer, "platypus")
+
+    def test_snapshot_is_immutable_and_reused(self):
+        resolved = ExportSettings.resolve(None)
+
+        with self.assertRaises(FrozenInstanceError):
+            resolved.body_font_size = 10
+        self.assertIs(ExportSettings.resolve(resolved), resolved)
+
+    def test_export_without_settings_queries_once(self):
+        """Only the (missing) settings lookup hits the database, not every page."""
+        queryset = MockQuerySet(
+            [MockModel(id=i, name=f"User {i}", email=f"{i}@x.io") for i in range(100)]
+        )
+        request = RequestFactory().get("/admin")
+        request.user = AnonymousUser()
+
+        with self.assertNumQueries(1):
+            export_to_pdf_landscape(
+                MockModelAdmin(MockModel, AdminSite()), request, queryset
+            )
@@ -0,0 +1,139 @@
+"""Tests for the font catalog."""
+
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from django_pdf_actions import fonts
+from django_pdf_actions.fonts import FontCatalog
+from django_pdf_actions.management.commands.setup_fonts import (
+    Command as SetupFontsCommand,
+)
+
+BUNDLED_FONT = os.path.join(
+    os.path.dirname(fonts.__file__),
+    "static",
+    "django_pdf_actions",
+    "fonts",
+    "DejaVuSans.ttf",
+)
+
+
+class FontCatalogTest(SimpleTestCase):
+    """Fonts are scanned once, indexed on disk and rescanned when they change."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+        self.fonts_dir = os.path.join(self.temp_dir, "static", "assets", "fonts")
+        os.makedirs(self.fonts_dir)
+        self.index_path = os.path.join(self.temp_dir, "fonts.json")
+        settings_override = override_settings(
+            BASE_DIR=self.temp_dir, PDF_ACTIONS_FONT_INDEX=self.index_path
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def install(self, name="Project.ttf"):
+        path = os.path.join(self.fonts_dir, name)
+        shutil.copyfile(BUNDLED_FONT, path)
+        return path
+
+    def test_resolves_project_and_bundled_fonts(self):
+        project_font = self.install()
+        catalog = FontCatalog()
+
+        self.assertEqual(catalog.path("Project.ttf"), project_font)
+        self.assertEqual(
+            os.path.normcase(catalog.path("DejaVuSans.ttf")),
+            os.path.normcase(os.path.abspath(BUNDLED_FONT)),
+        )
+        self.assertIsNone(catalog.path("Missing.ttf"))
+        self.assertEqual(catalog.families()["Project.ttf"], "DejaVu Sans")
+
+    def test_project_font_wins_over_static_font(self):
+        project_font = self.install("DejaVuSans.ttf")
+
+        self.assertEqual(FontCatalog().path("DejaVuSans.ttf"), project_font)
+
+    def test_index_is_reused_by_new_catalogs(self):
+        self.install()
+        FontCatalog().path("Project.ttf")
+
+        with open(self.index_path, encoding="utf-8") as fh:
+            self.assertIn("Project.ttf", json.load(fh)["fonts"])
+
+        with patch("django_pdf_actions.fonts.font_family") as mock_family:
+            self.assertTrue(FontCatalog().path("Project.ttf"))
+        mock_family.assert_not_called()
+
+    def test_rescans_when_mtime_changes(self):
+        self.install()
+        catalog = FontCatalog()
+        catalog.path("Project.ttf")
+
+        added = self.install("Added.ttf")
+        with patch("django_pdf_actions.fonts.CHECK_INTERVAL", 0):
+            self.assertEqual(catalog.path("Added.ttf"), added)
+
+            os.utime(added, (0, 0))
+            with patch("django_pdf_actions.fonts.font_family", return_value="Changed"):
+                self.assertEqual(catalog.get("Added.ttf")["family"], "Changed")
+
+    def test_lookups_between_checks_do_not_touch_disk(self):
+        self.install()
+        catalog = FontCatalog()
+        catalog.path("Project.ttf")
+
+        with patch("django_pdf_actions.fonts.os.stat") as mock_stat:
+            catalog.path("Project.ttf")
+        mock_stat.assert_not_called()
+
+    def test_setup_fonts_invalidates_catalog(self):
+        with patch("django_pdf_actions.fonts._catalog", FontCatalog()):
+            fonts.font_catalog().path("DejaVuSans.ttf")
+            self.assertTrue(os.path.exists(self.index_path))
+
+            with patch.object(SetupFontsCommand, "download_and_process_font"):
+                call_command("setup_fonts", stdout=StringIO())
+
+            self.assertFalse(os.path.exists(self.index_path))
+            self.assertFalse(fonts.font_catalog()._loaded)
+
+    def test_rejects_index_entries_outside_font_directories(self):
+        self.install()
+        FontCatalog().path("Project.ttf")
+        outside = os.path.join(self.temp_dir, "Project.ttf")
+        shutil.copyfile(BUNDLED_FONT, outside)
+        with open(self.index_path, encoding="utf-8") as fh:
+            index = json.load(fh)
+        index["fonts"]["Project.ttf"]["path"] = outside
+        index["fonts"]["Project.ttf"]["mtime"] = os.stat(outside).st_mtime
+        with open(self.index_path, "w", encoding="utf-8") as fh:
+            json.dump(index, fh)
+
+        with self.assertLogs("django_pdf_actions.fonts", "WARNING"):
+            path = FontCatalog().path("Project.ttf")
+
+        self.assertEqual(path, os.path.join(self.fonts_dir, "Project.ttf"))
+
+    def test_default_index_is_private_to_the_user(self):
+        cache_home = os.path.join(self.temp_dir, "cache")
+        with override_settings(PDF_ACTIONS_FONT_INDEX=None), patch.dict(
+            os.environ, {"XDG_CACHE_HOME": cache_home}
+        ):
+            catalog = FontCatalog()
+            catalog.path("DejaVuSans.ttf")
+
+        self.assertTrue(catalog.index_path.startswith(cache_home + os.sep))
+        self.assertTrue(os.path.exists(catalog.index_path))
+        if os.name == "posix":
+            self.assertEqual(os.stat(catalog.index_path).st_mode & 0o777, 0o600)
+            directory = os.path.dirname(catalog.index_path)
+            self.assertEqual(os.stat(directory).st_mode & 0o777, 0o700)
@@ -0,0 +1,325 @@
+"""Tests for background export jobs, their worker command and views."""
+
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core.management import call_command
+from django.db.models.functions import Length
+from django.http import HttpResponseRedirect
+from django.test import RequestFactory, TestCase, override_settings
+
+from django_pdf_actions.actions import export_to_pdf_landscape
+from django_pdf_actions.actions.utils import reshape_to_arabic
+from django_pdf_actions.jobs import (
+    claim_next_job,
+    enqueue_export,
+    job_queryset,
+    run_export_job,
+)
+from django_pdf_actions.metrics import metrics_store
+from django_pdf_actions.models import ExportJob, ExportPDFSettings
+
+from .utils import SettingsAdmin
+
+
+class AnnotatedSettingsAdmin(SettingsAdmin):
+    """Admin exporting a column annotated by ``get_queryset``."""
+
+    list_display = ("title", "title_length")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(title_length=Length("title"))
+
+    def title_length(self, obj):
+        return obj.title_length
+
+
+class ExportJobTestMixin:
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        media_override = override_settings(MEDIA_ROOT=self.media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, True)
+
+        self.user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin123"
+        )
+        self.settings = ExportPDFSettings.objects.create(title="Active", active=True)
+        self.other = ExportPDFSettings.objects.create(title="Other")
+        self.modeladmin = SettingsAdmin(ExportPDFSettings, AdminSite())
+        admin_patch = patch(
+            "django_pdf_actions.jobs.get_model_admin", return_value=self.modeladmin
+        )
+        admin_patch.start()
+        self.addCleanup(admin_patch.stop)
+
+    def make_request(self):
+        request = RequestFactory().post("/admin/")
+        request.user = self.user
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        return request
+
+    def enqueue(self, **kwargs):
+        queryset = ExportPDFSettings.objects.order_by("title")
+        return enqueue_export(self.modeladmin, queryset, landscape=True, **kwargs)
+
+
+class ExportJobQueueTest(ExportJobTestMixin, TestCase):
+    """Queueing, claiming and rendering jobs."""
+
+    def test_enqueue_export_records_selection(self):
+        job = self.enqueue(user=self.user)
+
+        self.assertEqual(job.status, ExportJob.STATUS_PENDING)
+        self.assertEqual(job.model_label, "django_pdf_actions.ExportPDFSettings")
+        self.assertEqual(job.row_count, 2)
+        self.assertEqual(
+            list(job_queryset(job, self.modeladmin)), [self.settings, self.other]
+        )
+        self.assertEqual(job.requested_by, self.user)
+
+    def test_claim_next_job_marks_running_once(self):
+        first = self.enqueue()
+        second = self.enqueue()
+
+        claimed = claim_next_job()
+        self.assertEqual(claimed.pk, first.pk)
+        self.assertEqual(claimed.status, ExportJob.STATUS_RUNNING)
+        self.assertIsNotNone(claimed.started_at)
+
+        self.assertEqual(claim_next_job().pk, second.pk)
+        self.assertIsNone(claim_next_job())
+
+    def test_run_export_job_writes_pdf(self):
+        self.enqueue()
+        job = run_export_job(claim_next_job())
+
+        self.assertEqual(job.status, ExportJob.STATUS_DONE)
+        self.assertIsNotNone(job.finished_at)
+        with job.file.open("rb") as fh:
+            self.assertTrue(fh.read().startswith(b"%PDF"))
+
+    @override_settings(PDF_ACTIONS_METRICS=True)
+    def test_run_export_job_records_metrics(self):
+        metrics_store().clear()
+        self.addCleanup(metrics_store().clear)
+        self.enqueue()
+
+        run_export_job(claim_next_job())
+
+        labels = (
+            ("model", "django_pdf_actions.exportpdfsettings"),
+            ("orientation", "landscape"),
+        )
+        counters = metrics_store().counters
+        self.assertEqual(counters[("pdf_export_started_total", labels)], 1)
+        self.assertEqual(counters[("pdf_export_finished_total", labels)], 1)
+        self.assertEqual(counters[("pdf_export_rows_total", labels)], 2)
+
+    def test_run_export_job_keeps_admin_annotations(self):
+        modeladmin = AnnotatedSettingsAdmin(ExportPDFSettings, AdminSite())
+        request = RequestFactory().get("/admin/")
+        request.user = self.user
+        job = enqueue_export(
+            modeladmin,
+            modeladmin.get_queryset(request).filter(title="Active"),
+            landscape=True,
+        )
+        exported = []
+
+        def capture(modeladmin, queryset, output, **kwargs):
+            exported.extend(
+                row[1].text
+                for row in reshape_to_arabic(
+                    list(modeladmin.list_display),
+                    "Helvetica",
+                    10,
+                    queryset,
+                    50,
+                    None,
+                    modeladmin,
+                )[1:]
+            )
+            output.write(b"%PDF")
+
+        with patch(
+            "django_pdf_actions.jobs.get_model_admin", return_value=modeladmin
+        ), patch(
+            "django_pdf_actions.actions.pdf_response.write_pdf_export",
+            side_effect=capture,
+        ):
+            job = run_export_job(claim_next_job())
+
+        self.assertEqual(job.status, ExportJob.STATUS_DONE)
+        self.assertEqual(exported, ["6"])
+
+    def test_run_export_job_records_failure(self):
+        job = self.enqueue()
+        job.model_label = "django_pdf_actions.DoesNotExist"
+        job.save()
+
+        job = run_export_job(claim_next_job())
+
+        self.assertEqual(job.status, ExportJob.STATUS_FAILED)
+        self.assertTrue(job.error)
+        self.assertFalse(job.file)
+
+    def test_worker_command_processes_pending_jobs(self):
+        self.enqueue()
+        self.enqueue()
+        out = StringIO()
+
+        call_command("run_pdf_export_worker", "--once", stdout=out)
+
+        self.assertFalse(
+            ExportJob.objects.exclude(status=ExportJob.STATUS_DONE).exists()
+        )
+        self.assertIn("Processed 2 export job(s)", out.getvalue())
+
+    def test_worker_command_max_jobs(self):
+        self.enqueue()
+        self.enqueue()
+
+        call_command("run_pdf_export_worker", "--max-jobs", "1", stdout=StringIO())
+
+        self.assertEqual(
+            ExportJob.objects.filter(status=ExportJob.STATUS_PENDING).count(), 1
+        )
+
+
+class BackgroundExportActionTest(ExportJobTestMixin, TestCase):
+    """The admin action queues a job when ``background_export`` is enabled."""
+
+    def test_action_queues_job_and_redirects(self):
+        self.settings.background_export = True
+        self.settings.save()
+
+        response = export_to_pdf_landscape(
+            self.modeladmin, self.make_request(), ExportPDFSettings.objects.all()
+        )
+
+        job = ExportJob.objects.get()
+        self.assertIsInstance(response, HttpResponseRedirect)
+        self.assertEqual(response.url, f"/pdf-actions/exports/{job.pk}/")
+        self.assertTrue(job.landscape)
+        self.assertEqual(job.requested_by, self.user)
+
+    def test_action_renders_inline_by_default(self):
+        response = export_to_pdf_landscape(
+            self.modeladmin, self.make_request(), ExportPDFSettings.objects.all()
+        )
+
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertFalse(ExportJob.objects.exists())
+
+
+class ExportSizeRoutingTest(ExportJobTestMixin, TestCase):
+    """Exports above ``max_inline_cells`` are queued or rejected."""
+
+    def setUp(self):
+        super().setUp()
+        self.settings.max_inline_cells = 5
+        self.settings.save()
+
+    def export(self):
+        request = self.make_request()
+        response = export_to_pdf_landscape(
+            self.modeladmin, request, ExportPDFSettings.objects.all()
+        )
+        return request, response
+
+    def test_small_export_renders_inline(self):
+        self.settings.max_inline_cells = 6  # 2 rows x 3 columns
+        self.settings.save()
+
+        _request, response = self.export()
+
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertFalse(ExportJob.objects.exists())
+
+    def test_large_export_is_queued(self):
+        _request, response = self.export()
+
+        job = ExportJob.objects.get()
+        self.assertIsInstance(response, HttpResponseRedirect)
+        self.assertEqual(job.row_count, 2)
+
+    def test_large_export_is_rejected(self):
+        self.settings.oversized_export = "reject"
+        self.settings.save()
+
+        request, response = self.export()
+
+        self.assertIsNone(response)
+        self.assertFalse(ExportJob.objects.exists())
+        message = str(list(request._messages)[0])
+        self.assertIn("about 2 rows x 3 columns (limit 5 cells)", message)
+
+    def test_pluggable_estimator(self):
+        self.settings.max_inline_cells = 1000
+        self.settings.oversized_export = "reject"
+        self.settings.save()
+        self.modeladmin.pdf_export_estimator = lambda queryset: 10_000
+
+        request, response = self.export()
+
+        self.assertIsNone(response)
+        self.assertIn("about 10000 rows", str(list(request._messages)[0]))
+
+
+class ExportJobViewsTest(ExportJobTestMixin, TestCase):
+    """Status and download views."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_status_page_pending(self):
+        job = self.enqueue(user=self.user)
+
+        response = self.client.get(f"/pdf-actions/exports/{job.pk}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Pending")
+        self.assertContains(response, 'http-equiv="refresh"')
+
+    def test_status_json_and_download_when_done(self):
+        job = self.enqueue(user=self.user)
+        run_export_job(claim_next_job())
+
+        response = self.client.get(f"/pdf-actions/exports/{job.pk}/?format=json")
+        payload = response.json()
+        self.assertEqual(payload["status"], ExportJob.STATUS_DONE)
+        self.assertEqual(
+            payload["download_url"], f"/pdf-actions/exports/{job.pk}/download/"
+        )
+
+        response = self.client.get(payload["download_url"])
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+        response.close()
+
+    def test_download_not_ready_is_404(self):
+        job = self.enqueue(user=self.user)
+
+        response = self.client.get(f"/pdf-actions/exports/{job.pk}/download/")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_other_staff_user_cannot_see_job(self):
+        job = self.enqueue(user=self.user)
+        other = User.objects.create_user(
+            username="staff", password="staff123", is_staff=True
+        )
+        self.client.force_login(other)
+
+        response = self.client.get(f"/pdf-actions/exports/{job.pk}/")
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,205 @@
+"""Tests for export metrics."""
+
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.admin.sites import AdminSite
+from django.test import RequestFactory, TestCase, override_settings
+
+from django_pdf_actions.actions.pdf_response import build_pdf_export_response
+from django_pdf_actions.metrics import (
+    MetricsStore,
+    collect,
+    metrics_store,
+    record_export_finished,
+    record_export_started,
+    render_text,
+)
+from django_pdf_actions.models import ExportPDFSettings
+from django_pdf_actions.signals import export_finished
+from django_pdf_actions.telemetry import ExportTelemetry
+from django_pdf_actions.views import export_metrics
+
+from .utils import SettingsAdmin
+
+
+class MetricsTestMixin:
+    def setUp(self):
+        super().setUp()
+        metrics_store().clear()
+        self.addCleanup(metrics_store().clear)
+        self.modeladmin = SettingsAdmin(ExportPDFSettings, AdminSite())
+
+
+class MetricsStoreTest(MetricsTestMixin, TestCase):
+    """Test cases for MetricsStore and the text format."""
+
+    def test_render_text(self):
+        record_export_started(self.modeladmin, landscape=True)
+        record_export_finished(
+            self.modeladmin,
+            landscape=True,
+            seconds=0.3,
+            rows=25,
+            pages=2,
+            size=4096,
+        )
+
+        text = render_text(metrics_store())
+
+        labels = 'model="django_pdf_actions.exportpdfsettings",orientation="landscape"'
+        self.assertIn("# TYPE pdf_export_started_total counter", text)
+        self.assertIn(f"pdf_export_started_total{{{labels}}} 1\n", text)
+        self.assertIn(f"pdf_export_rows_total{{{labels}}} 25\n", text)
+        self.assertIn(f"pdf_export_pages_total{{{labels}}} 2\n", text)
+        self.assertIn(f"pdf_export_bytes_total{{{labels}}} 4096\n", text)
+        self.assertIn("# TYPE pdf_export_duration_seconds histogram", text)
+        self.assertIn(
+            f'pdf_export_duration_seconds_bucket{{{labels},le="0.25"}} 0\n', text
+        )
+        self.assertIn(
+            f'pdf_export_duration_seconds_bucket{{{labels},le="0.5"}} 1\n', text
+        )
+        self.assertIn(
+            f'pdf_export_duration_seconds_bucket{{{labels},le="+Inf"}} 1\n', text
+        )
+        self.assertIn(f"pdf_export_duration_seconds_sum{{{labels}}} 0.3\n", text)
+        self.assertIn(f"pdf_export_duration_seconds_count{{{labels}}} 1\n", text)
+
+    def test_escapes_label_values(self):
+        store = MetricsStore()
+        store.inc("pdf_export_started_total", {"model": 'a"b\\c'})
+
+        self.assertIn('{model="a\\"b\\\\c"} 1', render_text(store))
+
+    def test_merge(self):
+        first, second = MetricsStore(), MetricsStore()
+        for store, seconds in ((first, 1.5), (second, 100.0)):
+            store.inc("pdf_export_rows_total", {"model": "m"}, 10)
+            store.observe("pdf_export_duration_seconds", {"model": "m"}, seconds)
+
+        combined = MetricsStore()
+        combined.merge(json.loads(json.dumps(first.snapshot())))
+        combined.merge(json.loads(json.dumps(second.snapshot())))
+
+        key = (("model", "m"),)
+        self.assertEqual(combined.counters[("pdf_export_rows_total", key)], 20)
+        buckets, total, count = combined.histograms[
+            ("pdf_export_duration_seconds", key)
+        ]
+        self.assertEqual(sum(buckets), 2)
+        self.assertEqual(total, 101.5)
+        self.assertEqual(count, 2)
+
+    def test_file_backed_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            other = MetricsStore()
+            other.inc(
+                "pdf_export_started_total",
+                {
+                    "model": "django_pdf_actions.exportpdfsettings",
+                    "orientation": "portrait",
+                },
+                3,
+            )
+            # Another worker process's file.
+            with open(os.path.join(directory, "pdf-metrics-1.json"), "w") as fh:
+                json.dump(other.snapshot(), fh)
+            with open(os.path.join(directory, "pdf-metrics-2.json"), "w") as fh:
+                fh.write("{broken")
+
+            with override_settings(PDF_ACTIONS_METRICS_DIR=directory):
+                telemetry = ExportTelemetry(metrics=True, publish=False)
+                telemetry.export_started(self.modeladmin, landscape=False)
+                telemetry.report(self.modeladmin, landscape=False)
+                self.assertTrue(
+                    os.path.exists(
+                        os.path.join(directory, f"pdf-metrics-{os.getpid()}.json")
+                    )
+                )
+                with self.assertLogs("django_pdf_actions.metrics", "WARNING"):
+                    combined = collect()
+
+        key = (
+            "pdf_export_started_total",
+            (
+                ("model", "django_pdf_actions.exportpdfsettings"),
+                ("orientation", "portrait"),
+            ),
+        )
+        self.assertEqual(combined.counters[key], 4)
+
+
+class ExportMetricsTest(MetricsTestMixin, TestCase):
+    """Test cases for the metrics recorded by exports and the metrics view."""
+
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            ExportPDFSettings.objects.create(title=f"Settings {i}")
+
+    def export(self, landscape=True):
+        return build_pdf_export_response(
+            self.modeladmin, ExportPDFSettings.objects.all(), landscape=landscape
+        )
+
+    def test_disabled_by_default(self):
+        self.export()
+
+        self.assertEqual(metrics_store().counters, {})
+
+    @override_settings(PDF_ACTIONS_METRICS=True)
+    def test_records_exports(self):
+        signals = []
+
+        def receiver(**kwargs):
+            signals.append(kwargs)
+
+        export_finished.connect(receiver)
+        self.addCleanup(export_finished.disconnect, receiver)
+
+        response = self.export()
+        self.export(landscape=False)
+
+        counters = metrics_store().counters
+        landscape = (
+            ("model", "django_pdf_actions.exportpdfsettings"),
+            ("orientation", "landscape"),
+        )
+        self.assertEqual(counters[("pdf_export_started_total", landscape)], 1)
+        self.assertEqual(counters[("pdf_export_finished_total", landscape)], 1)
+        self.assertEqual(counters[("pdf_export_rows_total", landscape)], 3)
+        self.assertEqual(counters[("pdf_export_pages_total", landscape)], 1)
+        self.assertEqual(
+            counters[("pdf_export_bytes_total", landscape)], len(response.content)
+        )
+        self.assertEqual(len(metrics_store().histograms), 2)
+        # Metrics alone do not publish the telemetry.
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(signals, [])
+
+    def test_writes_metrics_file_once_per_export(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            PDF_ACTIONS_METRICS=True, PDF_ACTIONS_METRICS_DIR=directory
+        ), patch.object(MetricsStore, "write") as mock_write:
+            self.export()
+
+        mock_write.assert_called_once_with(directory)
+
+    @override_settings(PDF_ACTIONS_METRICS=True)
+    def test_view(self):
+        self.export()
+
+        response = export_metrics(RequestFactory().get("/metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            response["Content-Type"].startswith("text/plain; version=0.0.4")
+        )
+        self.assertIn(
+            b'pdf_export_finished_total{model="django_pdf_actions.exportpdfsettings",'
+            b'orientation="landscape"} 1\n',
+            response.content,
+        )
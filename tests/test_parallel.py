@@ -0,0 +1,132 @@
+"""Tests for parallel rendering of page ranges."""
+
+import sys
+from io import BytesIO
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.admin.sites import AdminSite
+from django.test import TestCase
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph
+
+from django_pdf_actions.actions.export_settings import ExportSettings
+from django_pdf_actions.actions.parallel import (
+    pack_rows,
+    page_ranges,
+    render_pool,
+    shutdown_render_pool,
+    unpack_rows,
+)
+from django_pdf_actions.actions.pdf_response import write_pdf_export
+
+from .utils import MockModel, MockModelAdmin, MockQuerySet
+
+try:
+    import pypdf
+except ImportError:  # pragma: no cover - optional dependency
+    pypdf = None
+
+
+class PageRangesTest(TestCase):
+    """Test cases for page_ranges."""
+
+    def test_splits_pages_between_workers(self):
+        self.assertEqual(
+            page_ranges(10, 3, min_pages=1),
+            [range(0, 4), range(4, 8), range(8, 10)],
+        )
+
+    def test_ranges_hold_at_least_min_pages(self):
+        self.assertEqual(
+            page_ranges(120, 8, min_pages=50),
+            [range(0, 50), range(50, 100), range(100, 120)],
+        )
+
+    def test_small_export_is_one_range(self):
+        self.assertEqual(page_ranges(30, 4), [range(0, 30)])
+
+
+class PackRowsTest(TestCase):
+    """Test cases for pack_rows and unpack_rows."""
+
+    def test_paragraphs_travel_as_text_and_shared_style(self):
+        style = getSampleStyleSheet()["Normal"]
+        rows = [[Paragraph("Name", style), 3], [Paragraph("<b>User</b>", style), 4]]
+
+        packed, styles = pack_rows(rows)
+
+        self.assertEqual(packed, [[("Name", 0), 3], [("<b>User</b>", 0), 4]])
+        self.assertEqual(styles, [style])
+        rebuilt = unpack_rows(packed, styles)
+        self.assertIsInstance(rebuilt[1][0], Paragraph)
+        self.assertEqual(rebuilt[1][0].text, "<b>User</b>")
+        self.assertEqual(rebuilt[1][1], 4)
+
+
+class ParallelExportTest(TestCase):
+    """write_pdf_export with parallel_workers enabled."""
+
+    def setUp(self):
+        self.modeladmin = MockModelAdmin(MockModel, AdminSite())
+        self.queryset = MockQuerySet(
+            [
+                MockModel(id=i, name=f"User {i}", email=f"user{i}@example.com")
+                for i in range(1, 8)
+            ]
+        )
+        self.pdf_settings = ExportSettings(items_per_page=2, parallel_workers=2)
+        self.addCleanup(shutdown_render_pool)
+
+    def export(self):
+        output = BytesIO()
+        with patch("django_pdf_actions.actions.parallel.PARALLEL_CHUNK_PAGES", 1):
+            write_pdf_export(
+                self.modeladmin,
+                self.queryset,
+                output,
+                landscape=True,
+                pdf_settings=self.pdf_settings,
+            )
+        return output.getvalue()
+
+    @skipUnless(pypdf, "pypdf is not installed")
+    def test_parts_are_merged_with_global_page_numbers(self):
+        reader = pypdf.PdfReader(BytesIO(self.export()))
+
+        self.assertEqual(len(reader.pages), 4)
+        texts = [page.extract_text() for page in reader.pages]
+        self.assertIn("Page 1 of 4", texts[0])
+        self.assertIn("Page 3 of 4", texts[2])
+        self.assertIn("User 5", texts[2])
+        self.assertIn("User 7", texts[3])
+
+    def test_pool_is_reused_between_exports(self):
+        with patch(
+            "django_pdf_actions.actions.parallel.ProcessPoolExecutor"
+        ) as mock_executor:
+            self.assertIs(render_pool(2), render_pool(2))
+            render_pool(3)
+
+        self.assertEqual(mock_executor.call_count, 2)
+        mock_executor.return_value.shutdown.assert_called_once_with(wait=False)
+
+    def test_without_pypdf_renders_in_process(self):
+        with patch.dict(sys.modules, {"pypdf": None}), patch(
+            "django_pdf_actions.actions.parallel.ProcessPoolExecutor"
+        ) as mock_executor, self.assertLogs(
+            "django_pdf_actions.actions.parallel", "WARNING"
+        ):
+            content = self.export()
+
+        self.assertTrue(content.startswith(b"%PDF"))
+        mock_executor.assert_not_called()
+
+    def test_worker_failure_renders_in_process(self):
+        with patch(
+            "django_pdf_actions.actions.parallel.ProcessPoolExecutor",
+            side_effect=OSError("no processes"),
+        ), self.assertLogs("django_pdf_actions.actions.parallel", "ERROR"):
+            content = self.export()
+
+        self.assertTrue(content.startswith(b"%PDF"))
@@ -0,0 +1,207 @@
+"""Tests for queryset helpers used by PDF exports."""
+
+from unittest.mock import patch
+
+from django.contrib.admin import ModelAdmin
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from django_pdf_actions.actions.queries import (
+    QueryPlan,
+    apply_query_plan,
+    build_query_plan,
+    iterate_chunks,
+    iterate_queryset,
+)
+from django_pdf_actions.actions.utils import reshape_to_arabic
+from django_pdf_actions.models import ExportJob, ExportPDFSettings
+
+from .utils import (
+    MockModel,
+    MockOrder,
+    MockOrderAdmin,
+    MockQuerySet,
+    MockShipment,
+    MockTablesMixin,
+)
+
+
+class IterateQuerysetTest(TestCase):
+    """Test cases for iterate_queryset."""
+
+    def setUp(self):
+        for i in range(5):
+            ExportPDFSettings.objects.create(title=f"Settings {i}")
+
+    def test_does_not_fill_result_cache(self):
+        queryset = ExportPDFSettings.objects.order_by("pk")
+
+        titles = [obj.title for obj in iterate_queryset(queryset, chunk_size=2)]
+
+        self.assertEqual(titles, [f"Settings {i}" for i in range(5)])
+        self.assertIsNone(queryset._result_cache)
+
+    def test_uses_result_cache_when_evaluated(self):
+        queryset = ExportPDFSettings.objects.all()
+        list(queryset)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(len(list(iterate_queryset(queryset))), 5)
+
+    def test_passes_chunk_size_to_iterator(self):
+        queryset = ExportPDFSettings.objects.all()
+        with patch.object(
+            type(queryset), "iterator", return_value=iter([])
+        ) as mock_iterator:
+            list(iterate_queryset(queryset, chunk_size=123))
+
+        mock_iterator.assert_called_once_with(chunk_size=123)
+
+    def test_iterate_chunks(self):
+        queryset = ExportPDFSettings.objects.order_by("pk")
+
+        chunks = list(iterate_chunks(queryset, chunk_size=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertIsNone(queryset._result_cache)
+
+    def test_prefetch_related_is_honoured(self):
+        user = User.objects.create_user(username="exporter")
+        for _ in range(3):
+            ExportJob.objects.create(model_label="auth.User", requested_by=user)
+        queryset = ExportJob.objects.prefetch_related("requested_by")
+
+        # One query for the jobs and one for the prefetched users.
+        with self.assertNumQueries(2):
+            names = [job.requested_by.username for job in iterate_queryset(queryset)]
+
+        self.assertEqual(names, ["exporter"] * 3)
+
+    def test_plain_iterables_are_iterated(self):
+        objects = [MockModel(id=1, name="a", email="a@example.com")]
+
+        self.assertEqual(list(iterate_queryset(MockQuerySet(objects))), objects)
+
+    def test_reshape_to_arabic_uses_chunk_size_setting(self):
+        pdf_settings = ExportPDFSettings(title="Chunked", query_chunk_size=100)
+        queryset = ExportPDFSettings.objects.order_by("pk")
+
+        with patch(
+            "django_pdf_actions.actions.utils.iterate_chunks",
+            wraps=iterate_chunks,
+        ) as mock_iterate:
+            data = reshape_to_arabic(
+                ["title"], "Helvetica", 10, queryset, 50, pdf_settings
+            )
+
+        mock_iterate.assert_called_once_with(queryset, 100)
+        self.assertEqual(len(data), 6)
+        self.assertIsNone(queryset._result_cache)
+
+
+class QueryPlanTest(TestCase):
+    """Test cases for build_query_plan / apply_query_plan."""
+
+    def test_foreign_key_columns_are_selected(self):
+        plan = build_query_plan(MockOrder, ["number", "customer"])
+
+        self.assertEqual(plan.select_related, ("customer",))
+        self.assertEqual(plan.prefetch_related, ())
+
+    def test_lookup_columns(self):
+        plan = build_query_plan(MockOrder, ["customer__name", "tags__name"])
+
+        self.assertEqual(plan.select_related, ("customer",))
+        self.assertEqual(plan.prefetch_related, ("tags",))
+
+    def test_admin_callables_and_plain_fields_are_ignored(self):
+        plan = build_query_plan(MockModel, ["id", "name", "some_admin_method"])
+
+        self.assertEqual(plan, QueryPlan())
+
+    def test_list_select_related_and_pdf_prefetch_related(self):
+        class OrderAdmin(ModelAdmin):
+            list_select_related = ("customer",)
+            pdf_prefetch_related = ("tags",)
+
+        modeladmin = OrderAdmin(MockOrder, AdminSite())
+        plan = build_query_plan(MockOrder, ["number", "customer"], modeladmin)
+
+        self.assertEqual(plan.select_related, ("customer",))
+        self.assertEqual(plan.prefetch_related, ("tags",))
+        self.assertFalse(plan.select_all)
+
+    def test_list_select_related_true(self):
+        class OrderAdmin(ModelAdmin):
+            list_select_related = True
+
+        plan = build_query_plan(
+            MockOrder, ["number"], OrderAdmin(MockOrder, AdminSite())
+        )
+
+        self.assertTrue(plan.select_all)
+
+    def test_apply_query_plan(self):
+        queryset = apply_query_plan(
+            MockOrder.objects.all(), QueryPlan(("customer",), ("tags",))
+        )
+
+        self.assertEqual(queryset.query.select_related, {"customer": {}})
+        self.assertEqual(queryset._prefetch_related_lookups, ("tags",))
+
+    def test_apply_query_plan_keeps_select_all_with_paths(self):
+        plan = QueryPlan(("carrier",), (), True)
+
+        for queryset in (
+            MockShipment.objects.all(),
+            MockShipment.objects.select_related(),
+        ):
+            with self.subTest(select_related=queryset.query.select_related):
+                queryset = apply_query_plan(queryset, plan)
+
+                self.assertEqual(
+                    queryset.query.select_related,
+                    {"carrier": {}, "order": {"customer": {}}},
+                )
+
+    def test_apply_query_plan_skips_deferred_querysets(self):
+        queryset = apply_query_plan(
+            MockOrder.objects.only("number"), QueryPlan(("customer",))
+        )
+
+        self.assertFalse(queryset.query.select_related)
+
+    def test_apply_query_plan_leaves_plain_iterables(self):
+        queryset = MockQuerySet([])
+
+        self.assertIs(apply_query_plan(queryset, QueryPlan(("customer",))), queryset)
+
+
+class ReshapeToArabicQueryPlanTest(MockTablesMixin, TestCase):
+    """reshape_to_arabic runs a constant number of queries for related columns."""
+
+    def test_related_columns_do_not_query_per_row(self):
+        modeladmin = MockOrderAdmin(MockOrder, AdminSite())
+        for count in (5, 50):
+            with self.subTest(rows=count):
+                MockOrder.objects.all().delete()
+                self.create_orders(count)
+
+                # Orders joined with customers, plus one prefetch for the tags.
+                with self.assertNumQueries(2):
+                    data = reshape_to_arabic(
+                        list(modeladmin.list_display),
+                        "Helvetica",
+                        10,
+                        MockOrder.objects.all(),
+                        50,
+                        None,
+                        modeladmin,
+                    )
+
+                self.assertEqual(len(data), count + 1)
+                self.assertEqual(
+                    [cell.text for cell in data[1]],
+                    ["ORD-00000", "Customer 0", "priority"],
+                )
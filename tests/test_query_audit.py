@@ -0,0 +1,100 @@
+"""Tests for the export query audit (N+1 detection)."""
+
+from django.contrib.admin.sites import AdminSite
+from django.test import TestCase, override_settings
+
+from django_pdf_actions.actions import pdf_io_bound
+from django_pdf_actions.actions.pdf_response import build_pdf_export_response
+from django_pdf_actions.actions.query_audit import HEADER, QueryAudit
+from django_pdf_actions.actions.utils import reshape_to_arabic
+
+from .utils import MockOrder, MockOrderAdmin, MockTablesMixin
+
+
+class LazyOrderAdmin(MockOrderAdmin):
+    """Order admin whose callables query once per row."""
+
+    list_display = ("number", "customer_name", "tag_names", "tag_count")
+    pdf_prefetch_related = ()
+
+    def customer_name(self, obj):
+        return obj.customer.name
+
+    @pdf_io_bound
+    def tag_count(self, obj):
+        return obj.tags.count()
+
+
+class QueryAuditTest(MockTablesMixin, TestCase):
+    """Test cases for QueryAudit and the export debug mode."""
+
+    def setUp(self):
+        self.create_orders(5)
+
+    def audit(self, modeladmin, queryset=None):
+        audit = QueryAudit()
+        reshape_to_arabic(
+            list(modeladmin.list_display),
+            "Helvetica",
+            10,
+            MockOrder.objects.all() if queryset is None else queryset,
+            50,
+            None,
+            modeladmin,
+            query_audit=audit,
+        )
+        return audit
+
+    def test_reports_per_row_columns(self):
+        audit = self.audit(LazyOrderAdmin(MockOrder, AdminSite()))
+
+        offenders = {entry["column"]: entry for entry in audit.offenders()}
+        self.assertEqual(set(offenders), {"customer_name", "tag_names", "tag_count"})
+        customer = offenders["customer_name"]
+        self.assertEqual(customer["queries"], 5)
+        self.assertEqual(customer["rows"], 5)
+        self.assertTrue(customer["per_row"])
+        self.assertEqual(customer["select_related"], ["customer"])
+        self.assertEqual(customer["prefetch_related"], [])
+        self.assertEqual(offenders["tag_names"]["prefetch_related"], ["tags"])
+        # I/O-bound columns run in the audited thread.
+        self.assertEqual(offenders["tag_count"]["queries"], 5)
+
+    def test_related_column_suggests_its_lookup(self):
+        modeladmin = MockOrderAdmin(MockOrder, AdminSite())
+
+        # select_related() cannot traverse the deferred foreign key.
+        audit = self.audit(modeladmin, MockOrder.objects.only("number"))
+
+        (entry,) = [e for e in audit.offenders() if e["column"] == "customer"]
+        self.assertEqual(entry["select_related"], ["customer"])
+
+    def test_planned_export_has_no_offenders(self):
+        audit = self.audit(MockOrderAdmin(MockOrder, AdminSite()))
+
+        self.assertEqual(audit.offenders(), [])
+
+    def test_disabled_by_default(self):
+        response = build_pdf_export_response(
+            LazyOrderAdmin(MockOrder, AdminSite()),
+            MockOrder.objects.all(),
+            landscape=True,
+        )
+
+        self.assertNotIn(HEADER, response)
+
+    @override_settings(PDF_ACTIONS_DEBUG_QUERIES=True)
+    def test_header_and_log(self):
+        with self.assertLogs(
+            "django_pdf_actions.actions.query_audit", "WARNING"
+        ) as logs:
+            response = build_pdf_export_response(
+                LazyOrderAdmin(MockOrder, AdminSite()),
+                MockOrder.objects.all(),
+                landscape=True,
+            )
+
+        self.assertIn("customer_name=5 (select_related: customer)", response[HEADER])
+        self.assertIn("tag_names=5 (prefetch_related: tags)", response[HEADER])
+        self.assertEqual(len(logs.records), 3)
+        self.assertIn("'customer_name' ran 5 queries for 5 rows", logs.output[0])
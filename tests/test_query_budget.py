@@ -0,0 +1,126 @@
+"""Query-budget regression tests: exports run the same queries for 10 or 1,000 rows."""
+
+from unittest.mock import patch
+
+from django.contrib.admin.sites import AdminSite
+from django.test import RequestFactory, TestCase
+
+from django_pdf_actions.actions.pdf_response import build_pdf_export_response
+from django_pdf_actions.models import ExportPDFSettings
+from django_pdf_actions.settings_cache import clear_settings_cache
+
+from .utils import MockOrder, MockOrderAdmin, MockTablesMixin
+
+ROW_COUNTS = (10, 1000)
+
+# Active settings row, orders joined with their customers, tags prefetched.
+COLD_EXPORT_QUERIES = 3
+# The cached settings row costs no query, with a process-local or a shared cache.
+WARM_EXPORT_QUERIES = 2
+
+
+class CustomerCallableOrderAdmin(MockOrderAdmin):
+    """Order admin reading the foreign key through admin callables and a lookup."""
+
+    list_display = ("number", "customer_name", "customer__name", "tag_names")
+    list_select_related = ("customer",)
+
+    def customer_name(self, obj):
+        return obj.customer.name.upper()
+
+
+class ExportQueryBudgetTest(MockTablesMixin, TestCase):
+    """build_pdf_export_response stays within a query budget independent of row count.
+
+    With ten rows per page, 1,000 rows span 100 pages, so per-page settings queries and
+    per-row foreign-key or many-to-many fetches would all exceed the budget.
+    """
+
+    def setUp(self):
+        self.settings_row = self.create_settings()
+
+    def create_settings(self, **options):
+        """Replace the active settings row with a fresh one using *options*."""
+        ExportPDFSettings.objects.all().delete()
+        return ExportPDFSettings.objects.create(
+            title="Budget", active=True, items_per_page=10, **options
+        )
+
+    def assertExportQueries(self, modeladmin, expected, cold=True):
+        for count in ROW_COUNTS:
+            with self.subTest(rows=count):
+                MockOrder.objects.all().delete()
+                self.create_orders(count)
+                if cold:
+                    clear_settings_cache()
+                else:
+                    self.export(modeladmin)
+
+                with self.assertNumQueries(expected):
+                    response = self.export(modeladmin)
+
+                self.assertEqual(response.status_code, 200)
+
+    def export(self, modeladmin):
+        response = build_pdf_export_response(
+            modeladmin, MockOrder.objects.all(), landscape=True
+        )
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response
+
+    def test_foreign_key_and_many_to_many_columns(self):
+        self.assertExportQueries(
+            MockOrderAdmin(MockOrder, AdminSite()), COLD_EXPORT_QUERIES
+        )
+
+    def test_cached_settings(self):
+        self.assertExportQueries(
+            MockOrderAdmin(MockOrder, AdminSite()), WARM_EXPORT_QUERIES, cold=False
+        )
+
+    def test_cached_settings_with_shared_cache(self):
+        with patch("django_pdf_actions.settings_cache.shared_cache", return_value=True):
+            self.assertExportQueries(
+                MockOrderAdmin(MockOrder, AdminSite()),
+                WARM_EXPORT_QUERIES,
+                cold=False,
+            )
+
+    def test_admin_callables_over_foreign_key(self):
+        self.assertExportQueries(
+            CustomerCallableOrderAdmin(MockOrder, AdminSite()), COLD_EXPORT_QUERIES
+        )
+
+    def test_renderers_and_streaming(self):
+        modeladmin = MockOrderAdmin(MockOrder, AdminSite())
+        for options in (
+            {"renderer": "canvas"},
+            {"plain_text_cells": True},
+            {"stream_response": True},
+        ):
+            with self.subTest(**options):
+                # A fresh row per subtest, so options do not carry over.
+                self.settings_row = self.create_settings(**options)
+
+                self.assertExportQueries(modeladmin, COLD_EXPORT_QUERIES)
+
+    def test_size_limit_adds_one_count(self):
+        self.settings_row.max_inline_cells = 1_000_000
+        self.settings_row.save()
+
+        modeladmin = MockOrderAdmin(MockOrder, AdminSite())
+        for count in ROW_COUNTS:
+            with self.subTest(rows=count):
+                MockOrder.objects.all().delete()
+                self.create_orders(count)
+                clear_settings_cache()
+
+                # route_export sizes the export with queryset.count().
+                with self.assertNumQueries(COLD_EXPORT_QUERIES + 1):
+                    build_pdf_export_response(
+                        modeladmin,
+                        MockOrder.objects.all(),
+                        landscape=True,
+                        request=RequestFactory().get("/"),
+                    )
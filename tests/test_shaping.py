@@ -0,0 +1,65 @@
+"""Tests for right-to-left text shaping."""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from django_pdf_actions.actions.shaping import has_rtl, shape_columns, shape_rtl
+
+
+class ShapeRtlTest(SimpleTestCase):
+    """Test cases for shape_rtl and shape_columns."""
+
+    def test_has_rtl(self):
+        self.assertTrue(has_rtl("مرحبا"))
+        self.assertTrue(has_rtl("שלום"))
+        self.assertTrue(has_rtl("Order مرحبا 12"))
+        self.assertFalse(has_rtl("2024-01-31"))
+        self.assertFalse(has_rtl("SKU-00042"))
+        self.assertFalse(has_rtl(""))
+
+    def test_left_to_right_text_is_not_shaped(self):
+        with patch("django_pdf_actions.actions.shaping.arabic_reshaper") as mock_arabic:
+            with patch(
+                "django_pdf_actions.actions.shaping.get_display"
+            ) as mock_display:
+                self.assertEqual(shape_rtl("12,345.00"), "12,345.00")
+                self.assertEqual(shape_rtl(""), "")
+
+        mock_arabic.reshape.assert_not_called()
+        mock_display.assert_not_called()
+
+    def test_arabic_text_is_reshaped_and_reordered(self):
+        shaped = shape_rtl("مرحبا")
+
+        self.assertNotEqual(shaped, "مرحبا")
+        # Presentation forms, in visual (reversed) order.
+        self.assertTrue(all("\ufe70" <= char <= "\ufefc" for char in shaped))
+
+    def test_shaped_text_is_cached(self):
+        with patch(
+            "django_pdf_actions.actions.shaping.get_display",
+            side_effect=lambda text: text,
+        ) as mock_display:
+            first = shape_rtl("مرحبا")
+            second = shape_rtl("مرحبا")
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_display.call_count, 1)
+
+    def test_shape_columns_shapes_each_distinct_value_once(self):
+        rows = [["نشط", "1"], ["نشط", "2"], ["معلق", "3"], ["نشط", "4"]]
+
+        with patch(
+            "django_pdf_actions.actions.shaping.shape_rtl", side_effect=str.upper
+        ) as mock_shape:
+            shaped = shape_columns(rows)
+
+        self.assertEqual(len(shaped), 4)
+        self.assertEqual([row[1] for row in shaped], ["1", "2", "3", "4"])
+        self.assertEqual(shaped[0][0], shaped[1][0])
+        # Two distinct labels in the first column plus four ids in the second.
+        self.assertEqual(mock_shape.call_count, 6)
+
+    def test_shape_columns_empty(self):
+        self.assertEqual(shape_columns([]), [])
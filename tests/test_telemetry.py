@@ -0,0 +1,237 @@
+"""Tests for export telemetry."""
+
+import gc
+import os
+import tracemalloc
+from unittest import skipIf, skipUnless
+
+import django
+from django.contrib.admin.sites import AdminSite
+from django.test import TestCase, override_settings
+
+from django_pdf_actions.actions.pdf_response import (
+    abuild_pdf_export_response,
+    build_pdf_export_response,
+)
+from django_pdf_actions.models import ExportPDFSettings
+from django_pdf_actions.signals import export_finished
+from django_pdf_actions.telemetry import ExportTelemetry
+
+from .utils import SettingsAdmin
+
+
+class ExportTelemetryTest(TestCase):
+    """Test cases for ExportTelemetry."""
+
+    def test_disabled_records_nothing(self):
+        telemetry = ExportTelemetry(enabled=False)
+
+        with telemetry.stage("rows"):
+            pass
+        telemetry.count(rows=3)
+
+        self.assertEqual(telemetry.stages, {})
+        self.assertEqual(telemetry.counters, {})
+
+    def test_stages_add_up(self):
+        telemetry = ExportTelemetry()
+
+        with telemetry.stage("layout"):
+            pass
+        first = telemetry.stages["layout"]
+        with telemetry.stage("layout"):
+            pass
+
+        self.assertGreater(telemetry.stages["layout"], first)
+
+    def test_server_timing(self):
+        telemetry = ExportTelemetry()
+        telemetry.stages = {"settings": 0.0012, "rows": 0.25}
+
+        header = telemetry.server_timing()
+
+        self.assertTrue(
+            header.startswith("settings;dur=1.2, rows;dur=250.0, total;dur=")
+        )
+
+    def test_start_follows_setting(self):
+        self.assertFalse(ExportTelemetry.start().enabled)
+        with override_settings(PDF_ACTIONS_TELEMETRY=True):
+            self.assertTrue(ExportTelemetry.start().enabled)
+
+    def test_memory_tracking_follows_setting(self):
+        with override_settings(PDF_ACTIONS_TELEMETRY_MEMORY=True):
+            self.assertFalse(ExportTelemetry.start().memory)
+        with override_settings(
+            PDF_ACTIONS_TELEMETRY=True, PDF_ACTIONS_TELEMETRY_MEMORY=True
+        ):
+            self.assertTrue(ExportTelemetry.start().memory)
+
+    def test_memory_peaks(self):
+        telemetry = ExportTelemetry(memory=True)
+
+        with telemetry.stage("rows"):
+            rows = [bytearray(1024) for _ in range(100)]
+            del rows
+        self.assertTrue(tracemalloc.is_tracing())
+        with telemetry.stage("widths"):
+            pass
+        telemetry.count(rows=100)
+        telemetry.close()
+
+        self.assertFalse(tracemalloc.is_tracing())
+        payload = telemetry.as_dict()
+        self.assertGreaterEqual(payload["stages_peak_bytes"]["rows"], 100 * 1024)
+        self.assertLess(payload["stages_peak_bytes"]["widths"], 100 * 1024)
+        self.assertEqual(
+            payload["peak_memory_bytes"], payload["stages_peak_bytes"]["rows"]
+        )
+        self.assertGreaterEqual(payload["bytes_per_row"], 1024)
+
+    @skipUnless(os.path.exists("/proc/self/statm"), "needs /proc/self/statm")
+    def test_rss_per_stage(self):
+        telemetry = ExportTelemetry(memory=True)
+
+        with telemetry.stage("rows"):
+            pass
+        telemetry.close()
+
+        payload = telemetry.as_dict()
+        self.assertIn("rows", payload["stages_rss_bytes"])
+        self.assertGreater(payload["rss_bytes"], 0)
+
+    @skipUnless(hasattr(tracemalloc, "reset_peak"), "needs Python 3.9+")
+    def test_concurrent_stage_keeps_peak(self):
+        first = ExportTelemetry(memory=True)
+        second = ExportTelemetry(memory=True)
+
+        with first.stage("rows"):
+            rows = [bytearray(1024) for _ in range(100)]
+            del rows
+            # Resets tracemalloc's peak while the first stage is still measuring.
+            with second.stage("widths"):
+                pass
+        first.close()
+        second.close()
+
+        self.assertGreaterEqual(first.memory_peaks["rows"], 100 * 1024)
+        self.assertLess(second.memory_peaks["widths"], 100 * 1024)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_memory_tracking_keeps_running_tracer(self):
+        tracemalloc.start()
+        try:
+            telemetry = ExportTelemetry(memory=True)
+            with telemetry.stage("rows"):
+                pass
+            telemetry.close()
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+    def test_memory_tracking_stops_when_discarded(self):
+        telemetry = ExportTelemetry(memory=True)
+
+        with self.assertRaises(ValueError):
+            with telemetry.stage("rows"):
+                raise ValueError
+
+        self.assertIn("rows", telemetry.memory_peaks)
+        del telemetry
+        gc.collect()
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_no_memory_keys_without_tracking(self):
+        self.assertNotIn("peak_memory_bytes", ExportTelemetry().as_dict())
+
+
+class ExportTelemetryReportTest(TestCase):
+    """Test cases for the telemetry reported by export responses."""
+
+    def setUp(self):
+        for i in range(3):
+            ExportPDFSettings.objects.create(title=f"Settings {i}")
+        self.modeladmin = SettingsAdmin(ExportPDFSettings, AdminSite())
+        self.payloads = []
+        export_finished.connect(self.receiver)
+        self.addCleanup(export_finished.disconnect, self.receiver)
+
+    def receiver(self, sender, **kwargs):
+        self.payloads.append((sender, kwargs))
+
+    def test_disabled_by_default(self):
+        response = build_pdf_export_response(
+            self.modeladmin, ExportPDFSettings.objects.all(), landscape=True
+        )
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(self.payloads, [])
+
+    @override_settings(PDF_ACTIONS_TELEMETRY=True)
+    def test_reports_stages(self):
+        with self.assertLogs("django_pdf_actions.telemetry", "INFO") as logs:
+            response = build_pdf_export_response(
+                self.modeladmin, ExportPDFSettings.objects.all(), landscape=True
+            )
+
+        header = response["Server-Timing"]
+        for stage in ("settings", "font", "rows", "widths", "layout", "save", "total"):
+            self.assertIn(f"{stage};dur=", header)
+
+        ((sender, kwargs),) = self.payloads
+        self.assertIs(sender, ExportPDFSettings)
+        self.assertIs(kwargs["modeladmin"], self.modeladmin)
+        self.assertTrue(kwargs["landscape"])
+        telemetry = kwargs["telemetry"]
+        self.assertEqual(telemetry["rows"], 3)
+        self.assertEqual(telemetry["pages"], 1)
+        self.assertEqual(telemetry["bytes"], len(response.content))
+        self.assertIn("layout", telemetry["stages_ms"])
+
+        record = logs.records[0]
+        self.assertEqual(
+            record.pdf_export["model"], "django_pdf_actions.ExportPDFSettings"
+        )
+        self.assertEqual(record.pdf_export["rows"], 3)
+
+    @override_settings(PDF_ACTIONS_TELEMETRY=True, PDF_ACTIONS_TELEMETRY_MEMORY=True)
+    def test_reports_memory(self):
+        with self.assertLogs("django_pdf_actions.telemetry", "INFO") as logs:
+            build_pdf_export_response(
+                self.modeladmin, ExportPDFSettings.objects.all(), landscape=True
+            )
+
+        telemetry = self.payloads[0][1]["telemetry"]
+        self.assertEqual(
+            set(telemetry["stages_peak_bytes"]),
+            {"settings", "font", "rows", "widths", "layout", "save"},
+        )
+        self.assertGreater(telemetry["peak_memory_bytes"], 0)
+        self.assertIn("bytes_per_row", telemetry)
+        self.assertIn("MiB allocated", logs.output[0])
+        self.assertFalse(tracemalloc.is_tracing())
+
+    @override_settings(PDF_ACTIONS_TELEMETRY=True)
+    def test_reports_streamed_size(self):
+        ExportPDFSettings.objects.filter(title="Settings 0").update(
+            active=True, stream_response=True
+        )
+
+        response = build_pdf_export_response(
+            self.modeladmin, ExportPDFSettings.objects.all(), landscape=False
+        )
+
+        content = b"".join(response.streaming_content)
+        self.assertIn("Server-Timing", response)
+        self.assertEqual(self.payloads[0][1]["telemetry"]["bytes"], len(content))
+
+    @skipIf(django.VERSION < (4, 2), "async streaming responses need Django 4.2")
+    @override_settings(PDF_ACTIONS_TELEMETRY=True)
+    async def test_async_export(self):
+        response = await abuild_pdf_export_response(
+            self.modeladmin, ExportPDFSettings.objects.all(), landscape=True
+        )
+
+        self.assertIn("rows;dur=", response["Server-Timing"])
+        self.assertIn("layout;dur=", response["Server-Timing"])
+        self.assertEqual(self.payloads[0][1]["telemetry"]["rows"], 3)
@@ -2,17 +2,25 @@
 
 import hashlib
 import os
+from io import BytesIO
 from unittest.mock import MagicMock, patch
 
+from django.db import IntegrityError, transaction
 from django.test import TestCase
+from django.utils import timezone
+from PIL import Image as PILImage
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A1, A2, A3, A4
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.platypus import TableStyle
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import Paragraph, TableStyle
 
 from django_pdf_actions.actions.utils import (
+    LOGO_FORM_NAME,
     PAGE_SIZE_MAP,
     calculate_column_widths,
+    cell_text,
     create_header_style,
     create_table_style,
     draw_exported_at,
@@ -24,6 +32,7 @@ from django_pdf_actions.actions.utils import (
     get_page_size,
     hex_to_rgb,
     setup_font,
+    text_width,
 )
 from django_pdf_actions.models import ExportPDFSettings
 
@@ -370,11 +379,60 @@ class PDFUtilsTest(TestCase):
         for width in widths:
             self.assertGreaterEqual(width, min_width)
 
-    @patch("django_pdf_actions.actions.utils.get_active_settings")
-    def test_draw_model_name(self, mock_get_settings):
-        """Test drawing model name."""
-        mock_get_settings.return_value = self.settings
+    def test_calculate_column_widths_uses_font_metrics(self):
+        """Columns are sized by glyph widths, not character counts."""
+        data = [["A", "B"], ["WWWWWWWW", "iiiiiiii"]]
+        widths = calculate_column_widths(data, 500, "Helvetica", 10)
+
+        self.assertGreater(widths[0], widths[1] * 2)
+
+    def test_calculate_column_widths_measures_paragraph_text(self):
+        """Paragraph cells are measured by their text, not their repr."""
+        style = getSampleStyleSheet()["Normal"]
+        plain = [["A", "B"], ["short", "a much longer value"]]
+        paragraphs = [
+            ["A", "B"],
+            [Paragraph("short", style), Paragraph("a much longer<br/>value", style)],
+        ]
+
+        plain_widths = calculate_column_widths(plain, 500, "Helvetica", 10)
+        paragraph_widths = calculate_column_widths(paragraphs, 500, "Helvetica", 10)
+
+        self.assertLess(paragraph_widths[1], plain_widths[1])
+        self.assertEqual(cell_text(Paragraph("<b>R&amp;D</b><br/>x", style)), "R&D\nx")
+
+    def test_calculate_column_widths_padding(self):
+        """Padding is added to every measured column before normalising."""
+        data = [["A", "B"], ["x", "a much longer value"]]
+        widths = calculate_column_widths(data, 500, "Helvetica", 10)
+        padded = calculate_column_widths(data, 500, "Helvetica", 10, padding=100)
+
+        self.assertGreater(padded[0], widths[0])
+
+    def test_calculate_column_widths_samples_large_exports(self):
+        """Only a bounded, deterministic sample of body rows is measured."""
+        data = [["Header"]] + [[str(i)] for i in range(5000)]
 
+        with patch(
+            "django_pdf_actions.actions.utils.text_width", return_value=1.0
+        ) as mock_width:
+            first = calculate_column_widths(data, 500, "Helvetica", 10, sample_size=50)
+        self.assertEqual(mock_width.call_count, 51)
+
+        second = calculate_column_widths(data, 500, "Helvetica", 10, sample_size=50)
+        third = calculate_column_widths(data, 500, "Helvetica", 10, sample_size=50)
+        self.assertEqual(second, third)
+        self.assertEqual(len(first), 1)
+
+    def test_text_width_matches_string_width(self):
+        """Cached glyph widths add up to ReportLab's string width."""
+        self.assertAlmostEqual(
+            text_width("Hello, World", "Helvetica", 9),
+            pdfmetrics.stringWidth("Hello, World", "Helvetica", 9),
+        )
+
+    def test_draw_model_name(self):
+        """Test drawing model name."""
         # Create mock canvas
         mock_canvas = MagicMock()
         mock_canvas.stringWidth.return_value = 100
@@ -385,17 +443,24 @@ class PDFUtilsTest(TestCase):
         mock_modeladmin = MagicMock()
         mock_modeladmin.model = mock_model
 
-        draw_model_name(mock_canvas, mock_modeladmin, "Helvetica", 12, 600, 800, 50)
+        draw_model_name(
+            mock_canvas,
+            mock_modeladmin,
+            "Helvetica",
+            12,
+            600,
+            800,
+            50,
+            pdf_settings=self.settings,
+        )
 
         mock_canvas.setFont.assert_called_with("Helvetica", 12)
         mock_canvas.stringWidth.assert_called_once()
         mock_canvas.drawCentredString.assert_called_once()
 
-    @patch("django_pdf_actions.actions.utils.get_active_settings")
-    def test_draw_model_name_with_rtl(self, mock_get_settings):
+    def test_draw_model_name_with_rtl(self):
         """Test drawing model name with RTL support."""
         self.settings.rtl_support = True
-        mock_get_settings.return_value = self.settings
 
         # Create mock canvas
         mock_canvas = MagicMock()
@@ -403,109 +468,171 @@ class PDFUtilsTest(TestCase):
 
         # Create mock model admin
         mock_model = MagicMock()
-        mock_model._meta.verbose_name_plural = "Test Models"
+        mock_model._meta.verbose_name_plural = "نماذج"
         mock_modeladmin = MagicMock()
         mock_modeladmin.model = mock_model
 
-        with patch("django_pdf_actions.actions.utils.arabic_reshaper") as mock_arabic:
-            with patch("django_pdf_actions.actions.utils.get_display") as mock_display:
+        with patch("django_pdf_actions.actions.shaping.arabic_reshaper") as mock_arabic:
+            with patch(
+                "django_pdf_actions.actions.shaping.get_display"
+            ) as mock_display:
                 mock_arabic.reshape.return_value = "reshaped_text"
                 mock_display.return_value = "display_text"
 
                 draw_model_name(
-                    mock_canvas, mock_modeladmin, "Helvetica", 12, 600, 800, 50
+                    mock_canvas,
+                    mock_modeladmin,
+                    "Helvetica",
+                    12,
+                    600,
+                    800,
+                    50,
+                    pdf_settings=self.settings,
                 )
 
                 mock_arabic.reshape.assert_called_once()
                 mock_display.assert_called_once()
 
-    @patch("django_pdf_actions.actions.utils.get_active_settings")
-    def test_draw_exported_at(self, mock_get_settings):
+    def test_draw_exported_at(self):
         """Test drawing export timestamp."""
-        mock_get_settings.return_value = self.settings
-
         # Create mock canvas
         mock_canvas = MagicMock()
         mock_canvas.stringWidth.return_value = 100
 
-        draw_exported_at(mock_canvas, "Helvetica", 10, 600, 50)
+        draw_exported_at(
+            mock_canvas, "Helvetica", 10, 600, 50, pdf_settings=self.settings
+        )
 
         mock_canvas.setFont.assert_called_with("Helvetica", 10)
         mock_canvas.stringWidth.assert_called_once()
         mock_canvas.drawString.assert_called_once()
 
-    @patch("django_pdf_actions.actions.utils.get_active_settings")
-    def test_draw_exported_at_with_rtl(self, mock_get_settings):
-        """Test drawing export timestamp with RTL support."""
+    def test_draw_exported_at_with_rtl(self):
+        """Left-to-right footer text is not shaped, even with RTL support."""
         self.settings.rtl_support = True
-        mock_get_settings.return_value = self.settings
 
         # Create mock canvas
         mock_canvas = MagicMock()
         mock_canvas.stringWidth.return_value = 100
 
-        with patch("django_pdf_actions.actions.utils.arabic_reshaper") as mock_arabic:
-            with patch("django_pdf_actions.actions.utils.get_display") as mock_display:
+        with patch("django_pdf_actions.actions.shaping.arabic_reshaper") as mock_arabic:
+            with patch(
+                "django_pdf_actions.actions.shaping.get_display"
+            ) as mock_display:
                 mock_arabic.reshape.return_value = "reshaped_text"
                 mock_display.return_value = "display_text"
 
-                draw_exported_at(mock_canvas, "Helvetica", 10, 600, 50)
+                draw_exported_at(
+                    mock_canvas, "Helvetica", 10, 600, 50, pdf_settings=self.settings
+                )
 
-                mock_arabic.reshape.assert_called_once()
-                mock_display.assert_called_once()
+                mock_arabic.reshape.assert_not_called()
+                mock_display.assert_not_called()
 
-    @patch("django_pdf_actions.actions.utils.get_active_settings")
-    def test_draw_page_number(self, mock_get_settings):
+    def test_draw_page_number(self):
         """Test drawing page numbers."""
-        mock_get_settings.return_value = self.settings
-
         # Create mock canvas
         mock_canvas = MagicMock()
 
-        draw_page_number(mock_canvas, 0, 3, "Helvetica", 10, 600, 50)
+        draw_page_number(
+            mock_canvas, 0, 3, "Helvetica", 10, 600, 50, pdf_settings=self.settings
+        )
 
         mock_canvas.setFont.assert_called_with("Helvetica", 10)
         mock_canvas.drawCentredString.assert_called_once_with(300, 50, "Page 1 of 3")
 
-    @patch("django_pdf_actions.actions.utils.get_active_settings")
-    def test_draw_page_number_with_rtl(self, mock_get_settings):
-        """Test drawing page numbers with RTL support."""
+    def test_draw_page_number_with_rtl(self):
+        """Left-to-right page numbers skip shaping, even with RTL support."""
         self.settings.rtl_support = True
-        mock_get_settings.return_value = self.settings
 
         # Create mock canvas
         mock_canvas = MagicMock()
 
-        with patch("django_pdf_actions.actions.utils.arabic_reshaper") as mock_arabic:
-            with patch("django_pdf_actions.actions.utils.get_display") as mock_display:
+        with patch("django_pdf_actions.actions.shaping.arabic_reshaper") as mock_arabic:
+            with patch(
+                "django_pdf_actions.actions.shaping.get_display"
+            ) as mock_display:
                 mock_arabic.reshape.return_value = "reshaped_text"
                 mock_display.return_value = "display_text"
 
-                draw_page_number(mock_canvas, 0, 3, "Helvetica", 10, 600, 50)
+                draw_page_number(
+                    mock_canvas,
+                    0,
+                    3,
+                    "Helvetica",
+                    10,
+                    600,
+                    50,
+                    pdf_settings=self.settings,
+                )
 
-                mock_arabic.reshape.assert_called_once()
-                mock_display.assert_called_once()
+                mock_arabic.reshape.assert_not_called()
+                mock_display.assert_not_called()
                 mock_canvas.drawCentredString.assert_called_once_with(
-                    300, 50, "display_text"
+                    300, 50, "Page 1 of 3"
                 )
 
+    def test_draw_helpers_without_settings_make_no_query(self):
+        """Without settings the draw helpers use defaults instead of querying."""
+        mock_canvas = MagicMock()
+        mock_canvas.stringWidth.return_value = 100
+        mock_modeladmin = MagicMock()
+        mock_modeladmin.model._meta.verbose_name_plural = "Test Models"
+
+        with self.assertNumQueries(0):
+            draw_model_name(mock_canvas, mock_modeladmin, "Helvetica", 12, 600, 800, 50)
+            draw_exported_at(mock_canvas, "Helvetica", 10, 600, 50)
+            draw_page_number(mock_canvas, 0, 3, "Helvetica", 10, 600, 50)
+
+        mock_canvas.drawCentredString.assert_any_call(300, 750, "Test Models")
+
     @patch("os.path.isfile")
     def test_draw_logo_exists(self, mock_isfile):
         """Test drawing logo when file exists."""
         mock_isfile.return_value = True
 
         mock_canvas = MagicMock()
+        mock_canvas.hasForm.return_value = False
 
-        with patch("reportlab.platypus.Image") as mock_image:
-            mock_image_instance = MagicMock()
-            mock_image.return_value = mock_image_instance
+        draw_logo(mock_canvas, "/path/to/logo.png", 600, 800)
 
-            draw_logo(mock_canvas, "/path/to/logo.png", 600, 800)
+        mock_canvas.beginForm.assert_called_once_with(LOGO_FORM_NAME)
+        mock_canvas.drawImage.assert_called_once_with(
+            "/path/to/logo.png", 480, 730, width=100, height=50, mask="auto"
+        )
+        mock_canvas.endForm.assert_called_once()
+        mock_canvas.doForm.assert_called_once_with(LOGO_FORM_NAME)
 
-            mock_image.assert_called_once_with(
-                "/path/to/logo.png", width=100, height=50
-            )
-            mock_image_instance.drawOn.assert_called_once()
+    @patch("os.path.isfile")
+    def test_draw_logo_reuses_form(self, mock_isfile):
+        """Later pages only reference the logo form."""
+        mock_isfile.return_value = True
+
+        mock_canvas = MagicMock()
+        mock_canvas.hasForm.return_value = True
+
+        draw_logo(mock_canvas, "/path/to/logo.png", 600, 800)
+
+        mock_canvas.beginForm.assert_not_called()
+        mock_canvas.drawImage.assert_not_called()
+        mock_canvas.doForm.assert_called_once_with(LOGO_FORM_NAME)
+
+    def test_draw_logo_embeds_image_once(self):
+        """A multi-page document contains a single image XObject."""
+        from reportlab.pdfgen import canvas
+
+        buffer = BytesIO()
+        p = canvas.Canvas(buffer, pagesize=A4)
+        p.setPageCompression(0)
+        logo = ImageReader(PILImage.new("RGB", (4, 2), "red"))
+        for _page in range(3):
+            draw_logo(p, logo, *A4)
+            p.showPage()
+        p.save()
+
+        output = buffer.getvalue()
+        self.assertEqual(output.count(b"/Subtype /Image"), 1)
+        self.assertEqual(output.count(b"/FormXob.%s Do" % LOGO_FORM_NAME.encode()), 3)
 
     @patch("os.path.isfile")
     def test_draw_logo_not_exists(self, mock_isfile):
@@ -540,3 +667,84 @@ class PageSizeMapTest(TestCase):
         self.assertEqual(PAGE_SIZE_MAP["A3"], A3)
         self.assertEqual(PAGE_SIZE_MAP["A2"], A2)
         self.assertEqual(PAGE_SIZE_MAP["A1"], A1)
+
+
+class ActiveSettingsCacheTest(TestCase):
+    """``get_active_settings`` is cached until a settings row changes."""
+
+    def test_cached_lookup_with_shared_cache_makes_no_query(self):
+        settings_obj = ExportPDFSettings.objects.create(title="Cached", active=True)
+        with patch("django_pdf_actions.settings_cache.shared_cache", return_value=True):
+            self.assertEqual(get_active_settings(), settings_obj)
+
+            with self.assertNumQueries(0):
+                self.assertEqual(get_active_settings(), settings_obj)
+
+    def test_cached_lookup_with_local_cache_makes_no_query(self):
+        ExportPDFSettings.objects.create(title="Cached", active=True)
+        cached = get_active_settings()
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_active_settings(), cached)
+
+    def test_missing_settings_are_cached(self):
+        self.assertIsNone(get_active_settings())
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_active_settings())
+
+    def test_edit_from_another_process_is_seen_after_ttl(self):
+        settings_obj = ExportPDFSettings.objects.create(title="Cached", active=True)
+        get_active_settings()
+
+        # Another worker's save: no signal in this process.
+        ExportPDFSettings.objects.filter(pk=settings_obj.pk).update(
+            items_per_page=42, modified=timezone.now()
+        )
+
+        self.assertNotEqual(get_active_settings().items_per_page, 42)
+        with patch("django_pdf_actions.settings_cache.SNAPSHOT_TTL", 0):
+            self.assertEqual(get_active_settings().items_per_page, 42)
+
+    def test_snapshot_expires_with_shared_cache(self):
+        settings_obj = ExportPDFSettings.objects.create(title="Cached", active=True)
+        with patch("django_pdf_actions.settings_cache.shared_cache", return_value=True):
+            get_active_settings()
+            ExportPDFSettings.objects.filter(pk=settings_obj.pk).update(
+                items_per_page=42
+            )
+
+            with patch("django_pdf_actions.settings_cache.SNAPSHOT_TTL", 0):
+                self.assertEqual(get_active_settings().items_per_page, 42)
+
+    def test_save_invalidates(self):
+        settings_obj = ExportPDFSettings.objects.create(title="Cached", active=True)
+        get_active_settings()
+
+        settings_obj.items_per_page = 42
+        settings_obj.save()
+
+        self.assertEqual(get_active_settings().items_per_page, 42)
+
+    def test_activating_another_row_invalidates(self):
+        ExportPDFSettings.objects.create(title="First", active=True)
+        get_active_settings()
+
+        second = ExportPDFSettings.objects.create(title="Second", active=True)
+
+        self.assertEqual(get_active_settings(), second)
+
+    def test_delete_invalidates(self):
+        settings_obj = ExportPDFSettings.objects.create(title="Cached", active=True)
+        get_active_settings()
+
+        settings_obj.delete()
+
+        self.assertIsNone(get_active_settings())
+
+    def test_single_active_row_constraint(self):
+        ExportPDFSettings.objects.create(title="First", active=True)
+        second = ExportPDFSettings.objects.create(title="Second")
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ExportPDFSettings.objects.filter(pk=second.pk).update(active=True)
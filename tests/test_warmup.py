@@ -0,0 +1,96 @@
+"""Tests for the export warm-up and the caches it fills."""
+
+from unittest.mock import MagicMock, patch
+
+from django.apps import apps
+from django.test import TestCase, override_settings
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+
+from django_pdf_actions.actions.utils import get_logo_path, sample_style_sheet
+from django_pdf_actions.models import ExportPDFSettings
+from django_pdf_actions.warmup import warm_up
+
+PNG_1PX = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01"
+    b"\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\xfa"
+    b"\x0f\x00\x00\x01\x05\x00\x01\r\n-\xb4\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+
+def remote_logo(name="logos/remote.png"):
+    """A logo on a storage without local paths."""
+    storage = MagicMock()
+    storage.path.side_effect = NotImplementedError()
+    handle = MagicMock()
+    handle.__enter__.return_value.read.return_value = PNG_1PX
+    storage.open.return_value = handle
+    logo = MagicMock(spec=["name", "storage"])
+    logo.name = name
+    logo.storage = storage
+    return logo
+
+
+class WarmUpTest(TestCase):
+    """``warm_up`` registers the font and builds styles ahead of the first export."""
+
+    def test_warm_up_registers_active_font(self):
+        ExportPDFSettings.objects.create(title="Active", active=True)
+
+        summary = warm_up()
+
+        self.assertIn(summary["font"], pdfmetrics.getRegisteredFontNames())
+        self.assertFalse(summary["logo"])
+        self.assertEqual(sample_style_sheet.cache_info().currsize, 1)
+
+    def test_warm_up_closes_connections_after_reading_settings(self):
+        ExportPDFSettings.objects.create(title="Active", active=True)
+
+        with patch("django_pdf_actions.warmup.connections") as mock_connections:
+            warm_up()
+
+        mock_connections.close_all.assert_called_once_with()
+
+    def test_warm_up_without_database(self):
+        with self.assertNumQueries(0), patch(
+            "django_pdf_actions.warmup.connections"
+        ) as mock_connections:
+            summary = warm_up(use_database=False)
+
+        self.assertTrue(summary["font"])
+        mock_connections.close_all.assert_not_called()
+
+    def test_warm_up_decodes_and_caches_remote_logo(self):
+        pdf_settings = type(
+            "MockSettings", (), {"logo": remote_logo(), "show_logo": True}
+        )()
+
+        summary = warm_up(pdf_settings)
+        logo = get_logo_path(pdf_settings)
+
+        self.assertTrue(summary["logo"])
+        self.assertIsInstance(logo, ImageReader)
+        pdf_settings.logo.storage.open.assert_called_once()
+
+    def test_logo_cache_is_keyed_by_modified(self):
+        logo = remote_logo()
+        first = type("MockSettings", (), {"logo": logo, "modified": 1})()
+        second = type("MockSettings", (), {"logo": logo, "modified": 2})()
+
+        self.assertIs(get_logo_path(first), get_logo_path(first))
+        get_logo_path(second)
+
+        self.assertEqual(logo.storage.open.call_count, 2)
+
+    @override_settings(PDF_ACTIONS_WARMUP=True)
+    def test_app_ready_runs_warm_up_when_enabled(self):
+        with patch("django_pdf_actions.warmup.warm_up") as mock_warm_up:
+            apps.get_app_config("django_pdf_actions").ready()
+
+        mock_warm_up.assert_called_once_with(use_database=False)
+
+    def test_app_ready_skips_warm_up_by_default(self):
+        with patch("django_pdf_actions.warmup.warm_up") as mock_warm_up:
+            apps.get_app_config("django_pdf_actions").ready()
+
+        mock_warm_up.assert_not_called()
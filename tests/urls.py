@@ -0,0 +1,9 @@
+"""URL configuration for running tests."""
+
+from django.contrib import admin
+from django.urls import include, path
+
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("pdf-actions/", include("django_pdf_actions.urls")),
+]
@@ -1,7 +1,7 @@
 """Test utilities."""
 
 from django.contrib.admin import ModelAdmin
-from django.db import models
+from django.db import connection, models
 
 
 class MockModel(models.Model):
@@ -14,6 +14,13 @@ class MockModel(models.Model):
         app_label = "django_pdf_actions"
         managed = False
 
+    @property
+    def domain(self):
+        return self.email.split("@")[-1]
+
+    def greeting(self):
+        return f"Hello {self.name}"
+
 
 class MockQuerySet:
     """Mock queryset for testing."""
@@ -34,3 +41,108 @@ class MockModelAdmin(ModelAdmin):
 
     list_display = ("id", "name", "email")
     model = MockModel
+
+
+class SettingsAdmin(ModelAdmin):
+    """Plain admin for exporting ``ExportPDFSettings`` rows in tests."""
+
+    list_display = ("title", "page_size", "items_per_page")
+
+
+class MockCustomer(models.Model):
+    """Customer fixture model; tables are created by ``MockTablesMixin``."""
+
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = "django_pdf_actions"
+        managed = False
+
+    def __str__(self):
+        return self.name
+
+
+class MockTag(models.Model):
+    """Tag fixture model for many-to-many exports."""
+
+    name = models.CharField(max_length=50)
+
+    class Meta:
+        app_label = "django_pdf_actions"
+        managed = False
+
+    def __str__(self):
+        return self.name
+
+
+class MockOrder(models.Model):
+    """Order fixture model with a foreign key and a many-to-many relation."""
+
+    number = models.CharField(max_length=20)
+    customer = models.ForeignKey(MockCustomer, on_delete=models.CASCADE)
+    tags = models.ManyToManyField(MockTag)
+
+    class Meta:
+        app_label = "django_pdf_actions"
+        managed = False
+
+
+class MockShipment(models.Model):
+    """Shipment of an order (non-null key) by an optional carrier (nullable key)."""
+
+    order = models.ForeignKey(MockOrder, on_delete=models.CASCADE)
+    carrier = models.ForeignKey(
+        MockCustomer, null=True, on_delete=models.SET_NULL, related_name="+"
+    )
+
+    class Meta:
+        app_label = "django_pdf_actions"
+        managed = False
+
+
+class MockOrderAdmin(ModelAdmin):
+    """Order admin exporting a foreign key column and an M2M admin callable."""
+
+    list_display = ("number", "customer", "tag_names")
+    pdf_prefetch_related = ("tags",)
+
+    def tag_names(self, obj):
+        return ", ".join(tag.name for tag in obj.tags.all())
+
+
+class MockTablesMixin:
+    """Create the tables of the unmanaged fixture models for a test class."""
+
+    mock_models = (MockCustomer, MockTag, MockOrder, MockShipment)
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            for model in cls.mock_models:
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            for model in reversed(cls.mock_models):
+                editor.delete_model(model)
+
+    @staticmethod
+    def create_orders(count, customers=3):
+        """Create *count* orders spread over *customers* customers, each with a tag."""
+        customer_objs = [
+            MockCustomer.objects.create(name=f"Customer {i}") for i in range(customers)
+        ]
+        tag = MockTag.objects.create(name="priority")
+        MockOrder.objects.bulk_create(
+            MockOrder(number=f"ORD-{i:05d}", customer=customer_objs[i % customers])
+            for i in range(count)
+        )
+        orders = list(MockOrder.objects.order_by("pk"))
+        MockOrder.tags.through.objects.bulk_create(
+            MockOrder.tags.through(mockorder_id=order.pk, mocktag_id=tag.pk)
+            for order in orders
+        )
+        return orders